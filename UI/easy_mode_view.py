@@ -4,13 +4,13 @@ import pygame
 import sys
 import os
 import random
-import string
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from models import game_engine
 from utils import word_manager
 from utils import language_manager
+from utils import hint_engine
 from UI import constants
 from UI import pygame_utils
 
@@ -18,6 +18,9 @@ from UI import pygame_utils
 # Module-level variables for resources
 img_bg = None
 
+# Per-game random generator (word draw, hints, effects), recreated by initialize_game
+game_rng = random.Random()
+
 # UI Rects
 btn_pause_rect = pygame.Rect(20, 20, 120, 40)
 HINT_CENTER = (constants.WIDTH - 80, constants.HEIGHT - 80)
@@ -44,6 +47,9 @@ def load_resources():
 
 # Reset game state with new word, start music, set 3 hints
 def initialize_game():
+    global game_rng
+    game_rng = random.Random()
+
     pygame.mixer.music.stop()
     pygame.mixer.stop()
 
@@ -55,29 +61,25 @@ def initialize_game():
             print(f"Error loading easy mode music: {e}")
 
     current_lang = language_manager.get_current_language()
-    secret_word = word_manager.get_word(current_lang, "facile")
+    secret_word = word_manager.get_unique_word(current_lang, "facile", rng=game_rng)
     if not secret_word:
         secret_word = "FACILE"
 
+    # Build the hint index now so a hint click stays within the frame budget
+    word_manager.get_letter_index(current_lang)
+
     game_state = game_engine.create_game(secret_word, 7)
     hints_left = 3
 
     return game_state, secret_word, hints_left
 
 
-# Play a random letter NOT in the word to help by elimination
+# Play the letter NOT in the word that eliminates the most candidates
 def use_fake_hint(state, secret):
-    alphabet = list(string.ascii_lowercase)
-    word_letters = set(secret.lower())
-    played_letters = set(state["letters_played"])
-
-    available_fakes = []
-    for l in alphabet:
-        if l not in word_letters and l not in played_letters:
-            available_fakes.append(l)
+    index = word_manager.get_letter_index(language_manager.get_current_language())
+    letter = hint_engine.best_fake_hint(state, index, game_rng)
 
-    if available_fakes:
-        letter = random.choice(available_fakes)
+    if letter:
         game_engine.play_letter(state, letter)
         return True
     return False
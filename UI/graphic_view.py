@@ -7,6 +7,7 @@ import os
 from UI import constants
 from UI import pygame_utils
 from utils import language_manager
+from utils import score_manager
 
 
 # Global pygame objects (shared across all views)
@@ -72,7 +73,6 @@ def main_menu_view():
         except pygame.error as e:
             print(f"Error loading main menu music: {e}")
 
-    path_scores = os.path.join(constants.BASE_DIR, "data", "highscores.txt")
     show_rules = False
     show_scores = False
 
@@ -192,27 +192,6 @@ def main_menu_view():
             title_surf = title_font.render(title_text, True, (0, 0, 0))
             screen.blit(title_surf, (win_w // 2 - title_surf.get_width() // 2, 55))
 
-            all_data = {}
-            if os.path.exists(path_scores):
-                try:
-                    with open(path_scores, "r", encoding="utf-8") as file:
-                        lines = file.readlines()
-                        current_cat = None
-                        for line in lines:
-                            line = line.strip()
-                            if not line: continue
-                            if line.startswith('[') and line.endswith(']'):
-                                current_cat = line[1:-1]
-                                all_data[current_cat] = []
-                            elif current_cat and '=' in line:
-                                pos = line.find('=')
-                                name = line[:pos]
-                                try:
-                                    score_val = int(line[pos + 1:])
-                                    all_data[current_cat].append({"name": name, "score": score_val})
-                                except: pass
-                except: pass
-
             panel_margin = 40
             panel_area_w = win_w - (panel_margin * 2)
             panel_w = (panel_area_w // 4) - 20
@@ -246,7 +225,8 @@ def main_menu_view():
                 screen.blit(score_surf, (x_pos + panel_w - score_surf.get_width() - 15, header_y))
                 pygame.draw.line(screen, (255, 255, 255), (x_pos + 10, header_y + 25), (x_pos + panel_w - 10, header_y + 25), 1)
 
-                entries = all_data.get(cat_mapping[key], [])
+                # Served from score_manager's cached leaderboard, the file is not parsed per frame
+                entries = score_manager.get_top_scores(cat_mapping[key], 5)
                 entry_y = header_y + 35
                 for j in range(min(5, len(entries))):
                     entry = entries[j]
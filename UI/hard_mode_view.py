@@ -9,9 +9,13 @@ import random
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from models import game_engine
+from models import game_modes
+from models import replay
 from utils import word_manager
 from utils import language_manager
 from utils import score_manager
+from utils import hint_engine
+from utils import letter_folding
 from UI import constants
 from UI import pygame_utils
 
@@ -20,6 +24,12 @@ from UI import pygame_utils
 img_bg = None
 imgs = {}
 
+# Per-game random generator (word draw, hints, effects), recreated by initialize_game
+game_rng = random.Random()
+
+# Replay record of the current game (models.replay), saved with its score so the leaderboard can be verified
+game_replay = None
+
 # Pause button rect
 btn_pause_rect = pygame.Rect(20, 20, 120, 40)
 HINT_CENTER = (constants.WIDTH - 80, constants.HEIGHT - 80)
@@ -43,6 +53,9 @@ def load_resources():
 
 # Reset game state with difficile word, 30s timer, 1 hint, 5 max errors
 def initialize_game():
+    global game_rng, game_replay
+    game_rng = random.Random()
+
     pygame.mixer.music.stop()
     pygame.mixer.stop()
 
@@ -51,31 +64,31 @@ def initialize_game():
         pygame.mixer.music.play(-1)
 
     current_lang = language_manager.get_current_language()
-    secret_word = word_manager.get_word(current_lang, "difficile")
+    secret_word = word_manager.get_unique_word(current_lang, "difficile", rng=game_rng)
     if not secret_word:
         secret_word = "PYTHON"
 
-    game_state = game_engine.create_game(secret_word, 5)
-    timer = 30.0
-    hints_left = 1
+    # Build the hint index now so a hint click stays within the frame budget
+    word_manager.get_letter_index(current_lang)
+
+    settings = game_modes.MODES["hard"]
+    game_state = game_engine.create_game(secret_word, settings["max_errors"])
+    timer = settings["time_limit"]
+    hints_left = settings["hints"]
     hints_used = 0
+    game_replay = replay.new_replay("hard", current_lang, game_state)
 
     return game_state, secret_word, timer, hints_left, hints_used
 
 
-# Play a random unguessed letter that IS in the word
+# Play the unguessed letter of the word that tells the most about the remaining candidates
 def use_real_hint(state, secret):
-    word_letters = set(secret.lower())
-    played_letters = set(state["letters_played"])
-
-    available_hints = []
-    for letter in word_letters:
-        if letter not in played_letters:
-            available_hints.append(letter)
+    index = word_manager.get_letter_index(language_manager.get_current_language())
+    letter = hint_engine.best_real_hint(state, index, game_rng)
 
-    if available_hints:
-        letter = random.choice(available_hints)
+    if letter:
         game_engine.play_letter(state, letter)
+        game_replay["events"] = replay.add_event(game_replay["events"], game_replay["elapsed"], letter, hint=True)
         return True
     return False
 
@@ -101,6 +114,7 @@ def get_name_input(screen, fonts, final_score):
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_RETURN and len(name) > 0:
                     score_manager.save_score(name, final_score, category="difficile")
+                    replay.save_replay(game_replay, name, final_score, "difficile")
                     return name
                 elif event.key == pygame.K_BACKSPACE:
                     name = name[:-1]
@@ -112,6 +126,7 @@ def get_name_input(screen, fonts, final_score):
 def play_win_sequence(screen, fonts, secret_word, state, time_remaining, hints_used):
     pygame.mixer.music.stop()
     final_score = score_manager.calculate_score(state, time_remaining, hints_used)
+    game_replay["time_remaining"] = time_remaining
 
     fade = pygame.Surface((constants.WIDTH, constants.HEIGHT))
     fade.fill((0, 0, 0))
@@ -146,6 +161,8 @@ def play_win_sequence(screen, fonts, secret_word, state, time_remaining, hints_u
         result = get_name_input(screen, fonts, final_score)
         if result is None:
             return "quit"
+    else:
+        score_manager.record_score(final_score, category="difficile")
 
     rect_retry_win = pygame.Rect(constants.WIDTH // 2 - 210, constants.HEIGHT - 120, 200, 50)
     rect_quit_win = pygame.Rect(constants.WIDTH // 2 + 10, constants.HEIGHT - 120, 200, 50)
@@ -306,8 +323,8 @@ def draw_interface(screen, fonts, state, secret, timer, hints_left, hints_used,
     surf_timer = fonts["timer"].render(f"{timer_val}s", True, timer_color)
     timer_rect = surf_timer.get_rect(center=(constants.WIDTH // 2, 50))
     if timer < 5 and timer > 0:
-        timer_rect.x += random.randint(-3, 3)
-        timer_rect.y += random.randint(-3, 3)
+        timer_rect.x += game_rng.randint(-3, 3)
+        timer_rect.y += game_rng.randint(-3, 3)
     screen.blit(surf_timer, timer_rect)
 
     size = constants.HANGMAN_SPRITE_SIZE
@@ -328,8 +345,9 @@ def draw_interface(screen, fonts, state, secret, timer, hints_left, hints_used,
     screen.blit(surf_mot, (constants.WIDTH // 2 - surf_mot.get_width() // 2, constants.HEIGHT - 180))
 
     wrong_letters = []
+    folded_secret = letter_folding.fold_word(secret)
     for l in state["letters_played"]:
-        if l not in secret.lower():
+        if l not in folded_secret:
             wrong_letters.append(l)
 
     errors_text = language_manager.get_text("hard_errors")
@@ -395,11 +413,13 @@ def run_view(screen, fonts, clock):
                 letter = event.unicode.lower()
                 if letter.isalpha() and len(letter) == 1 and letter not in game_state["letters_played"]:
                     old_err = game_state["errors"]
-                    game_engine.play_letter(game_state, letter)
-                    if game_state["errors"] == old_err:
-                        timer += 5
-                    else:
-                        timer -= 5
+                    # A letter already played changes nothing, timer included (letters_played holds uppercase letters)
+                    if game_engine.play_letter(game_state, letter):
+                        game_replay["events"] = replay.add_event(game_replay["events"], game_replay["elapsed"], letter)
+                        if game_state["errors"] == old_err:
+                            timer += game_modes.TIME_STEP
+                        else:
+                            timer -= game_modes.TIME_STEP
 
                     if game_state["errors"] >= 5:
                         game_state["status"] = "loss"
@@ -413,6 +433,7 @@ def run_view(screen, fonts, clock):
 
         if game_state["status"] == "in_progress" and not paused:
             timer -= dt
+            game_replay["elapsed"] += dt
             if timer <= 0:
                 game_state["status"] = "loss"
                 result = play_lose_sequence(screen, fonts, secret_word, game_state)
@@ -19,9 +19,17 @@ img_bg = None
 img_daemon = None
 current_total_score = 0
 
+# Per-game random generator (word draw, hints, effects), recreated by initialize_game
+game_rng = random.Random()
+
 # UI Rects
 btn_pause_rect = pygame.Rect(20, 20, 120, 40)
 
+# Relative odds of each difficulty per round (tune to bias infinite mode)
+DIFFICULTIES = ["facile", "moyen", "difficile"]
+DIFFICULTY_WEIGHTS = [1, 1, 1]
+difficulty_table = word_manager.build_alias_table(DIFFICULTY_WEIGHTS)
+
 
 # Load infinite background and daemon sprite images
 def load_resources():
@@ -47,7 +55,8 @@ def load_resources():
 
 # Reset game state with random difficulty word, optionally reset cumulative score
 def initialize_game(reset_score=False):
-    global current_total_score
+    global current_total_score, game_rng
+    game_rng = random.Random()
     if reset_score:
         current_total_score = 0
 
@@ -63,9 +72,8 @@ def initialize_game(reset_score=False):
 
     current_lang = language_manager.get_current_language()
 
-    difficulties = ["facile", "moyen", "difficile"]
-    chosen_diff = random.choice(difficulties)
-    secret_word = word_manager.get_word(current_lang, chosen_diff)
+    chosen_diff = DIFFICULTIES[word_manager.alias_draw(difficulty_table, game_rng)]
+    secret_word = word_manager.get_tuned_word(current_lang, chosen_diff, rng=game_rng)
 
     if not secret_word:
         secret_word = "INFINITE"
@@ -116,6 +124,8 @@ def play_lose_sequence(screen, fonts, secret_word):
         result = get_name_input(screen, fonts, current_total_score)
         if result is None:
             return "quit"
+    else:
+        score_manager.record_score(current_total_score, category="infinite")
 
     fade = pygame.Surface((constants.WIDTH, constants.HEIGHT))
     fade.fill((0, 0, 0))
@@ -2,6 +2,9 @@ import pygame
 
 from UI import constants
 
+# Last rendered masked word: the word only changes when a letter is revealed, not every frame
+_word_surface_cache = {"key": None, "surface": None}
+
 
 # Create and return dictionary of commonly used fonts
 def create_fonts():
@@ -119,23 +122,34 @@ def draw_rounded_button(surface, color, rect, text, font, text_color=None):
     surface.blit(text_surf, text_rect)
 
 
-# Render masked word with adaptive font size to fit screen width
+# Render masked word with adaptive font size to fit screen width (reuses last surface if unchanged)
 def render_word_adaptive(masked_word, max_width, color=None):
     if color is None:
         color = constants.WHITE
 
+    key = (masked_word, max_width, color)
+    if _word_surface_cache["key"] == key:
+        return _word_surface_cache["surface"]
+
     spaced_word = " ".join(masked_word)
     font_size = 60
+    surf = None
 
     while font_size > 20:
         font = pygame.font.SysFont("Arial", font_size, bold=True)
         surf = font.render(spaced_word, True, color)
         if surf.get_width() <= max_width:
-            return surf
+            break
         font_size -= 5
+        surf = None
+
+    if surf is None:
+        font = pygame.font.SysFont("Arial", 20, bold=True)
+        surf = font.render(spaced_word, True, color)
 
-    font = pygame.font.SysFont("Arial", 20, bold=True)
-    return font.render(spaced_word, True, color)
+    _word_surface_cache["key"] = key
+    _word_surface_cache["surface"] = surf
+    return surf
 
 
 # Draw a button with border and hover effect
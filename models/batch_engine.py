@@ -0,0 +1,174 @@
+# Batch game engine: N games held as NumPy arrays, one vectorized step plays a guess in every game
+
+import numpy as np
+
+from models import game_engine
+from utils import difficulty_classifier
+from utils import letter_folding
+from utils import score_manager
+
+# Guess code for "no guess this step": the game is left unchanged
+NO_GUESS = -1
+
+
+# Return bitmask bit (uint32) of each letter code of an encoded matrix, 0 for padding/other characters
+def _code_bits(codes):
+    bits = np.zeros(codes.shape, dtype=np.uint32)
+    letter = (codes >= 1) & (codes <= 26)
+    bits[letter] = np.left_shift(np.uint32(1), codes[letter].astype(np.uint32) - 1)
+    return bits
+
+
+# Encode uppercase secrets as an N x max length code matrix (0 = padding, 1-26 = A-Z, OTHER_CODE = any other)
+#   folded with game_engine's table, one code per character, so column j is character j of the secret
+def _encode_secrets(words):
+    folded = [letter_folding.fold_word(word) for word in words]
+    lengths = np.array([len(word) for word in folded], dtype=np.int32)
+    n = len(words)
+    if n == 0:
+        return np.zeros((0, 0), dtype=np.uint8), lengths
+
+    chars = np.frombuffer("".join(folded).encode('ascii', 'replace'), dtype=np.uint8).astype(np.int16) - 64
+    chars[(chars < 1) | (chars > 26)] = difficulty_classifier.OTHER_CODE
+
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    rows = np.repeat(np.arange(n), lengths)
+    cols = np.arange(len(chars)) - np.repeat(starts, lengths)
+
+    matrix = np.zeros((n, max(int(lengths.max()), 1)), dtype=np.uint8)
+    matrix[rows, cols] = chars
+    return matrix, lengths
+
+
+# Create a batch of games:
+#   {"words", "secrets", "lengths", "secret_mask", "played_mask", "errors", "max_errors", "status"}
+#   words keeps the uppercase secrets as game_engine stores them (accents, hyphens, apostrophes)
+def create_batch(words, max_errors=7):
+    words = [word.upper() for word in words]
+    secrets, lengths = _encode_secrets(words)
+    n = len(words)
+
+    secret_mask = np.bitwise_or.reduce(_code_bits(secrets), axis=1) if n else np.zeros(0, dtype=np.uint32)
+
+    return {
+        "words": words,
+        "secrets": secrets,
+        "lengths": lengths,
+        "secret_mask": secret_mask.astype(np.uint32),
+        "played_mask": np.zeros(n, dtype=np.uint32),
+        "errors": np.zeros(n, dtype=np.int8),
+        "max_errors": np.broadcast_to(np.asarray(max_errors, dtype=np.int8), (n,)).copy(),
+        "status": np.full(n, game_engine.STATUS_IN_PROGRESS, dtype=np.int8)
+    }
+
+
+# Return the number of games in a batch
+def batch_size(batch):
+    return len(batch["status"])
+
+
+# Convert guesses (a string, a list of letters or an int array of 0-25 codes) to an int16 code array
+def encode_guesses(guesses):
+    if isinstance(guesses, str):
+        guesses = list(guesses)
+
+    codes = np.asarray(guesses)
+    if codes.dtype.kind in ('U', 'S', 'O'):
+        letters = np.char.upper(codes.astype('U1'))
+        codes = np.frombuffer(letters.astype('S1').tobytes(), dtype=np.uint8).astype(np.int16) - 65
+
+    codes = codes.astype(np.int16)
+    codes[(codes < 0) | (codes > 25)] = NO_GUESS
+    return codes
+
+
+# Play one guess per game (array of length N, or one letter for all), returns the new status array
+def play_letters(batch, guesses):
+    codes = encode_guesses(guesses)
+    if codes.ndim == 0 or codes.shape[0] == 1:
+        codes = np.broadcast_to(codes.reshape(-1)[:1], batch["status"].shape)
+
+    valid = codes != NO_GUESS
+    bits = np.left_shift(np.uint32(1), np.where(valid, codes, 0).astype(np.uint32))
+
+    # Same rules as play_letter, plus finished games are frozen (the UI stops playing there too)
+    active = valid & (batch["status"] == game_engine.STATUS_IN_PROGRESS) & ((batch["played_mask"] & bits) == 0)
+    hit = (batch["secret_mask"] & bits) != 0
+
+    batch["played_mask"] |= np.where(active, bits, 0).astype(np.uint32)
+    batch["errors"] += (active & ~hit).astype(np.int8)
+
+    won = active & ((batch["secret_mask"] & ~batch["played_mask"]) == 0)
+    lost = active & ~won & (batch["errors"] >= batch["max_errors"])
+    batch["status"][won] = game_engine.STATUS_WON
+    batch["status"][lost] = game_engine.STATUS_LOST
+
+    return batch["status"]
+
+
+# Play letters in order in every game until all games are over or letters run out, returns status array
+def play_sequence(batch, letters):
+    for code in encode_guesses(letters):
+        if not (batch["status"] == game_engine.STATUS_IN_PROGRESS).any():
+            break
+        play_letters(batch, code)
+    return batch["status"]
+
+
+# Return bool matrix (N x max length): True where the letter of the secret has been revealed
+def revealed_matrix(batch):
+    bits = _code_bits(batch["secrets"])
+    return (bits & batch["played_mask"][:, None]) != 0
+
+
+# Return masked words in the game_engine format ("P _ _ H _ N") for the given game indices
+#   revealed letters and characters that cannot be played are shown as in the secret ("É", "-", "'")
+def get_masked_words(batch, indices=None):
+    if indices is None:
+        indices = range(batch_size(batch))
+
+    masked = []
+    for i in indices:
+        played_mask = int(batch["played_mask"][i])
+        word = batch["words"][i]
+        secret = []
+        for j, code in enumerate(batch["secrets"][i, :batch["lengths"][i]]):
+            if 1 <= code <= 26 and not played_mask & (1 << (int(code) - 1)):
+                secret.append("_")
+            else:
+                secret.append(word[j])
+        masked.append(" ".join(secret))
+    return masked
+
+
+# Return the score of every game (int64 array) with score_manager's formula, in one vectorized call
+#   time_remaining and hints_used: one value per game or one value for all
+def get_scores(batch, time_remaining=0, hints_used=0):
+    return score_manager.calculate_scores(batch["played_mask"], batch["secret_mask"], time_remaining, hints_used)
+
+
+# Return {"in_progress", "won", "lost"} game counts of a batch
+def count_statuses(batch):
+    counts = np.bincount(batch["status"], minlength=len(game_engine.STATUS_NAMES))
+    result = {}
+    for code in range(len(game_engine.STATUS_NAMES)):
+        result[game_engine.STATUS_NAMES[code]] = int(counts[code])
+    return result
+
+
+# Return the uppercase secret word of game i, accents and other characters included
+def get_secret_word(batch, i):
+    return batch["words"][i]
+
+
+# Return game i of a batch as a game_engine compact state
+def get_game(batch, i):
+    secret = get_secret_word(batch, i)
+    return [
+        secret,
+        int(batch["secret_mask"][i]),
+        int(batch["played_mask"][i]),
+        int(batch["errors"][i]),
+        int(batch["max_errors"][i]),
+        int(batch["status"][i])
+    ]
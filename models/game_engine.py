@@ -1,43 +1,228 @@
+from utils import letter_folding
+
+# Compact game state: a 6-slot list of ints instead of a dict + set (~1 KB -> ~0.2 KB per game)
+#   letter bit = 1 << (ord(letter) - ord('A')), so A-Z use bits 0-25; other characters have no bit and are
+#   shown as they are ("PORTE-MONNAIE", "AUJOURD'HUI")
+_SECRET = 0
+_SECRET_MASK = 1
+_PLAYED_MASK = 2
+_ERRORS = 3
+_MAX_ERRORS = 4
+_STATUS = 5
+
+# Status codes of compact states, and their dict-state names
+STATUS_IN_PROGRESS = 0
+STATUS_WON = 1
+STATUS_LOST = 2
+STATUS_NAMES = ["in_progress", "won", "lost"]
+
+
 # Create a new game state dictionary
 def create_game(secret_word, max_errors=7):
+    secret_word = secret_word.upper()
+
+    # Positions of each base letter (É, È, Ê under E), so play_letter reveals a letter without scanning the word
+    letter_positions = letter_folding.letter_positions(secret_word)
+
     game_state = {
-        "secret_word": secret_word.upper(),
+        "secret_word": secret_word,
         "max_errors": max_errors,
         "letters_played": set(),
         "errors": 0,
-        "status": "in_progress"
+        "status": "in_progress",
+        "letter_positions": letter_positions,
+        "mask": _initial_mask(secret_word),
+        "masked_word": " ".join(_initial_mask(secret_word)),
+        "mask_version": 0,
+        "mask_played_count": 0
     }
     return game_state
 
 
-# Generate masked word with unguessed letters replaced by underscores
-def get_masked_word(game_state):
-    masked_word_list = []
+# Return the mask of a new game: "_" for every playable letter, other characters as they are
+def _initial_mask(secret_word):
+    return ["_" if _letter_bit(letter) else letter for letter in secret_word]
+
+
+# Rebuild mask fields from scratch (letters_played was changed outside play_letter)
+def _rebuild_mask(game_state):
     secret_word = game_state["secret_word"]
     letters_played = game_state["letters_played"]
 
+    if "letter_positions" not in game_state:
+        game_state["letter_positions"] = letter_folding.letter_positions(secret_word)
+
+    mask = []
     for letter in secret_word:
-        if letter in letters_played:
-            masked_word_list.append(letter)
+        if letter_folding.fold_letter(letter) in letters_played or not _letter_bit(letter):
+            mask.append(letter)
         else:
-            masked_word_list.append("_")
+            mask.append("_")
+
+    game_state["mask"] = mask
+    game_state["masked_word"] = " ".join(mask)
+    game_state["mask_version"] = game_state.get("mask_version", 0) + 1
+    game_state["mask_played_count"] = len(letters_played)
+
+
+# Rebuild the mask only if letters were added to letters_played directly
+def _refresh_mask(game_state):
+    if game_state.get("mask_played_count") != len(game_state["letters_played"]):
+        _rebuild_mask(game_state)
+
+
+# Return counter that changes whenever the masked word changes (for render caching)
+def get_mask_version(game_state):
+    if is_compact(game_state):
+        # Number of revealed distinct letters only grows when the mask changes
+        return bin(game_state[_SECRET_MASK] & game_state[_PLAYED_MASK]).count("1")
+
+    _refresh_mask(game_state)
+    return game_state["mask_version"]
+
+
+# Return the bitmask bit of a single uppercase letter (accented letters share their base letter's bit),
+#   0 for a character that cannot be played
+def _letter_bit(letter):
+    letter = letter_folding.FOLD_TABLE.get(letter, letter)
+    if not letter_folding.is_base_letter(letter):
+        return 0
+    return 1 << (ord(letter) - 65)
+
+
+# Return bitmask with the bit of every letter in text set (case and accent-insensitive)
+def letters_to_mask(text):
+    mask = 0
+    for letter in letter_folding.fold_word("".join(text)):
+        if letter_folding.is_base_letter(letter):
+            mask |= 1 << (ord(letter) - 65)
+    return mask
+
+
+# Return sorted list of letters whose bits are set in mask
+def mask_to_letters(mask):
+    letters = []
+    offset = 0
+    while mask:
+        if mask & 1:
+            letters.append(chr(65 + offset))
+        mask >>= 1
+        offset += 1
+    return letters
+
+
+# Create a new compact game state (list of ints), same rules as create_game
+def create_compact_game(secret_word, max_errors=7):
+    secret_word = secret_word.upper()
+    return [secret_word, letters_to_mask(secret_word), 0, 0, max_errors, STATUS_IN_PROGRESS]
+
+
+# True if game_state is a compact state rather than a dict
+def is_compact(game_state):
+    return isinstance(game_state, list)
+
+
+# Convert a dict state into a compact state
+def to_compact(game_state):
+    if is_compact(game_state):
+        return game_state
+    return [
+        game_state["secret_word"],
+        letters_to_mask(game_state["secret_word"]),
+        letters_to_mask(game_state["letters_played"]),
+        game_state["errors"],
+        game_state["max_errors"],
+        STATUS_NAMES.index(game_state["status"]) if game_state["status"] in STATUS_NAMES else STATUS_IN_PROGRESS
+    ]
+
+
+# Convert a compact state into a dict state (for score_manager and the UI)
+def to_dict(game_state):
+    if not is_compact(game_state):
+        return game_state
+
+    dict_state = create_game(game_state[_SECRET], game_state[_MAX_ERRORS])
+    for letter in mask_to_letters(game_state[_PLAYED_MASK]):
+        play_letter(dict_state, letter)
 
-    return " ".join(masked_word_list)
+    dict_state["errors"] = game_state[_ERRORS]
+    dict_state["status"] = STATUS_NAMES[game_state[_STATUS]]
+    return dict_state
+
+
+# Return the status name ("in_progress", "won", "lost") of either state type
+def get_status(game_state):
+    if is_compact(game_state):
+        return STATUS_NAMES[game_state[_STATUS]]
+    return game_state["status"]
+
+
+# Return the error count of either state type
+def get_errors(game_state):
+    if is_compact(game_state):
+        return game_state[_ERRORS]
+    return game_state["errors"]
+
+
+# Return the maximum error count of either state type
+def get_max_errors(game_state):
+    if is_compact(game_state):
+        return game_state[_MAX_ERRORS]
+    return game_state["max_errors"]
+
+
+# Return (secret letters mask, played letters mask) of either state type, as used by score_manager.calculate_scores
+def get_letter_masks(game_state):
+    if is_compact(game_state):
+        return game_state[_SECRET_MASK], game_state[_PLAYED_MASK]
+    return letters_to_mask(game_state["secret_word"]), letters_to_mask(game_state["letters_played"])
+
+
+# Return the uppercase secret word of either state type
+def get_secret_word(game_state):
+    if is_compact(game_state):
+        return game_state[_SECRET]
+    return game_state["secret_word"]
+
+
+# Generate masked word with unguessed letters replaced by underscores
+def get_masked_word(game_state):
+    if is_compact(game_state):
+        played_mask = game_state[_PLAYED_MASK]
+        return " ".join("_" if _letter_bit(c) & ~played_mask else c for c in game_state[_SECRET])
+
+    # Maintained by play_letter: no per-frame string building
+    _refresh_mask(game_state)
+    return game_state["masked_word"]
 
 
 # Process a player's move and update game state
 def play_letter(game_state, letter):
-    letter = letter.upper()
+    # A key press of "é" plays E; folding is a table lookup, no unicodedata per move
+    letter = letter_folding.fold_letter(letter)
+
+    if is_compact(game_state):
+        return _play_compact_letter(game_state, letter)
 
-    # Validation: Must be a single alphabetic character and not already played.
-    if len(letter) != 1 or not letter.isalpha() or letter in game_state["letters_played"]:
+    # Validation: Must be a single letter A-Z (after folding) and not already played.
+    if not letter_folding.is_base_letter(letter) or letter in game_state["letters_played"]:
         return False
 
+    _refresh_mask(game_state)
     game_state["letters_played"].add(letter)
+    game_state["mask_played_count"] += 1
 
-    # If the letter is not in the secret word, increment errors.
-    if letter not in game_state["secret_word"]:
+    # If the letter is not in the secret word, increment errors; otherwise reveal its positions.
+    positions = game_state["letter_positions"].get(letter)
+    if positions is None:
         game_state["errors"] += 1
+    else:
+        mask = game_state["mask"]
+        secret_word = game_state["secret_word"]
+        for i in positions:
+            mask[i] = secret_word[i]
+        game_state["masked_word"] = " ".join(mask)
+        game_state["mask_version"] += 1
 
     # Update game status
     if is_won(game_state):
@@ -48,17 +233,56 @@ def play_letter(game_state, letter):
     return True
 
 
+# play_letter for compact states: status checks are single bitwise ops
+def _play_compact_letter(game_state, letter):
+    if not letter_folding.is_base_letter(letter):
+        return False
+
+    bit = _letter_bit(letter)
+    if game_state[_PLAYED_MASK] & bit:
+        return False
+
+    game_state[_PLAYED_MASK] |= bit
+    if not game_state[_SECRET_MASK] & bit:
+        game_state[_ERRORS] += 1
+
+    if game_state[_SECRET_MASK] & ~game_state[_PLAYED_MASK] == 0:
+        game_state[_STATUS] = STATUS_WON
+    elif game_state[_ERRORS] >= game_state[_MAX_ERRORS]:
+        game_state[_STATUS] = STATUS_LOST
+
+    return True
+
+
+# End a game in progress as lost (the player's timer ran out)
+def lose_game(game_state):
+    if is_compact(game_state):
+        game_state[_STATUS] = STATUS_LOST
+    else:
+        game_state["status"] = "lost"
+
+
 # Check if all letters of the secret word have been guessed
 def is_won(game_state):
-    secret_word_letters = set(game_state["secret_word"])
-    return secret_word_letters.issubset(game_state["letters_played"])
+    if is_compact(game_state):
+        return game_state[_SECRET_MASK] & ~game_state[_PLAYED_MASK] == 0
+
+    letters_played = game_state["letters_played"]
+    for letter in game_state.get("letter_positions") or game_state["secret_word"]:
+        if letter not in letters_played:
+            return False
+    return True
 
 
 # Check if the number of errors has reached the maximum allowed
 def is_lost(game_state):
+    if is_compact(game_state):
+        return game_state[_ERRORS] >= game_state[_MAX_ERRORS]
     return game_state["errors"] >= game_state["max_errors"]
 
 
 # Return a sorted list of played letters
 def get_played_letters(game_state):
+    if is_compact(game_state):
+        return mask_to_letters(game_state[_PLAYED_MASK])
     return sorted(list(game_state["letters_played"]))
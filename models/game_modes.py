@@ -0,0 +1,14 @@
+# Game modes shared by the UI views, the game server and replay verification
+
+# Word section, errors allowed, hints, hint kind, timer (seconds, None = untimed) and score category of each mode
+MODES = {
+    "easy": {"difficulty": "facile", "max_errors": 7, "hints": 3, "hint": "fake", "time_limit": None,
+             "category": None},
+    "normal": {"difficulty": "moyen", "max_errors": 7, "hints": 2, "hint": "real", "time_limit": 30.0,
+               "category": "normal"},
+    "hard": {"difficulty": "difficile", "max_errors": 5, "hints": 1, "hint": "real", "time_limit": 30.0,
+             "category": "difficile"}
+}
+
+# Seconds added to the timer on a hit and removed on a miss
+TIME_STEP = 5.0
@@ -0,0 +1,312 @@
+# Game replays: compact event logs of scored games, re-played in a process pool to verify the leaderboard
+
+import os
+import sys
+import time
+import argparse
+from collections import deque, Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from models import game_engine
+from models import game_modes
+from utils import word_manager
+from utils import score_manager
+from utils import letter_folding
+
+# One replay per line: name|category|score|time_remaining|seed|language|word_id|mode|word|events
+#   events = "E520,a1300,..." letter (uppercase = guess, lowercase = hint) + milliseconds since game start
+#   the secret word is kept so a replay still verifies after the dictionary changed; lines written before it
+#   (no word field) look the word up by word_id
+FIELD_SEPARATOR = "|"
+EVENT_SEPARATOR = ","
+
+# Clock slack allowed on the recorded time_remaining (timestamps are rounded to milliseconds)
+TIME_TOLERANCE = 0.01
+
+DEFAULT_CHUNK_SIZE = 5000
+
+
+# Return the replay log path: beside the highscores file its replays justify
+def get_replay_file():
+    return os.path.join(os.path.dirname(score_manager.SCORE_FILE), 'replays.txt')
+
+
+# Start the replay record of a game played in the UI: the fields of a server session that format_replay uses
+#   elapsed = seconds the game timer has run (pauses excluded), the time base of the events
+def new_replay(mode, language, game_state):
+    return {"game": game_state, "mode": mode, "language": language, "word_id": -1, "seed": 0, "events": "",
+            "time_remaining": 0.0, "elapsed": 0.0}
+
+
+# Return the events string with one played letter appended (hint letters are stored lowercase)
+def add_event(events, elapsed, letter, hint=False):
+    letter = letter_folding.fold_letter(letter)
+    event = f"{letter.lower() if hint else letter}{int(elapsed * 1000)}"
+    return events + EVENT_SEPARATOR + event if events else event
+
+
+# Return the replay line of a scored session (or UI replay record)
+def format_replay(session, name, score, category):
+    clean_name = name[:5].upper().replace(FIELD_SEPARATOR, "_")
+    word = game_engine.get_secret_word(session["game"]).replace(FIELD_SEPARATOR, "_")
+    fields = [clean_name, category, str(score), repr(session["time_remaining"]), str(session["seed"]),
+              session["language"], str(session["word_id"]), session["mode"], word, session["events"]]
+    return FIELD_SEPARATOR.join(fields)
+
+
+# Parse a replay line into a dict, None if malformed
+def parse_replay(line):
+    fields = line.rstrip("\n").split(FIELD_SEPARATOR)
+    if len(fields) == 9:
+        fields.insert(8, "")
+    if len(fields) != 10:
+        return None
+
+    try:
+        events = []
+        for event in fields[9].split(EVENT_SEPARATOR) if fields[9] else []:
+            events.append((event[0], int(event[1:])))
+        return {
+            "name": fields[0],
+            "category": fields[1],
+            "score": int(fields[2]),
+            "time_remaining": float(fields[3]),
+            "seed": int(fields[4]),
+            "language": fields[5],
+            "word_id": int(fields[6]),
+            "mode": fields[7],
+            "word": fields[8],
+            "events": events
+        }
+    except (ValueError, IndexError):
+        return None
+
+
+# Append one replay line to the log, returns success bool
+#   a single short append per game, so concurrent workers never interleave lines
+def append_replay(line, file_path=None):
+    try:
+        with open(file_path or get_replay_file(), 'a', encoding='utf-8') as f:
+            f.write(line + "\n")
+        return True
+    except OSError as e:
+        print(f"Error saving replay: {e}")
+        return False
+
+
+# Append the replay of a scored session (or UI replay record), returns success bool
+def save_replay(session, name, score, category):
+    return append_replay(format_replay(session, name, score, category))
+
+
+# Re-play a replay with the server's rules, returns "" if its score is genuine or the reason it is not
+def verify_replay(replay):
+    reason, game, hints_used = _replay_game(replay)
+    if reason:
+        return reason
+
+    if score_manager.calculate_score(game_engine.to_dict(game), replay["time_remaining"], hints_used) \
+            != replay["score"]:
+        return "score mismatch"
+    return ""
+
+
+# Re-play the events of a replay and check every rule but the score, returns (reason, game, hints used)
+def _replay_game(replay):
+    settings = game_modes.MODES.get(replay["mode"])
+    if settings is None or settings["category"] != replay["category"]:
+        return "unknown mode", None, 0
+
+    word = replay["word"] or word_manager.get_word_at(replay["language"], settings["difficulty"],
+                                                      replay["word_id"])
+    if not word:
+        return "unknown word", None, 0
+
+    game = game_engine.create_compact_game(word, settings["max_errors"])
+    timed = settings["time_limit"] is not None
+    deadline = settings["time_limit"] if timed else 0.0
+    hints_used = 0
+    elapsed = 0.0
+
+    for letter, ms in replay["events"]:
+        if ms / 1000 < elapsed:
+            return "events out of order", game, hints_used
+        elapsed = ms / 1000
+        if game_engine.get_status(game) != "in_progress":
+            return "letter played after the end", game, hints_used
+        if timed and elapsed >= deadline + TIME_TOLERANCE:
+            return "letter played after the timer ran out", game, hints_used
+
+        if letter.islower():
+            # Which letter the hint engine ranks first depends on the dictionary of the day, so a hint is only
+            # checked against the word: in it for real hints, not in it for fake ones, and not played yet
+            if hints_used >= settings["hints"]:
+                return "too many hints", game, hints_used
+            in_word = game_engine.get_letter_masks(game)[0] & game_engine.letters_to_mask(letter) != 0
+            if in_word != (settings["hint"] == "real") or not game_engine.play_letter(game, letter):
+                return "hint letter does not match", game, hints_used
+            hints_used += 1
+            continue
+
+        errors = game_engine.get_errors(game)
+        if not game_engine.play_letter(game, letter):
+            return "letter played twice", game, hints_used
+        if timed:
+            deadline += game_modes.TIME_STEP if game_engine.get_errors(game) == errors else -game_modes.TIME_STEP
+
+    if game_engine.get_status(game) != "won":
+        return "game not won", game, hints_used
+
+    time_remaining = replay["time_remaining"]
+    if time_remaining < 0 or time_remaining > (deadline - elapsed if timed else 0.0) + TIME_TOLERANCE:
+        return "time remaining too high", game, hints_used
+    return "", game, hints_used
+
+
+# Verify a chunk of replay lines, returns [(name, category, score, reason)] ("" reason = genuine)
+#   games passing every rule are scored together with one score_manager.calculate_scores call
+def verify_chunk(lines):
+    results = []
+    scored = []
+    played_masks = []
+    secret_masks = []
+    times = []
+    hints = []
+
+    for line in lines:
+        if not line.strip():
+            continue
+        replay = parse_replay(line)
+        if replay is None:
+            results.append(("", "", 0, "malformed line"))
+            continue
+
+        reason, game, hints_used = _replay_game(replay)
+        results.append((replay["name"], replay["category"], replay["score"], reason))
+        if not reason:
+            secret_mask, played_mask = game_engine.get_letter_masks(game)
+            scored.append(len(results) - 1)
+            played_masks.append(played_mask)
+            secret_masks.append(secret_mask)
+            times.append(replay["time_remaining"])
+            hints.append(hints_used)
+
+    if scored:
+        scores = score_manager.calculate_scores(played_masks, secret_masks, times, hints)
+        for i in range(len(scored)):
+            name, category, claimed, reason = results[scored[i]]
+            if scores[i] != claimed:
+                results[scored[i]] = (name, category, claimed, "score mismatch")
+    return results
+
+
+# Yield lists of up to chunk_size replay lines without reading the log whole
+def _read_chunks(replay_path, chunk_size):
+    chunk = []
+    with open(replay_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            chunk.append(line)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+# Yield verified chunks in order, keeping at most 2 chunks per worker in flight
+def _verify_chunks(replay_path, workers, chunk_size):
+    if workers == 1:
+        for chunk in _read_chunks(replay_path, chunk_size):
+            yield verify_chunk(chunk)
+        return
+
+    # Each worker opens the dictionaries on its first replay (compiled ones are mmapped, so this is cheap)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in _read_chunks(replay_path, chunk_size):
+            pending.append(executor.submit(verify_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+
+# Verify every replay of the log and match leaderboard entries to genuine replays, returns report dict or None
+def verify_leaderboard(replay_path=None, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    replay_path = replay_path or get_replay_file()
+    if not os.path.exists(replay_path):
+        print(f"Error: Replay file not found at {replay_path}")
+        return None
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    report = {"replays": 0, "genuine": 0, "rejected": {}, "entries": 0, "verified": 0, "unverified": [],
+              "not_replayable": {}}
+    genuine = Counter()
+
+    start = time.perf_counter()
+    try:
+        for results in _verify_chunks(replay_path, workers, chunk_size):
+            for name, category, score, reason in results:
+                report["replays"] += 1
+                if reason:
+                    report["rejected"][reason] = report["rejected"].get(reason, 0) + 1
+                else:
+                    report["genuine"] += 1
+                    genuine[(category, name, score)] += 1
+    except OSError as e:
+        print(f"Error reading replays: {e}")
+        return None
+    report["duration"] = time.perf_counter() - start
+
+    # Each leaderboard entry consumes one genuine replay with the same category, name and score
+    #   categories no mode plays as a single game (the infinite mode's running total) have no replays
+    replayable = set(settings["category"] for settings in game_modes.MODES.values())
+    all_scores = score_manager.get_all_scores(score_manager.LEADERBOARD_DEPTH)
+    for category in all_scores:
+        if category not in replayable:
+            report["not_replayable"][category] = len(all_scores[category])
+            continue
+        for entry in all_scores[category]:
+            report["entries"] += 1
+            key = (category, entry["name"], entry["score"])
+            if genuine[key] > 0:
+                genuine[key] -= 1
+                report["verified"] += 1
+            else:
+                report["unverified"].append({"category": category, "name": entry["name"], "score": entry["score"]})
+
+    return report
+
+
+# Command line entry point: python -m models.replay [--replay-file F] [--score-file F] [--workers N]
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-play recorded games and verify the highscores against them")
+    parser.add_argument("--replay-file", help="replay log (default: replays.txt beside the highscores file)")
+    parser.add_argument("--score-file", help="highscores file to use instead of data/highscores.txt")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="replays per task")
+    args = parser.parse_args(argv)
+
+    if args.score_file:
+        score_manager.SCORE_FILE = args.score_file
+
+    report = verify_leaderboard(args.replay_file, args.workers, args.chunk_size)
+    if report is None:
+        return 1
+
+    rate = report["replays"] / report["duration"] if report["duration"] > 0 else 0.0
+    print(f"{report['replays']} replays in {report['duration']:.2f}s ({rate:.0f}/s): "
+          f"{report['genuine']} genuine, rejected {report['rejected']}")
+    print(f"{report['verified']}/{report['entries']} leaderboard entries backed by a genuine replay")
+    for category in report["not_replayable"]:
+        print(f"Not replayable: [{category}] {report['not_replayable'][category]} entries")
+    for entry in report["unverified"]:
+        print(f"Unverified: [{entry['category']}] {entry['name']}={entry['score']}")
+    return 0 if not report["unverified"] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,323 @@
+# Session manager: many concurrent games keyed by session id, bounded by LRU + idle eviction with disk spill
+
+import os
+import re
+import time
+import random
+import secrets
+from collections import OrderedDict
+
+from models import game_engine
+
+# Session ids are used as spill file names: letters, digits, '-' and '_' only
+SESSION_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+# Session fields saved in spill files besides the game, with their type
+_SESSION_FIELDS = {
+    "language": str,
+    "difficulty": str,
+    "mode": str,
+    "hints_left": int,
+    "hints_used": int,
+    "deadline": float,
+    "time_remaining": float,
+    "submitted": int,
+    "seed": int,
+    "word_id": int,
+    "events": str,
+    "created": float,
+    "last_seen": float
+}
+
+
+# Create a manager dict; sessions hold compact game states (~0.3 KB) so max_sessions bounds memory
+#   next_sweep: clock time of the next spill directory sweep (the first access sweeps files left by a restart)
+def create_manager(max_sessions=10000, idle_timeout=1800, spill_dir=None, clock=time.time):
+    if spill_dir is not None:
+        os.makedirs(spill_dir, exist_ok=True)
+
+    return {
+        "sessions": OrderedDict(),
+        "max_sessions": max_sessions,
+        "idle_timeout": idle_timeout,
+        "spill_dir": spill_dir,
+        "clock": clock,
+        "next_sweep": 0.0,
+        "stats": {"created": 0, "evicted": 0, "expired": 0, "spilled": 0, "restored": 0, "removed": 0}
+    }
+
+
+# Return a new random session id
+def new_session_id():
+    return secrets.token_hex(8)
+
+
+# Start a game in a new session, returns the session id or None if session_id is invalid
+#   time_limit (seconds) sets a deadline the caller checks; None means no timer
+#   seed is kept with the session so its random choices (see session_rng) can be reproduced
+#   word_id (dictionary index of the word) and events are the caller's replay record, see models.replay
+def start_session(manager, secret_word, max_errors=7, language="fr", difficulty="moyen",
+                  hints_left=0, session_id=None, mode="normal", time_limit=None, seed=None, word_id=-1):
+    if session_id is None:
+        session_id = new_session_id()
+    elif not SESSION_ID_PATTERN.match(session_id):
+        print(f"Error: Invalid session id '{session_id}'")
+        return None
+
+    now = manager["clock"]()
+    session = {
+        "id": session_id,
+        "game": game_engine.create_compact_game(secret_word, max_errors),
+        "language": language,
+        "difficulty": difficulty,
+        "mode": mode,
+        "hints_left": hints_left,
+        "hints_used": 0,
+        "deadline": now + time_limit if time_limit is not None else 0.0,
+        "time_remaining": 0.0,
+        "submitted": 0,
+        "seed": seed if seed is not None else secrets.randbits(32),
+        "word_id": word_id,
+        "events": "",
+        "created": now,
+        "last_seen": now
+    }
+
+    _remove_spill_file(manager, session_id)
+    manager["sessions"][session_id] = session
+    manager["sessions"].move_to_end(session_id)
+    manager["stats"]["created"] += 1
+
+    expire_idle_sessions(manager)
+    _enforce_capacity(manager)
+    return session_id
+
+
+# Return the session (restored from disk if it was spilled) and mark it recently used, None if unknown
+def get_session(manager, session_id):
+    sessions = manager["sessions"]
+    session = sessions.get(session_id)
+
+    if session is None:
+        session = _restore_session(manager, session_id)
+        if session is None:
+            return None
+        sessions[session_id] = session
+        manager["stats"]["restored"] += 1
+
+    session["last_seen"] = manager["clock"]()
+    sessions.move_to_end(session_id)
+
+    expire_idle_sessions(manager)
+    _enforce_capacity(manager)
+    return session
+
+
+# Return a random.Random for the session's next random choice, derived from its seed and a step
+#   number: the same session replays the same choices, even after being spilled and restored
+def session_rng(session, step):
+    return random.Random(f"{session['seed']}:{step}")
+
+
+# Play a letter in a session's game, returns the session or None if unknown
+def play_letter(manager, session_id, letter):
+    session = get_session(manager, session_id)
+    if session is None:
+        return None
+
+    if game_engine.get_status(session["game"]) == "in_progress":
+        game_engine.play_letter(session["game"], letter)
+    return session
+
+
+# Remove a session from memory and disk, returns True if it existed
+def end_session(manager, session_id):
+    existed = manager["sessions"].pop(session_id, None) is not None
+    return _remove_spill_file(manager, session_id) or existed
+
+
+# Drop sessions idle longer than idle_timeout, oldest first; returns how many were dropped
+#   expired sessions are not spilled, and their old spill files are swept once per idle_timeout
+def expire_idle_sessions(manager):
+    if manager["idle_timeout"] is None:
+        return 0
+
+    sessions = manager["sessions"]
+    now = manager["clock"]()
+    limit = now - manager["idle_timeout"]
+    count = 0
+
+    # Sessions are kept in last-access order, so only the expired head is visited
+    while sessions:
+        session_id, session = next(iter(sessions.items()))
+        if session["last_seen"] > limit:
+            break
+        sessions.pop(session_id)
+        _remove_spill_file(manager, session_id)
+        manager["stats"]["expired"] += 1
+        count += 1
+
+    if manager["spill_dir"] is not None and now >= manager["next_sweep"]:
+        manager["next_sweep"] = now + manager["idle_timeout"]
+        sweep_spill_files(manager)
+    return count
+
+
+# Evict least recently used sessions while over max_sessions
+def _enforce_capacity(manager):
+    sessions = manager["sessions"]
+    while len(sessions) > manager["max_sessions"]:
+        _evict(manager, next(iter(sessions)))
+        manager["stats"]["evicted"] += 1
+
+
+# Drop a session from memory, spilling it to disk when a spill_dir is configured
+#   finished sessions (lost, or score submitted) have nothing left to resume and are not spilled
+def _evict(manager, session_id):
+    session = manager["sessions"].pop(session_id)
+    if manager["spill_dir"] is None or _is_finished(session):
+        return
+    if _spill_session(manager, session):
+        manager["stats"]["spilled"] += 1
+
+
+# True if nothing can happen in a session any more: its game is lost, or won with the score submitted
+def _is_finished(session):
+    status = game_engine.get_status(session["game"])
+    return status == "lost" or (status == "won" and session["submitted"])
+
+
+# True if a session's last access is older than idle_timeout
+def _is_expired(manager, session):
+    return manager["idle_timeout"] is not None and \
+        session["last_seen"] <= manager["clock"]() - manager["idle_timeout"]
+
+
+# Return the spill file path of a session id, None if spilling is off or the id is invalid
+def get_spill_file(manager, session_id):
+    if manager["spill_dir"] is None or not SESSION_ID_PATTERN.match(session_id):
+        return None
+    return os.path.join(manager["spill_dir"], session_id + ".txt")
+
+
+# Write a session as key=value lines (temp file + rename so a crash never leaves half a file)
+def _spill_session(manager, session):
+    file_path = get_spill_file(manager, session["id"])
+    if file_path is None:
+        return False
+
+    game = session["game"]
+    lines = [
+        f"secret={game_engine.get_secret_word(game)}",
+        f"played={''.join(game_engine.get_played_letters(game))}",
+        f"max_errors={game_engine.get_max_errors(game)}"
+    ]
+    for field in _SESSION_FIELDS:
+        lines.append(f"{field}={session[field]}")
+
+    tmp_path = file_path + ".tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, file_path)
+        return True
+    except OSError as e:
+        print(f"Error spilling session {session['id']}: {e}")
+        return False
+
+
+# Read a spill file back into a session dict, None if it is missing or unreadable
+def _read_spill_file(file_path, session_id):
+    values = {}
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.rstrip("\n")
+                if "=" in line:
+                    key, value = line.split("=", 1)
+                    values[key] = value
+
+        # Replaying the letters rebuilds errors and status with the engine's own rules
+        game = game_engine.create_compact_game(values["secret"], int(values["max_errors"]))
+        for letter in values["played"]:
+            game_engine.play_letter(game, letter)
+
+        session = {"id": session_id, "game": game}
+        for field in _SESSION_FIELDS:
+            session[field] = _SESSION_FIELDS[field](values[field])
+    except (OSError, KeyError, ValueError) as e:
+        print(f"Error reading spilled session {session_id}: {e}")
+        return None
+    return session
+
+
+# Load a spilled session back and delete its file, None if there is none or it has expired
+def _restore_session(manager, session_id):
+    file_path = get_spill_file(manager, session_id)
+    if file_path is None or not os.path.exists(file_path):
+        return None
+
+    session = _read_spill_file(file_path, session_id)
+    _remove_spill_file(manager, session_id)
+    if session is None or _is_expired(manager, session):
+        return None
+    return session
+
+
+# Delete spill files of expired or finished sessions (and unreadable ones), returns how many were removed
+def sweep_spill_files(manager):
+    spill_dir = manager["spill_dir"]
+    if spill_dir is None:
+        return 0
+
+    try:
+        file_names = os.listdir(spill_dir)
+    except OSError as e:
+        print(f"Error listing spilled sessions: {e}")
+        return 0
+
+    count = 0
+    for file_name in file_names:
+        session_id, extension = os.path.splitext(file_name)
+        if extension != ".txt" or not SESSION_ID_PATTERN.match(session_id):
+            continue
+
+        session = _read_spill_file(os.path.join(spill_dir, file_name), session_id)
+        if session is None or _is_expired(manager, session) or _is_finished(session):
+            if _remove_spill_file(manager, session_id):
+                count += 1
+
+    manager["stats"]["removed"] += count
+    return count
+
+
+# Delete a session's spill file, returns True if one was removed
+def _remove_spill_file(manager, session_id):
+    file_path = get_spill_file(manager, session_id)
+    if file_path is None or not os.path.exists(file_path):
+        return False
+    try:
+        os.remove(file_path)
+        return True
+    except OSError as e:
+        print(f"Error removing spilled session {session_id}: {e}")
+        return False
+
+
+# Spill every in-memory session to disk (shutdown), returns how many were written
+def spill_all_sessions(manager):
+    count = 0
+    while manager["sessions"]:
+        session_id = next(iter(manager["sessions"]))
+        session = manager["sessions"].pop(session_id)
+        if manager["spill_dir"] is not None and _spill_session(manager, session):
+            count += 1
+    manager["stats"]["spilled"] += count
+    return count
+
+
+# Return counters plus the number of sessions currently in memory
+def get_manager_stats(manager):
+    stats = dict(manager["stats"])
+    stats["active"] = len(manager["sessions"])
+    return stats
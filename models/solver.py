@@ -0,0 +1,206 @@
+# Headless solver: play hangman through game_engine by narrowing the dictionary candidate set
+
+import os
+import sys
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from models import game_engine
+from utils import word_manager
+from utils import hint_engine
+from utils import letter_folding
+
+# "frequency" plays the letter found in most candidates, "gain" the most informative one
+STRATEGIES = ["frequency", "gain"]
+
+# Words per task sent to a worker process
+DEFAULT_SHARD_SIZE = 500
+
+# Per-process state set by _init_worker: language, letter index, max_errors, strategy
+_worker = {}
+
+
+# Pick the next letter to play from the candidate bitset, None if every letter was played
+def choose_letter(index, candidates, letters_played, strategy="frequency"):
+    letters = [c for c in hint_engine.ALPHABET if c not in letters_played]
+    if not letters:
+        return None
+
+    # Secret not in the dictionary: fall back to frequencies over the whole dictionary
+    if candidates == 0:
+        candidates = index["all"]
+
+    if strategy == "gain":
+        ranking = hint_engine.rank_candidate_letters(index, candidates, letters)
+        if ranking[0][1] > 0:
+            return ranking[0][0]
+
+    best_letter = letters[0]
+    best_hits = -1
+    for letter in letters:
+        hits = word_manager.count_bits(candidates & index["letter"].get(letter, 0))
+        if hits > best_hits:
+            best_letter = letter
+            best_hits = hits
+    return best_letter
+
+
+# Keep only candidates consistent with where letter was (or was not) revealed in the secret
+#   the index stores folded words, so "FORÊT" is compared as "FORET"
+def narrow_candidates(index, candidates, secret_word, letter):
+    secret_word = letter_folding.fold_word(secret_word)
+    if letter not in secret_word:
+        return candidates & ~index["letter"].get(letter, 0)
+
+    for position in range(len(secret_word)):
+        mask = index["position"].get((position, letter), 0)
+        if secret_word[position] == letter:
+            candidates &= mask
+        else:
+            candidates &= ~mask
+    return candidates
+
+
+# Play one full game against word, returns {"word", "won", "errors", "guesses"}
+def solve_word(word, index, max_errors=7, strategy="frequency"):
+    state = game_engine.create_game(word, max_errors)
+    candidates = index["length"].get(len(state["secret_word"]), 0)
+
+    while state["status"] == "in_progress":
+        letter = choose_letter(index, candidates, state["letters_played"], strategy)
+        if letter is None:
+            break
+        game_engine.play_letter(state, letter)
+        candidates = narrow_candidates(index, candidates, state["secret_word"], letter)
+
+    return {
+        "word": state["secret_word"],
+        "won": state["status"] == "won",
+        "errors": state["errors"],
+        "guesses": len(state["letters_played"])
+    }
+
+
+# Aggregate results into {"games", "wins", "win_rate", "mean_errors", "mean_guesses"}
+def summarize_results(results):
+    games = len(results)
+    wins = sum(1 for r in results if r["won"])
+    return {
+        "games": games,
+        "wins": wins,
+        "win_rate": wins / games if games else 0.0,
+        "mean_errors": sum(r["errors"] for r in results) / games if games else 0.0,
+        "mean_guesses": sum(r["guesses"] for r in results) / games if games else 0.0
+    }
+
+
+# Worker initializer: build the language index once per process
+def _init_worker(language, max_errors, strategy):
+    _worker["language"] = language
+    _worker["index"] = word_manager.get_letter_index(language)
+    _worker["max_errors"] = max_errors
+    _worker["strategy"] = strategy
+
+
+# Worker task: solve words [start, end) of a difficulty section
+def _solve_shard(difficulty, start, end):
+    words = word_manager.load_words(_worker["language"]).get(difficulty, [])
+    results = []
+    for word in words[start:end]:
+        results.append(solve_word(word, _worker["index"], _worker["max_errors"], _worker["strategy"]))
+    return results
+
+
+# Solve every word of the given sections with a process pool, returns {difficulty: [results]}
+def evaluate_dictionary(language, difficulties=None, max_errors=7, strategy="frequency",
+                        workers=None, shard_size=DEFAULT_SHARD_SIZE):
+    words_data = word_manager.load_words(language)
+    if not words_data:
+        return None
+
+    if difficulties is None:
+        difficulties = list(words_data.keys())
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    shards = []
+    for difficulty in difficulties:
+        count = len(words_data.get(difficulty, []))
+        for start in range(0, count, shard_size):
+            shards.append((difficulty, start, min(start + shard_size, count)))
+
+    results = {}
+    for difficulty in difficulties:
+        results[difficulty] = []
+
+    if workers == 1:
+        _init_worker(language, max_errors, strategy)
+        for difficulty, start, end in shards:
+            results[difficulty].extend(_solve_shard(difficulty, start, end))
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(language, max_errors, strategy)) as executor:
+        futures = []
+        for difficulty, start, end in shards:
+            futures.append((difficulty, executor.submit(_solve_shard, difficulty, start, end)))
+        for difficulty, future in futures:
+            results[difficulty].extend(future.result())
+
+    return results
+
+
+# Write one "word<TAB>difficulty<TAB>won<TAB>errors<TAB>guesses" line per game
+def save_results(results, output_path):
+    try:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            for difficulty in results:
+                for r in results[difficulty]:
+                    f.write(f"{r['word']}\t{difficulty}\t{int(r['won'])}\t{r['errors']}\t{r['guesses']}\n")
+        return True
+    except OSError as e:
+        print(f"Error saving solver results: {e}")
+        return False
+
+
+# Command line entry point: python -m models.solver <language>
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play every dictionary word with the solver and report win rates")
+    parser.add_argument("language", choices=['fr', 'en'])
+    parser.add_argument("--difficulty", choices=['facile', 'moyen', 'difficile'], help="only this section")
+    parser.add_argument("--max-errors", type=int, default=7)
+    parser.add_argument("--strategy", choices=STRATEGIES, default="frequency")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE)
+    parser.add_argument("--hardest", type=int, default=10, help="hardest words listed per section")
+    parser.add_argument("--output", help="write per-word results to this TXT file")
+    args = parser.parse_args(argv)
+
+    difficulties = [args.difficulty] if args.difficulty else None
+    results = evaluate_dictionary(args.language, difficulties, args.max_errors, args.strategy,
+                                  args.workers, args.shard_size)
+    if results is None:
+        return 1
+
+    all_results = []
+    for difficulty in results:
+        summary = summarize_results(results[difficulty])
+        all_results.extend(results[difficulty])
+        print(f"[{difficulty}] {summary['games']} words, win rate {summary['win_rate']:.1%}, "
+              f"mean errors {summary['mean_errors']:.2f}, mean guesses {summary['mean_guesses']:.2f}")
+
+        hardest = sorted(results[difficulty], key=lambda r: (r["won"], -r["errors"], -r["guesses"]))
+        for r in hardest[:args.hardest]:
+            outcome = "won" if r["won"] else "lost"
+            print(f"    {r['word']}: {outcome}, {r['errors']} errors")
+
+    total = summarize_results(all_results)
+    print(f"[total] {total['games']} words, win rate {total['win_rate']:.1%}, mean errors {total['mean_errors']:.2f}")
+
+    if args.output and not save_results(results, args.output):
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,560 @@
+# Asyncio HTTP/JSON game server: sessions, dictionaries and leaderboard all served from memory
+
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+from urllib.parse import urlsplit, parse_qs
+
+from models import game_engine
+from models import game_modes
+from models import replay
+from models import session_manager
+from utils import word_manager
+from utils import score_manager
+from utils import hint_engine
+
+LANGUAGES = ['fr', 'en']
+
+# Request size limits: header block (StreamReader limit) and JSON body
+MAX_HEADER_SIZE = 16 * 1024
+MAX_BODY_SIZE = 16 * 1024
+
+REASONS = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable"
+}
+
+
+# Create the server state: session manager and the locks serializing session file I/O and score writes
+#   worker_id/peers are set by server.prefork: peers maps every worker id to its internal unix socket
+#   seed makes word draws and session seeds reproducible (None = seeded from the OS)
+def create_server_state(max_sessions=100000, idle_timeout=1800, spill_dir=None, clock=time.time,
+                        worker_id=None, peers=None, seed=None):
+    return {
+        "sessions": session_manager.create_manager(max_sessions, idle_timeout, spill_dir, clock),
+        "clock": clock,
+        "rng": random.Random(seed),
+        "session_lock": asyncio.Lock(),
+        "words_lock": asyncio.Lock(),
+        "score_lock": asyncio.Lock(),
+        "worker_id": worker_id,
+        "peers": peers or {}
+    }
+
+
+# Return the id of the worker owning a session (prefix of its id), None if it is this process
+def _session_owner(state, session_id):
+    if not state["peers"] or "-" not in session_id:
+        return None
+    owner = session_id.split("-", 1)[0]
+    if owner == state["worker_id"] or owner not in state["peers"]:
+        return None
+    return owner
+
+
+# Load dictionaries (compiled and parsed), letter indexes and highscores once, so requests never parse TXT files
+def warm_caches(state, languages=LANGUAGES):
+    for language in languages:
+        word_manager.load_compiled_words(language)
+        word_manager.load_words(language)
+        word_manager.get_letter_index(language)
+    score_manager.get_top_scores()
+
+
+# Run a word_manager-backed function(*args) on an executor thread, one at a time, returns its result
+#   a draw or a hint may recompile the dictionary or rebuild the letter index after another process added
+#   words; the lock keeps word_manager's caches to one thread
+async def _words_call(state, function, *args):
+    async with state["words_lock"]:
+        return await asyncio.get_running_loop().run_in_executor(None, function, *args)
+
+
+# Draw a new game's word and session seed, returns (word, word_id, seed)
+#   the server's word bags stay in memory: a bag file write per new game would only add disk I/O
+def _draw_word(state, language, difficulty):
+    word, word_id = word_manager.get_unique_word_entry(language, difficulty, False, state["rng"])
+    return word, word_id, state["rng"].getrandbits(32)
+
+
+# Return the hint letter of a mode for a game state, None if no letter is left
+def _choose_hint(mode, language, hint_state, rng):
+    index = word_manager.get_letter_index(language)
+    if game_modes.MODES[mode]["hint"] == "fake":
+        return hint_engine.best_fake_hint(hint_state, index, rng)
+    return hint_engine.best_real_hint(hint_state, index, rng)
+
+
+# Run function(manager, *args) of session_manager, returns its result
+#   with a spill dir any call may write evicted sessions or read a spilled one back, so it runs on an executor
+#   thread; the lock keeps those calls one at a time, as the manager is not thread-safe
+async def _sessions_call(state, function, *args):
+    manager = state["sessions"]
+    if manager["spill_dir"] is None:
+        return function(manager, *args)
+
+    async with state["session_lock"]:
+        return await asyncio.get_running_loop().run_in_executor(None, function, manager, *args)
+
+
+# Return seconds left on a session's timer, None if the mode has no timer
+def _time_left(state, session):
+    if not session["deadline"]:
+        return None
+    return max(0.0, session["deadline"] - state["clock"]())
+
+
+# End the game as lost if its timer ran out, returns True if the game is still in progress
+def _check_timer(state, session):
+    game = session["game"]
+    if game_engine.get_status(game) != "in_progress":
+        return False
+
+    if session["deadline"] and state["clock"]() >= session["deadline"]:
+        game_engine.lose_game(game)
+        return False
+    return True
+
+
+# Freeze the remaining time once the game is over (used by the score)
+def _finish_if_over(state, session):
+    if game_engine.get_status(session["game"]) != "in_progress":
+        session["time_remaining"] = _time_left(state, session) or 0.0
+
+
+# Public view of a session; the secret word is only revealed once the game is over
+def game_view(state, session):
+    game = session["game"]
+    status = game_engine.get_status(game)
+    view = {
+        "session": session["id"],
+        "mode": session["mode"],
+        "language": session["language"],
+        "masked": game_engine.get_masked_word(game),
+        "status": status,
+        "errors": game_engine.get_errors(game),
+        "max_errors": game_engine.get_max_errors(game),
+        "played": game_engine.get_played_letters(game),
+        "hints_left": session["hints_left"],
+        "time_remaining": _time_left(state, session) if status == "in_progress" else session["time_remaining"]
+    }
+    if status != "in_progress":
+        view["word"] = game_engine.get_secret_word(game)
+    return view
+
+
+# POST /games {"mode", "language"}: start a game with a word from the cached dictionary
+async def handle_new_game(state, body):
+    mode = body.get("mode", "normal")
+    language = body.get("language", "fr")
+    if not isinstance(mode, str) or not isinstance(language, str):
+        return 400, {"error": "mode and language must be strings"}
+    if mode not in game_modes.MODES:
+        return 400, {"error": f"unknown mode '{mode}'"}
+    if language not in LANGUAGES:
+        return 400, {"error": f"unsupported language '{language}'"}
+
+    settings = game_modes.MODES[mode]
+    word, word_id, seed = await _words_call(state, _draw_word, state, language, settings["difficulty"])
+    if not word:
+        return 503, {"error": "no words available"}
+
+    # The worker id prefix routes later requests of this session back to its owner
+    session_id = session_manager.new_session_id()
+    if state["worker_id"] is not None:
+        session_id = f"{state['worker_id']}-{session_id}"
+
+    await _sessions_call(state, session_manager.start_session, word, settings["max_errors"], language,
+                         settings["difficulty"], settings["hints"], session_id, mode, settings["time_limit"],
+                         seed, word_id)
+    session = await _sessions_call(state, session_manager.get_session, session_id)
+    return 201, game_view(state, session)
+
+
+# GET /games/<id>: current state of a game
+async def handle_get_game(state, session_id):
+    session = await _sessions_call(state, session_manager.get_session, session_id)
+    if session is None:
+        return 404, {"error": "unknown session"}
+
+    _check_timer(state, session)
+    _finish_if_over(state, session)
+    return 200, game_view(state, session)
+
+
+# Add a played letter to the session's replay events, timestamped from the game start
+def _record_event(state, session, letter, hint=False):
+    elapsed = state["clock"]() - session["created"]
+    session["events"] = replay.add_event(session["events"], elapsed, letter, hint)
+
+
+# POST /games/<id>/guess {"letter"}: play a letter, moving the timer like the UI does
+async def handle_guess(state, session_id, body):
+    letter = body.get("letter")
+    if not isinstance(letter, str) or len(letter) != 1 or not letter.isalpha():
+        return 400, {"error": "letter must be a single alphabetic character"}
+
+    session = await _sessions_call(state, session_manager.get_session, session_id)
+    if session is None:
+        return 404, {"error": "unknown session"}
+
+    if _check_timer(state, session):
+        game = session["game"]
+        errors = game_engine.get_errors(game)
+        if game_engine.play_letter(game, letter):
+            _record_event(state, session, letter)
+            if session["deadline"]:
+                if game_engine.get_errors(game) == errors:
+                    session["deadline"] += game_modes.TIME_STEP
+                else:
+                    session["deadline"] -= game_modes.TIME_STEP
+
+    _finish_if_over(state, session)
+    return 200, game_view(state, session)
+
+
+# POST /games/<id>/hint: play the best real (or, in easy mode, fake) hint letter
+async def handle_hint(state, session_id):
+    session = await _sessions_call(state, session_manager.get_session, session_id)
+    if session is None:
+        return 404, {"error": "unknown session"}
+
+    if not _check_timer(state, session):
+        _finish_if_over(state, session)
+        return 409, {"error": "game is over"}
+    if session["hints_left"] <= 0:
+        return 409, {"error": "no hints left"}
+
+    game = session["game"]
+    hint_state = {
+        "secret_word": game_engine.get_secret_word(game),
+        "letters_played": set(game_engine.get_played_letters(game))
+    }
+    hints_used = session["hints_used"]
+    played = hint_state["letters_played"]
+    rng = session_manager.session_rng(session, hints_used)
+    letter = await _words_call(state, _choose_hint, session["mode"], session["language"], hint_state, rng)
+
+    # Another request of this session may have played while the hint was computed
+    if session["hints_used"] != hints_used or set(game_engine.get_played_letters(game)) != played:
+        return 409, {"error": "game changed while the hint was computed"}
+    if not _check_timer(state, session):
+        _finish_if_over(state, session)
+        return 409, {"error": "game is over"}
+
+    if letter:
+        game_engine.play_letter(game, letter)
+        _record_event(state, session, letter, hint=True)
+        session["hints_left"] -= 1
+        session["hints_used"] += 1
+
+    _finish_if_over(state, session)
+    view = game_view(state, session)
+    view["hint"] = letter
+    return 200, view
+
+
+# POST /games/<id>/score {"name"}: score a won game and save it if it makes the leaderboard
+async def handle_score(state, session_id, body):
+    name = body.get("name")
+    if not score_manager.is_valid_name(name):
+        return 400, {"error": f"name must be 1 to {score_manager.MAX_NAME_LENGTH} letters"}
+
+    session = await _sessions_call(state, session_manager.get_session, session_id)
+    if session is None:
+        return 404, {"error": "unknown session"}
+
+    category = game_modes.MODES[session["mode"]]["category"]
+    game = session["game"]
+    if game_engine.get_status(game) != "won" or category is None:
+        return 409, {"error": "only won games of scored modes can be submitted"}
+    if session["submitted"]:
+        return 409, {"error": "score already submitted"}
+
+    session["submitted"] = 1
+    score = score_manager.calculate_score(game_engine.to_dict(game), session["time_remaining"],
+                                          session["hints_used"])
+
+    # The replay lets models.replay re-play the game later and check this score
+    await asyncio.get_running_loop().run_in_executor(None, replay.append_replay,
+                                                     replay.format_replay(session, name, score, category))
+
+    # Every worker saves directly: score_manager's file lock and journal order writers across processes
+    result = await submit_score(state, name, score, category)
+    result.update({"score": score, "category": category})
+    return 200, result
+
+
+# Record a score in the history and the leaderboard, returns {"saved", "rank", "percentile"}
+async def submit_score(state, name, score, category):
+    async with state["score_lock"]:
+        # File and database writes off the event loop; the lock keeps saves in submission order
+        saved = await asyncio.get_running_loop().run_in_executor(None, score_manager.save_score,
+                                                                 name, score, category)
+    result = await asyncio.get_running_loop().run_in_executor(None, _rank_view, score, category)
+    result["saved"] = saved
+    return result
+
+
+# Return {"rank", "percentile"} of a score; SQLite queries, so callers run it on an executor thread
+def _rank_view(score, category):
+    return {"rank": score_manager.get_rank(score, category),
+            "percentile": score_manager.get_percentile(score, category)}
+
+
+# GET /scores?category=normal: cached leaderboard of one category (all categories without query)
+async def handle_scores(state, query):
+    return 200, await asyncio.get_running_loop().run_in_executor(None, _scores_view,
+                                                                 query.get("category", [None])[0])
+
+
+# Return the leaderboard of one category (all categories for None)
+#   a refresh after another process saved takes the shared file lock: callers run it on an executor thread
+def _scores_view(category):
+    if category is None:
+        return score_manager.get_all_scores()
+    return {category: score_manager.get_top_scores(category)}
+
+
+# GET /scores/rank?category=normal&score=120: rank and percentile of a score among every recorded score
+async def handle_rank(state, query):
+    category = query.get("category", ["normal"])[0]
+    try:
+        score = int(query.get("score", [""])[0])
+    except ValueError:
+        return 400, {"error": "score must be an integer"}
+
+    result = {"category": category, "score": score}
+    result.update(await asyncio.get_running_loop().run_in_executor(None, _rank_view, score, category))
+    return 200, result
+
+
+# GET /health: session counters of the worker answering
+def handle_health(state):
+    return 200, {"status": "ok", "worker": state["worker_id"],
+                 "sessions": session_manager.get_manager_stats(state["sessions"])}
+
+
+# Route a request to its handler, returns (status code, JSON-serializable payload)
+async def dispatch(state, method, target, body_bytes):
+    url = urlsplit(target)
+    parts = [part for part in url.path.split("/") if part]
+
+    # Session affinity: a game request reaching another worker is relayed to the session's owner
+    if len(parts) >= 2 and parts[0] == "games":
+        owner = _session_owner(state, parts[1])
+        if owner is not None:
+            return await forward_request(state, owner, method, target, body_bytes)
+
+    body = {}
+    if body_bytes:
+        try:
+            body = json.loads(body_bytes.decode('utf-8'))
+        except (UnicodeDecodeError, ValueError):
+            return 400, {"error": "invalid JSON body"}
+        if not isinstance(body, dict):
+            return 400, {"error": "JSON body must be an object"}
+
+    if parts == ["games"]:
+        if method != "POST":
+            return 405, {"error": "use POST"}
+        return await handle_new_game(state, body)
+
+    if len(parts) == 2 and parts[0] == "games":
+        if method != "GET":
+            return 405, {"error": "use GET"}
+        return await handle_get_game(state, parts[1])
+
+    if len(parts) == 3 and parts[0] == "games" and parts[2] in ("guess", "hint", "score"):
+        if method != "POST":
+            return 405, {"error": "use POST"}
+        if parts[2] == "guess":
+            return await handle_guess(state, parts[1], body)
+        if parts[2] == "hint":
+            return await handle_hint(state, parts[1])
+        return await handle_score(state, parts[1], body)
+
+    if parts == ["scores"] and method == "GET":
+        return await handle_scores(state, parse_qs(url.query))
+
+    if parts == ["scores", "rank"] and method == "GET":
+        return await handle_rank(state, parse_qs(url.query))
+
+    if parts == ["health"] and method == "GET":
+        return handle_health(state)
+
+    return 404, {"error": "not found"}
+
+
+# Read one HTTP request, returns (method, target, version, headers, body) or None on a closed connection
+async def read_request(reader):
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as e:
+        if e.partial.strip():
+            raise ValueError("truncated request")
+        return None
+
+    lines = head.decode('latin-1').split("\r\n")
+    request_line = lines[0].split(" ")
+    if len(request_line) != 3:
+        raise ValueError("malformed request line")
+    method, target, version = request_line
+
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            key, value = line.split(":", 1)
+            headers[key.strip().lower()] = value.strip()
+
+    length = int(headers.get("content-length", "0"))
+    if length < 0:
+        raise ValueError("negative content length")
+    if length > MAX_BODY_SIZE:
+        return method, target, version, headers, None
+
+    body = await reader.readexactly(length) if length else b""
+    return method, target, version, headers, body
+
+
+# Send a request to another worker's internal socket, returns its (status code, payload)
+async def forward_request(state, worker_id, method, target, body):
+    if isinstance(body, dict):
+        body = json.dumps(body).encode('utf-8')
+
+    try:
+        reader, writer = await asyncio.open_unix_connection(state["peers"][worker_id])
+    except OSError as e:
+        print(f"Error: worker {worker_id} unreachable: {e}")
+        return 503, {"error": f"worker {worker_id} unavailable"}
+
+    try:
+        writer.write(f"{method} {target} HTTP/1.1\r\nConnection: close\r\n"
+                     f"Content-Length: {len(body)}\r\n\r\n".encode('latin-1') + body)
+        await writer.drain()
+
+        head = await reader.readuntil(b"\r\n\r\n")
+        lines = head.decode('latin-1').split("\r\n")
+        status = int(lines[0].split(" ")[1])
+        length = 0
+        for line in lines[1:]:
+            if line.lower().startswith("content-length:"):
+                length = int(line.split(":", 1)[1])
+        return status, json.loads(await reader.readexactly(length))
+    except (OSError, ValueError, IndexError, asyncio.IncompleteReadError) as e:
+        print(f"Error: bad response from worker {worker_id}: {e}")
+        return 503, {"error": f"worker {worker_id} unavailable"}
+    finally:
+        writer.close()
+
+
+# Encode a JSON response with status line and headers
+def format_response(status, payload, keep_alive=True):
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    head = (f"HTTP/1.1 {status} {REASONS.get(status, 'Unknown')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode('latin-1') + body
+
+
+# Serve requests of one connection until the client closes it (HTTP/1.1 keep-alive)
+async def handle_connection(state, reader, writer):
+    try:
+        while True:
+            try:
+                request = await read_request(reader)
+            except (ValueError, asyncio.LimitOverrunError):
+                writer.write(format_response(400, {"error": "malformed request"}, False))
+                break
+            if request is None:
+                break
+
+            method, target, version, headers, body = request
+            connection = headers.get("connection", "").lower()
+            keep_alive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+
+            if body is None:
+                writer.write(format_response(413, {"error": "body too large"}, False))
+                break
+
+            # A handler bug answers this request with a 500 instead of dropping the connection unanswered
+            try:
+                status, payload = await dispatch(state, method, target, body)
+            except Exception as e:
+                print(f"Error handling {method} {target}: {e!r}")
+                status, payload = 500, {"error": "internal error"}
+            writer.write(format_response(status, payload, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+# Start listening; returns the asyncio server (port 0 picks a free port, see server.sockets)
+#   sock is an already bound listening socket shared by forked workers
+async def start_server(state, host="127.0.0.1", port=8080, sock=None):
+    # limit bounds the header block a client can make us buffer
+    if sock is not None:
+        return await asyncio.start_server(lambda r, w: handle_connection(state, r, w),
+                                          sock=sock, limit=MAX_HEADER_SIZE)
+    return await asyncio.start_server(lambda r, w: handle_connection(state, r, w),
+                                      host, port, limit=MAX_HEADER_SIZE)
+
+
+# Listen for requests relayed by other workers on this worker's unix socket
+async def start_internal_server(state, path):
+    return await asyncio.start_unix_server(lambda r, w: handle_connection(state, r, w),
+                                           path, limit=MAX_HEADER_SIZE)
+
+
+# Create state, warm caches and serve forever
+async def serve(host, port, max_sessions, idle_timeout, spill_dir, seed=None):
+    state = create_server_state(max_sessions, idle_timeout, spill_dir, seed=seed)
+    warm_caches(state)
+    server = await start_server(state, host, port)
+    print(f"Hangman server listening on {host}:{port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        session_manager.spill_all_sessions(state["sessions"])
+
+
+# Command line entry point: python -m server.game_server [--port 8080]
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve hangman games over HTTP/JSON")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--max-sessions", type=int, default=100000)
+    parser.add_argument("--idle-timeout", type=float, default=1800, help="seconds before an idle game is evicted")
+    parser.add_argument("--spill-dir", help="write evicted games here so they can be resumed")
+    parser.add_argument("--score-file", help="highscores file to use instead of data/highscores.txt")
+    parser.add_argument("--seed", type=int, help="seed word draws and sessions for reproducible runs")
+    args = parser.parse_args(argv)
+
+    if args.score_file:
+        score_manager.SCORE_FILE = args.score_file
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.max_sessions, args.idle_timeout, args.spill_dir,
+                          args.seed))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
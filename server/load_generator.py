@@ -0,0 +1,248 @@
+# Load generator: simulated players hammer a game server, report per-endpoint latency percentiles
+
+import os
+import sys
+import json
+import time
+import random
+import socket
+import shutil
+import asyncio
+import argparse
+import tempfile
+import subprocess
+
+from models import solver
+from utils import word_manager
+from utils import hint_engine
+from utils import letter_folding
+
+# "random" guesses any unplayed letter; solver strategies narrow the dictionary from the masked word
+PLAYER_STRATEGIES = ["random"] + solver.STRATEGIES
+
+PERCENTILES = [50, 95, 99]
+
+
+# Return the p-th percentile (nearest rank) of an ascending list, 0.0 if empty
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * p // 100))
+    return sorted_values[int(rank) - 1]
+
+
+# Return {endpoint: {"count", "errors", "p50", "p95", "p99", "max"}} with latencies in milliseconds
+def summarize_latencies(latencies, errors):
+    summary = {}
+    for endpoint in sorted(latencies):
+        values = sorted(latencies[endpoint])
+        summary[endpoint] = {"count": len(values), "errors": errors.get(endpoint, 0)}
+        for p in PERCENTILES:
+            summary[endpoint][f"p{p}"] = percentile(values, p) * 1000
+        summary[endpoint]["max"] = values[-1] * 1000 if values else 0.0
+    return summary
+
+
+# Send one keep-alive request and read the JSON response, returns (status code, payload)
+async def send_request(reader, writer, method, path, body=None):
+    data = json.dumps(body).encode('utf-8') if body is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: load\r\nContent-Length: {len(data)}\r\n\r\n"
+                 .encode('latin-1') + data)
+    await writer.drain()
+
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode('latin-1').split("\r\n")
+    status = int(lines[0].split(" ")[1])
+    length = 0
+    for line in lines[1:]:
+        if line.lower().startswith("content-length:"):
+            length = int(line.split(":", 1)[1])
+    return status, json.loads(await reader.readexactly(length))
+
+
+# Pick the player's next letter from what the server showed (masked word and played letters)
+def choose_guess(game, strategy, index, rng):
+    played = set(game["played"])
+    if strategy == "random" or index is None:
+        letters = [c for c in hint_engine.ALPHABET if c not in played]
+        return rng.choice(letters) if letters else None
+
+    pattern = letter_folding.fold_word(game["masked"].replace(" ", ""))
+    absent = "".join(letter for letter in played if letter not in pattern)
+    candidates = word_manager.query_letter_index(index, pattern=pattern, absent=absent)
+    return solver.choose_letter(index, candidates, played, strategy)
+
+
+# One simulated player: plays `games` games on one keep-alive connection, recording every request
+async def run_player(host, port, games, options, index, stats, rng):
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+    except OSError:
+        stats["connect_errors"] += 1
+        return
+
+    # Record latency of one request under its endpoint name, None payload on failure
+    async def timed(endpoint, method, path, body=None):
+        start = time.perf_counter()
+        status, payload = await send_request(reader, writer, method, path, body)
+        stats["latencies"].setdefault(endpoint, []).append(time.perf_counter() - start)
+        if status >= 400:
+            stats["errors"][endpoint] = stats["errors"].get(endpoint, 0) + 1
+            return None
+        return payload
+
+    try:
+        for _ in range(games):
+            game = await timed("POST /games", "POST", "/games",
+                               {"mode": options["mode"], "language": options["language"]})
+            if game is None:
+                continue
+            path = f"/games/{game['session']}"
+
+            if options["hint"]:
+                game = await timed("POST /games/<id>/hint", "POST", path + "/hint") or game
+
+            while game["status"] == "in_progress":
+                letter = choose_guess(game, options["strategy"], index, rng)
+                if letter is None:
+                    break
+                result = await timed("POST /games/<id>/guess", "POST", path + "/guess", {"letter": letter})
+                if result is None:
+                    break
+                game = result
+
+            stats["games"][game["status"]] = stats["games"].get(game["status"], 0) + 1
+            if game["status"] == "won" and options["submit_scores"]:
+                await timed("POST /games/<id>/score", "POST", path + "/score", {"name": "LOAD"})
+            if options["read_scores"]:
+                await timed("GET /scores", "GET", "/scores?category=normal")
+    except (OSError, ValueError, asyncio.IncompleteReadError):
+        stats["connect_errors"] += 1
+    finally:
+        writer.close()
+
+
+# Run `players` concurrent players against host:port, returns the report dict
+async def run_load(host, port, players=100, games=5, strategy="random", mode="normal", language="fr",
+                   hint=False, submit_scores=True, read_scores=False, seed=None):
+    index = word_manager.get_letter_index(language) if strategy != "random" else None
+    options = {"mode": mode, "language": language, "strategy": strategy, "hint": hint,
+               "submit_scores": submit_scores, "read_scores": read_scores}
+    stats = {"latencies": {}, "errors": {}, "games": {}, "connect_errors": 0}
+    base_seed = seed if seed is not None else random.randrange(1 << 30)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        run_player(host, port, games, options, index, stats, random.Random(base_seed + i))
+        for i in range(players)
+    ])
+    duration = time.perf_counter() - start
+
+    requests = sum(len(values) for values in stats["latencies"].values())
+    return {
+        "players": players,
+        "duration": duration,
+        "requests": requests,
+        "throughput": requests / duration if duration > 0 else 0.0,
+        "games": stats["games"],
+        "connect_errors": stats["connect_errors"],
+        "endpoints": summarize_latencies(stats["latencies"], stats["errors"])
+    }
+
+
+# Return report lines: one per endpoint plus totals
+def format_report(report):
+    lines = [f"{report['players']} players, {report['requests']} requests in {report['duration']:.2f}s "
+             f"({report['throughput']:.0f} req/s), games {report['games']}, "
+             f"connection errors {report['connect_errors']}"]
+    lines.append(f"{'endpoint':<26}{'count':>8}{'errors':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for endpoint, row in report["endpoints"].items():
+        lines.append(f"{endpoint:<26}{row['count']:>8}{row['errors']:>8}{row['p50']:>9.2f}"
+                     f"{row['p95']:>9.2f}{row['p99']:>9.2f}{row['max']:>9.2f}")
+    return lines
+
+
+# Start `python -m server.game_server` (or server.prefork) on a free local port, returns (process, port)
+#   score_file keeps load-test scores out of data/highscores.txt
+def start_local_server(workers=1, score_file=None):
+    probe = socket.socket()
+    probe.bind(("127.0.0.1", 0))
+    port = probe.getsockname()[1]
+    probe.close()
+
+    module = "server.game_server" if workers <= 1 else "server.prefork"
+    command = [sys.executable, "-m", module, "--port", str(port)]
+    if workers > 1:
+        command += ["--workers", str(workers)]
+    if score_file:
+        command += ["--score-file", score_file]
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    process = subprocess.Popen(command, cwd=root, stdout=subprocess.DEVNULL)
+
+    for _ in range(200):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return process, port
+        except OSError:
+            time.sleep(0.05)
+    process.terminate()
+    return None, port
+
+
+# Command line entry point: python -m server.load_generator [--players 1000] [--start-server]
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate concurrent players and report latency percentiles")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--start-server", action="store_true", help="start a local server on a free port")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes of the started server")
+    parser.add_argument("--players", type=int, default=1000, help="concurrent players (one connection each)")
+    parser.add_argument("--games", type=int, default=5, help="games per player")
+    parser.add_argument("--strategy", choices=PLAYER_STRATEGIES, default="random")
+    parser.add_argument("--mode", choices=["easy", "normal", "hard"], default="normal")
+    parser.add_argument("--language", choices=['fr', 'en'], default="fr")
+    parser.add_argument("--hint", action="store_true", help="use one hint per game")
+    parser.add_argument("--no-scores", action="store_true", help="do not submit scores of won games")
+    parser.add_argument("--read-scores", action="store_true", help="read the leaderboard after every game")
+    parser.add_argument("--seed", type=int, help="seed of the players' random guesses")
+    parser.add_argument("--output", help="also write the report as JSON to this file")
+    args = parser.parse_args(argv)
+
+    process = None
+    temp_dir = None
+    host, port = args.host, args.port
+    if args.start_server:
+        temp_dir = tempfile.mkdtemp()
+        process, port = start_local_server(args.workers, os.path.join(temp_dir, 'highscores.txt'))
+        host = "127.0.0.1"
+        if process is None:
+            print("Error: Local server did not start")
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            return 1
+
+    try:
+        report = asyncio.run(run_load(host, port, args.players, args.games, args.strategy, args.mode,
+                                      args.language, args.hint, not args.no_scores, args.read_scores,
+                                      args.seed))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+        if temp_dir is not None:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    for line in format_report(report):
+        print(line)
+
+    if args.output:
+        try:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+        except OSError as e:
+            print(f"Error writing report: {e}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
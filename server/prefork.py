@@ -0,0 +1,147 @@
+# Prefork server: N forked workers share one listening socket, the mmapped dictionaries and the score files
+
+import os
+import sys
+import signal
+import shutil
+import socket
+import asyncio
+import argparse
+import tempfile
+
+from server import game_server
+from models import session_manager
+from utils import word_manager
+from utils import score_manager
+
+
+# Open the compiled (mmapped) dictionaries and build letter indexes before forking:
+#   workers read the same page-cache pages and the parent's index copy-on-write, no per-worker copy
+def prepare_shared_data(languages=game_server.LANGUAGES):
+    for language in languages:
+        if word_manager.load_compiled_words(language) is None:
+            print(f"Error: Could not compile the {language} dictionary")
+        word_manager.get_letter_index(language)
+
+
+# Run one worker's event loop until SIGTERM: public socket shared with the other workers + internal socket
+async def _run_worker(worker_id, sock, peers, settings):
+    # Each worker derives its own seed: reproducible runs without workers drawing the same words
+    seed = f"{settings['seed']}:{worker_id}" if settings["seed"] is not None else None
+    state = game_server.create_server_state(settings["max_sessions"], settings["idle_timeout"],
+                                            settings["spill_dir"], worker_id=worker_id, peers=peers, seed=seed)
+    game_server.warm_caches(state)
+
+    stop = asyncio.Event()
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set)
+
+    internal = await game_server.start_internal_server(state, peers[worker_id])
+    public = await game_server.start_server(state, sock=sock)
+    async with internal, public:
+        await stop.wait()
+
+    session_manager.spill_all_sessions(state["sessions"])
+
+
+# Child process body: serve, then exit without returning into the parent's code
+def _worker_process(worker_id, sock, peers, settings):
+    # Ctrl+C reaches the whole process group: only the parent handles it, then stops workers with SIGTERM
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    code = 1
+    try:
+        asyncio.run(_run_worker(worker_id, sock, peers, settings))
+        code = 0
+    except Exception as e:
+        print(f"Error in worker {worker_id}: {e}")
+    finally:
+        sys.stdout.flush()
+        os._exit(code)
+
+
+# Fork a worker, returns its pid
+def _spawn_worker(worker_id, sock, peers, settings):
+    pid = os.fork()
+    if pid == 0:
+        _worker_process(worker_id, sock, peers, settings)
+    return pid
+
+
+# SIGTERM handler of the parent: leave the supervision loop like Ctrl+C
+def _stop_parent(signum, frame):
+    raise KeyboardInterrupt
+
+
+# Serve with `workers` forked processes until interrupted, restarting workers that die; returns exit code
+def serve_prefork(host="127.0.0.1", port=8080, workers=4, max_sessions=100000, idle_timeout=1800,
+                  spill_dir=None, seed=None):
+    if not hasattr(os, "fork"):
+        print("Error: Multi-worker mode needs os.fork (POSIX)")
+        return 1
+
+    settings = {"max_sessions": max_sessions, "idle_timeout": idle_timeout, "spill_dir": spill_dir, "seed": seed}
+
+    prepare_shared_data()
+
+    # Every worker accepts on this one socket; the kernel hands each connection to one of them
+    sock = socket.create_server((host, port), backlog=1024)
+    runtime_dir = tempfile.mkdtemp(prefix="pendu-workers-")
+    peers = {}
+    for i in range(workers):
+        peers[str(i)] = os.path.join(runtime_dir, f"worker-{i}.sock")
+
+    pids = {}
+    signal.signal(signal.SIGTERM, _stop_parent)
+    try:
+        for worker_id in peers:
+            pids[_spawn_worker(worker_id, sock, peers, settings)] = worker_id
+        print(f"Hangman server listening on {host}:{port} with {workers} workers")
+
+        while pids:
+            pid, status = os.wait()
+            worker_id = pids.pop(pid, None)
+            if worker_id is not None:
+                print(f"Worker {worker_id} exited ({status}), restarting")
+                pids[_spawn_worker(worker_id, sock, peers, settings)] = worker_id
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except OSError:
+                pass
+        for pid in pids:
+            try:
+                os.waitpid(pid, 0)
+            except OSError:
+                pass
+        sock.close()
+        shutil.rmtree(runtime_dir, ignore_errors=True)
+
+    return 0
+
+
+# Command line entry point: python -m server.prefork --workers 4 [--port 8080]
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve hangman games over HTTP/JSON with several worker processes")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--max-sessions", type=int, default=100000, help="games kept in memory per worker")
+    parser.add_argument("--idle-timeout", type=float, default=1800, help="seconds before an idle game is evicted")
+    parser.add_argument("--spill-dir", help="write evicted games here so they can be resumed")
+    parser.add_argument("--score-file", help="highscores file to use instead of data/highscores.txt")
+    parser.add_argument("--seed", type=int, help="seed word draws and sessions for reproducible runs")
+    args = parser.parse_args(argv)
+
+    # Set before forking so every worker inherits it
+    if args.score_file:
+        score_manager.SCORE_FILE = args.score_file
+
+    return serve_prefork(args.host, args.port, args.workers, args.max_sessions, args.idle_timeout,
+                         args.spill_dir, args.seed)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -10,10 +10,54 @@ test_logger.log("HANGMAN GAME - UNIT TESTS")
 from tests import test_game_engine
 test_game_engine.run_all_tests()
 
+# Run Batch Engine tests
+from tests import test_batch_engine
+test_batch_engine.run_all_tests()
+
+# Run Session Manager tests
+from tests import test_session_manager
+test_session_manager.run_all_tests()
+
+# Run Solver tests
+from tests import test_solver
+test_solver.run_all_tests()
+
 # Run Word Manager tests
 from tests import test_word_manager
 test_word_manager.run_all_tests()
 
+# Run Word Importer tests
+from tests import test_word_importer
+test_word_importer.run_all_tests()
+
+# Run Difficulty Classifier tests
+from tests import test_difficulty_classifier
+test_difficulty_classifier.run_all_tests()
+
+# Run Hint Engine tests
+from tests import test_hint_engine
+test_hint_engine.run_all_tests()
+
+# Run Letter Folding tests
+from tests import test_letter_folding
+test_letter_folding.run_all_tests()
+
+# Run Game Server tests
+from tests import test_game_server
+test_game_server.run_all_tests()
+
+# Run Prefork Server tests
+from tests import test_prefork
+test_prefork.run_all_tests()
+
+# Run Load Generator tests
+from tests import test_load_generator
+test_load_generator.run_all_tests()
+
+# Run Replay tests
+from tests import test_replay
+test_replay.run_all_tests()
+
 # Run Language Manager tests
 from tests import test_language_manager
 test_language_manager.run_all_tests()
@@ -22,5 +66,9 @@ test_language_manager.run_all_tests()
 from tests import test_score_manager
 test_score_manager.run_all_tests()
 
+# Run Score History tests
+from tests import test_score_history
+test_score_history.run_all_tests()
+
 test_logger.log("\nALL TESTS COMPLETED")
 test_logger.save()
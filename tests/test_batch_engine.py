@@ -0,0 +1,150 @@
+# Tests for batch_engine module: create_batch, play_letters, play_sequence, parity with game_engine
+
+import random
+
+import numpy as np
+
+from models import batch_engine
+from models import game_engine
+from utils import score_manager
+from tests import test_logger
+
+
+# Raise AssertionError if actual != expected
+def assert_equal(actual, expected, test_name):
+    if actual != expected:
+        raise AssertionError(f"Expected {expected}, got {actual}")
+
+
+# Verify batch creation encodes secrets and starts every game in progress
+def test_create_batch():
+    batch = batch_engine.create_batch(["chat", "Été"], 5)
+
+    assert_equal(batch_engine.batch_size(batch), 2, "test_create_batch")
+    assert_equal(int(batch["secret_mask"][0]), game_engine.letters_to_mask("CHAT"), "test_create_batch")
+    assert_equal(batch_engine.get_secret_word(batch, 1), "ÉTÉ", "test_create_batch")
+    assert_equal(batch["max_errors"].tolist(), [5, 5], "test_create_batch")
+    assert_equal(batch_engine.count_statuses(batch), {"in_progress": 2, "won": 0, "lost": 0}, "test_create_batch")
+
+
+# Verify one vector step applies a different guess to each game
+def test_play_letters_vector():
+    batch = batch_engine.create_batch(["chat", "chien", "poule"])
+    batch_engine.play_letters(batch, ["C", "z", "P"])
+
+    assert_equal(batch["errors"].tolist(), [0, 1, 0], "test_play_letters_vector")
+    assert_equal(batch_engine.get_masked_words(batch), ["C _ _ _", "_ _ _ _ _", "P _ _ _ _"],
+                 "test_play_letters_vector")
+
+
+# Verify repeated letters and NO_GUESS leave games unchanged
+def test_play_letters_ignored():
+    batch = batch_engine.create_batch(["chat", "chat"], 7)
+    batch_engine.play_letters(batch, "Z")
+    batch_engine.play_letters(batch, ["Z", batch_engine.NO_GUESS])
+
+    assert_equal(batch["errors"].tolist(), [1, 1], "test_play_letters_ignored")
+
+
+# Verify a fixed guess order ends games in wins and losses like the scalar engine
+def test_play_sequence():
+    batch = batch_engine.create_batch(["chat", "zygote"], 3)
+    statuses = batch_engine.play_sequence(batch, "CHATBDE")
+
+    assert_equal(statuses.tolist(), [game_engine.STATUS_WON, game_engine.STATUS_LOST], "test_play_sequence")
+
+
+# Verify random games match game_engine compact states move for move
+def test_parity_with_game_engine():
+    rng = random.Random(42)
+    alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    words = ["".join(rng.choice(alphabet[:10]) for _ in range(rng.randint(2, 9))) for _ in range(300)]
+
+    batch = batch_engine.create_batch(words, 4)
+    states = [game_engine.create_compact_game(word, 4) for word in words]
+
+    for step in range(20):
+        guesses = [rng.choice(alphabet[:14]) for _ in words]
+        batch_engine.play_letters(batch, guesses)
+        for i in range(len(words)):
+            # Callers stop playing once a game is over; the batch engine freezes finished games
+            if game_engine.get_status(states[i]) == "in_progress":
+                game_engine.play_letter(states[i], guesses[i])
+
+    for i in range(len(words)):
+        assert_equal(batch_engine.get_game(batch, i), states[i], "test_parity_with_game_engine")
+        assert_equal(batch_engine.get_masked_words(batch, [i])[0], game_engine.get_masked_word(states[i]),
+                     "test_parity_with_game_engine")
+
+    assert_equal(batch_engine.get_scores(batch, 12.5, 1).tolist(),
+                 [score_manager.calculate_score(game_engine.to_dict(state), 12.5, 1) for state in states],
+                 "test_parity_with_game_engine")
+
+
+# Verify hyphens, apostrophes and accents are kept and shown as game_engine shows them
+def test_parity_special_characters():
+    words = ["porte-monnaie", "aujourd'hui", "fenêtre", "Noël", "cœur", "garçon"]
+    batch = batch_engine.create_batch(words, 7)
+    states = [game_engine.create_compact_game(word, 7) for word in words]
+
+    assert_equal(batch_engine.get_masked_words(batch), [game_engine.get_masked_word(state) for state in states],
+                 "test_parity_special_characters")
+
+    for letter in "EORNACU":
+        batch_engine.play_letters(batch, letter)
+        for state in states:
+            if game_engine.get_status(state) == "in_progress":
+                game_engine.play_letter(state, letter)
+
+        assert_equal(batch_engine.get_masked_words(batch),
+                     [game_engine.get_masked_word(state) for state in states], "test_parity_special_characters")
+
+    for i in range(len(words)):
+        assert_equal(batch_engine.get_game(batch, i), states[i], "test_parity_special_characters")
+    assert_equal(batch_engine.get_secret_word(batch, 0), "PORTE-MONNAIE", "test_parity_special_characters")
+    assert_equal(batch_engine.get_secret_word(batch, 2), "FENÊTRE", "test_parity_special_characters")
+
+
+# Verify revealed_matrix marks revealed positions only
+def test_revealed_matrix():
+    batch = batch_engine.create_batch(["tata", "ab"])
+    batch_engine.play_letters(batch, np.array([19, 1]))
+
+    assert_equal(batch_engine.revealed_matrix(batch).tolist(),
+                 [[True, False, True, False], [False, True, False, False]], "test_revealed_matrix")
+
+
+# Execute all tests and log pass/fail summary
+def run_all_tests():
+    tests = [
+        test_create_batch,
+        test_play_letters_vector,
+        test_play_letters_ignored,
+        test_play_sequence,
+        test_parity_with_game_engine,
+        test_parity_special_characters,
+        test_revealed_matrix,
+    ]
+
+    test_logger.log_header("Batch Engine Tests")
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+            test_logger.log_result(test.__name__, True)
+        except AssertionError as e:
+            failed += 1
+            test_logger.log_result(test.__name__, False, str(e))
+
+    test_logger.log_summary("Batch Engine Tests", passed, failed)
+    return failed == 0
+
+
+if __name__ == '__main__':
+    test_logger.clear()
+    run_all_tests()
+    test_logger.save()
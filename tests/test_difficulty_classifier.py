@@ -0,0 +1,99 @@
+# Tests for difficulty_classifier module: encode_words, compute_features, rebucket_words
+
+import os
+import shutil
+import tempfile
+
+from utils import word_manager
+from utils import difficulty_classifier
+from tests import test_logger
+
+
+# Raise AssertionError if actual != expected
+def assert_equal(actual, expected, test_name):
+    if actual != expected:
+        raise AssertionError(f"Expected {expected}, got {actual}")
+
+
+# Verify words become a padded code matrix with accents folded
+def test_encode_words():
+    matrix, lengths = difficulty_classifier.encode_words(["Été", "ab"])
+
+    assert_equal(matrix.tolist(), [[5, 20, 5], [1, 2, 0]], "test_encode_words")
+    assert_equal(lengths.tolist(), [3, 2], "test_encode_words")
+
+
+# Verify length, distinct letters and expected misses of the frequency-order player
+def test_compute_features():
+    # Frequencies: a in 3 words, b in 2, c in 1 -> guess order a, b, c, d...
+    features = difficulty_classifier.compute_features(["aaa", "ab", "abc"])
+
+    assert_equal(features["length"].tolist(), [3, 2, 3], "test_compute_features")
+    assert_equal(features["distinct"].tolist(), [1, 2, 3], "test_compute_features")
+    assert_equal(features["expected_wrong"].tolist(), [0, 0, 0], "test_compute_features")
+
+    features = difficulty_classifier.compute_features(["ab", "ab", "ac"])
+    # "ac": guesses a, b (miss), c -> 1 wrong
+    assert_equal(features["expected_wrong"].tolist(), [0, 0, 1], "test_compute_features")
+
+
+# Verify harder-scoring words land in higher buckets and all sections are filled
+def test_classify_words_order():
+    words = ["ea", "eat", "tea", "zyxw", "quiz", "jazz"]
+    buckets = difficulty_classifier.classify_words(words).tolist()
+
+    if max(buckets[:3]) > min(buckets[3:]):
+        raise AssertionError(f"common-letter words should be easier: {buckets}")
+    assert_equal(sorted(set(buckets)), [0, 1, 2], "test_classify_words_order")
+
+
+# Verify re-bucketing keeps every word exactly once and rewrites the TXT file
+def test_rebucket_words_file():
+    temp_dir = tempfile.mkdtemp()
+    txt_path = os.path.join(temp_dir, 'words_fr.txt')
+    with open(txt_path, 'w', encoding='utf-8') as f:
+        f.write("[facile]\nxylophone\nchat\n\n[difficile]\nchat\neau\nzygomatique\n")
+    try:
+        counts = difficulty_classifier.rebucket_words_file(txt_path)
+        words = word_manager.load_words_from_txt(txt_path)
+
+        all_words = []
+        for section in words:
+            all_words.extend(words[section])
+        assert_equal(sorted(all_words), ["chat", "eau", "xylophone", "zygomatique"], "test_rebucket_words_file")
+        assert_equal(sum(counts.values()), 4, "test_rebucket_words_file")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+# Execute all tests and log pass/fail summary
+def run_all_tests():
+    tests = [
+        test_encode_words,
+        test_compute_features,
+        test_classify_words_order,
+        test_rebucket_words_file,
+    ]
+
+    test_logger.log_header("Difficulty Classifier Tests")
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+            test_logger.log_result(test.__name__, True)
+        except AssertionError as e:
+            failed += 1
+            test_logger.log_result(test.__name__, False, str(e))
+
+    test_logger.log_summary("Difficulty Classifier Tests", passed, failed)
+    return failed == 0
+
+
+if __name__ == '__main__':
+    test_logger.clear()
+    run_all_tests()
+    test_logger.save()
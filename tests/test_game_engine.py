@@ -245,6 +245,140 @@ def test_losing_game_flow():
     assert_true(game_engine.is_lost(game_state), "test_losing_game_flow")
 
 
+# Verify compact state starts with empty played mask and uppercase secret
+def test_create_compact_game():
+    game_state = game_engine.create_compact_game("python", max_errors=5)
+
+    assert_true(game_engine.is_compact(game_state), "test_create_compact_game")
+    assert_equal(game_engine.get_secret_word(game_state), "PYTHON", "test_create_compact_game")
+    assert_equal(game_engine.get_status(game_state), "in_progress", "test_create_compact_game")
+    assert_equal(game_engine.get_errors(game_state), 0, "test_create_compact_game")
+    assert_equal(game_engine.get_masked_word(game_state), "_ _ _ _ _ _", "test_create_compact_game")
+
+
+# Verify compact play rejects invalid and repeated letters like the dict version
+def test_compact_play_validation():
+    game_state = game_engine.create_compact_game("PYTHON")
+
+    assert_true(game_engine.play_letter(game_state, "p"), "test_compact_play_validation")
+    assert_false(game_engine.play_letter(game_state, "P"), "test_compact_play_validation")
+    assert_false(game_engine.play_letter(game_state, "PY"), "test_compact_play_validation")
+    assert_false(game_engine.play_letter(game_state, "5"), "test_compact_play_validation")
+    assert_equal(game_engine.get_played_letters(game_state), ["P"], "test_compact_play_validation")
+
+
+# Verify compact and dict states evolve identically over win and loss games
+def test_compact_matches_dict():
+    for secret, letters in [("HELLO", "LXHEZO"), ("CAT", "XYZQ")]:
+        dict_state = game_engine.create_game(secret, 3)
+        compact_state = game_engine.create_compact_game(secret, 3)
+
+        for letter in letters:
+            game_engine.play_letter(dict_state, letter)
+            game_engine.play_letter(compact_state, letter)
+
+            assert_equal(game_engine.get_masked_word(compact_state), game_engine.get_masked_word(dict_state),
+                         "test_compact_matches_dict")
+            assert_equal(game_engine.get_status(compact_state), dict_state["status"], "test_compact_matches_dict")
+            assert_equal(game_engine.is_won(compact_state), game_engine.is_won(dict_state), "test_compact_matches_dict")
+            assert_equal(game_engine.is_lost(compact_state), game_engine.is_lost(dict_state), "test_compact_matches_dict")
+
+        assert_equal(game_engine.to_dict(compact_state), dict_state, "test_compact_matches_dict")
+
+
+# Verify dict -> compact -> dict conversion keeps the state
+def test_compact_roundtrip():
+    game_state = game_engine.create_game("PYTHON")
+    game_engine.play_letter(game_state, "P")
+    game_engine.play_letter(game_state, "Z")
+
+    assert_equal(game_engine.to_dict(game_engine.to_compact(game_state)), game_state, "test_compact_roundtrip")
+
+
+# Verify mask version changes only when a letter is revealed
+def test_mask_version_changes_on_reveal():
+    game_state = game_engine.create_game("HELLO")
+    version = game_engine.get_mask_version(game_state)
+
+    game_engine.play_letter(game_state, "Z")
+    assert_equal(game_engine.get_mask_version(game_state), version, "test_mask_version_changes_on_reveal")
+
+    game_engine.play_letter(game_state, "L")
+    if game_engine.get_mask_version(game_state) == version:
+        raise AssertionError("version should change after a reveal")
+    assert_equal(game_engine.get_masked_word(game_state), "_ _ L L _", "test_mask_version_changes_on_reveal")
+
+
+# Verify get_masked_word returns the same cached string between moves
+def test_masked_word_cached_between_moves():
+    game_state = game_engine.create_game("PYTHON")
+    game_engine.play_letter(game_state, "P")
+
+    first = game_engine.get_masked_word(game_state)
+    second = game_engine.get_masked_word(game_state)
+    if first is not second:
+        raise AssertionError("masked word should be cached, not rebuilt")
+
+
+# Verify direct edits to letters_played mixed with play_letter keep the mask correct
+def test_masked_word_after_direct_edit_and_play():
+    game_state = game_engine.create_game("PYTHON")
+    game_state["letters_played"].add("O")
+    game_engine.play_letter(game_state, "P")
+
+    assert_equal(game_engine.get_masked_word(game_state), "P _ _ _ O _", "test_masked_word_after_direct_edit_and_play")
+
+
+# Verify one base letter reveals every accented variant and keeps the accents in the mask
+def test_accented_word():
+    game_state = game_engine.create_game("élève")
+    game_engine.play_letter(game_state, "e")
+
+    assert_equal(game_engine.get_masked_word(game_state), "É _ È _ E", "test_accented_word")
+    assert_equal(game_state["errors"], 0, "test_accented_word")
+
+    game_engine.play_letter(game_state, "L")
+    game_engine.play_letter(game_state, "v")
+    assert_equal(game_state["status"], "won", "test_accented_word")
+
+
+# Verify an accented key press plays its base letter, in dict and compact states
+def test_accented_key_press():
+    game_state = game_engine.create_game("fenetre")
+    game_engine.play_letter(game_state, "ê")
+    assert_equal(game_engine.get_played_letters(game_state), ["E"], "test_accented_key_press")
+
+    compact = game_engine.create_compact_game("fenêtre")
+    game_engine.play_letter(compact, "é")
+    assert_equal(game_engine.get_masked_word(compact), "_ E _ Ê _ _ E", "test_accented_key_press")
+    assert_equal(game_engine.get_errors(compact), 0, "test_accented_key_press")
+
+
+# Verify hyphens, apostrophes and ligatures are shown as-is, never played, and both state types agree
+def test_non_letter_characters():
+    for word, letters in [("porte-monnaie", "PORTEMNAI"), ("aujourd'hui", "AUJORDHI"), ("cœur", "CUR")]:
+        game_state = game_engine.create_game(word)
+        compact = game_engine.create_compact_game(word)
+        assert_equal(game_engine.get_masked_word(compact), game_engine.get_masked_word(game_state),
+                     "test_non_letter_characters")
+
+        for letter in letters:
+            game_engine.play_letter(game_state, letter)
+            game_engine.play_letter(compact, letter)
+        assert_equal((game_engine.get_status(game_state), game_engine.get_status(compact)), ("won", "won"),
+                     "test_non_letter_characters")
+        assert_equal(game_engine.get_masked_word(compact), game_engine.get_masked_word(game_state),
+                     "test_non_letter_characters")
+
+    assert_equal(game_engine.get_masked_word(game_engine.create_compact_game("aujourd'hui")),
+                 "_ _ _ _ _ _ _ ' _ _ _", "test_non_letter_characters")
+    assert_equal(game_engine.play_letter(game_engine.create_game("porte-monnaie"), "-"), False,
+                 "test_non_letter_characters")
+    assert_equal(game_engine.play_letter(game_engine.create_compact_game("cœur"), "œ"), False,
+                 "test_non_letter_characters")
+    assert_equal(game_engine.letters_to_mask("CŒUR") < 1 << 26, True, "test_non_letter_characters")
+
+
 # Execute all tests and log pass/fail summary
 def run_all_tests():
     tests = [
@@ -271,6 +405,16 @@ def run_all_tests():
         test_get_played_letters_sorted,
         test_winning_game_flow,
         test_losing_game_flow,
+        test_create_compact_game,
+        test_compact_play_validation,
+        test_compact_matches_dict,
+        test_compact_roundtrip,
+        test_mask_version_changes_on_reveal,
+        test_masked_word_cached_between_moves,
+        test_masked_word_after_direct_edit_and_play,
+        test_accented_word,
+        test_accented_key_press,
+        test_non_letter_characters,
     ]
 
     test_logger.log_header("Game Engine Tests")
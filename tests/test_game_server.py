@@ -0,0 +1,293 @@
+# Tests for game_server module: request dispatch, timer, hints, scores and a localhost round trip
+
+import os
+import json
+import shutil
+import asyncio
+import tempfile
+
+from models import session_manager
+from server import game_server
+from utils import word_manager
+from utils import score_manager
+from utils import score_history
+from tests import test_logger
+
+
+# Raise AssertionError if actual != expected
+def assert_equal(actual, expected, test_name):
+    if actual != expected:
+        raise AssertionError(f"Expected {expected}, got {actual}")
+
+
+WORDS = "[facile]\nchat\n\n[moyen]\nguitare\n\n[difficile]\nlabyrinthe\n"
+
+
+# Point word_manager and score_manager at a temp dir, returns what restore_files needs
+def use_temp_files():
+    temp_dir = tempfile.mkdtemp()
+    with open(os.path.join(temp_dir, 'words_fr.txt'), 'w', encoding='utf-8') as f:
+        f.write(WORDS)
+    original = (word_manager.DATA_DIR, score_manager.SCORE_FILE)
+    word_manager.DATA_DIR = temp_dir
+    score_manager.SCORE_FILE = os.path.join(temp_dir, 'highscores.txt')
+    word_manager.invalidate_words_cache()
+    return temp_dir, original
+
+
+# Restore the real data paths and remove the temp dir
+def restore_files(temp_dir, original):
+    word_manager.close_all_word_bags()
+    score_history.close_all_histories()
+    word_manager.DATA_DIR, score_manager.SCORE_FILE = original
+    word_manager.invalidate_words_cache()
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+# Run dispatch for one request with a JSON body, returns (status, payload)
+def request(state, method, target, body=None):
+    body_bytes = json.dumps(body).encode('utf-8') if body is not None else b""
+    return asyncio.run(game_server.dispatch(state, method, target, body_bytes))
+
+
+# Return a fake clock function and the list holding its current time
+def make_clock():
+    now = [1000.0]
+    return (lambda: now[0]), now
+
+
+# Verify a normal game can be started, won and scored into the in-memory leaderboard and the file
+def test_play_and_score():
+    temp_dir, original = use_temp_files()
+    try:
+        clock, now = make_clock()
+        state = game_server.create_server_state(clock=clock)
+        game_server.warm_caches(state, ["fr"])
+        # The compiled dictionary is built at startup, not by the first POST /games
+        assert_equal(os.path.exists(word_manager.get_compiled_file("fr")), True, "test_play_and_score")
+
+        status, game = request(state, "POST", "/games", {"mode": "normal", "language": "fr"})
+        assert_equal(status, 201, "test_play_and_score")
+        assert_equal(game["masked"], "_ _ _ _ _ _ _", "test_play_and_score")
+        assert_equal("word" in game, False, "test_play_and_score")
+
+        for letter in "GUITAR":
+            now[0] += 1
+            status, game = request(state, "POST", f"/games/{game['session']}/guess", {"letter": letter})
+        now[0] += 1
+        status, game = request(state, "POST", f"/games/{game['session']}/guess", {"letter": "e"})
+        assert_equal(game["status"], "won", "test_play_and_score")
+        # 30s limit, 7 hits * +5s, 7s elapsed
+        assert_equal(game["time_remaining"], 58.0, "test_play_and_score")
+
+        # Names the UI prompt would not accept cannot be written to the score files
+        for name in ["x=y", "a\n[b]", "bob1", "sixsix", " ", 7]:
+            status, _ = request(state, "POST", f"/games/{game['session']}/score", {"name": name})
+            assert_equal(status, 400, "test_play_and_score")
+
+        status, result = request(state, "POST", f"/games/{game['session']}/score", {"name": "alice"})
+        assert_equal(result, {"score": 20 * 7 + 116, "saved": True, "category": "normal", "rank": 1,
+                              "percentile": 50.0}, "test_play_and_score")
+        assert_equal(score_manager.get_all_scores(), {"normal": [{"name": "ALICE", "score": 256}]},
+                     "test_play_and_score")
+
+        status, _ = request(state, "POST", f"/games/{game['session']}/score", {"name": "alice"})
+        assert_equal(status, 409, "test_play_and_score")
+        status, scores = request(state, "GET", "/scores?category=normal")
+        assert_equal(scores, {"normal": [{"name": "ALICE", "score": 256}]}, "test_play_and_score")
+    finally:
+        restore_files(temp_dir, original)
+
+
+# Verify a game whose timer ran out is lost on the next guess
+def test_timer_expiry():
+    temp_dir, original = use_temp_files()
+    try:
+        clock, now = make_clock()
+        state = game_server.create_server_state(clock=clock)
+
+        status, game = request(state, "POST", "/games", {"mode": "hard"})
+        now[0] += 31
+        status, game = request(state, "POST", f"/games/{game['session']}/guess", {"letter": "a"})
+
+        assert_equal(game["status"], "lost", "test_timer_expiry")
+        assert_equal(game["word"], "LABYRINTHE", "test_timer_expiry")
+        assert_equal(game["played"], [], "test_timer_expiry")
+    finally:
+        restore_files(temp_dir, original)
+
+
+# Verify hints play a letter and are limited per mode
+def test_hints():
+    temp_dir, original = use_temp_files()
+    try:
+        state = game_server.create_server_state()
+        status, game = request(state, "POST", "/games", {"mode": "hard"})
+
+        status, game = request(state, "POST", f"/games/{game['session']}/hint")
+        assert_equal(status, 200, "test_hints")
+        assert_equal(game["hint"] in "LABYRINTHE", True, "test_hints")
+        assert_equal(game["hints_left"], 0, "test_hints")
+
+        status, _ = request(state, "POST", f"/games/{game['session']}/hint")
+        assert_equal(status, 409, "test_hints")
+    finally:
+        restore_files(temp_dir, original)
+
+
+# Verify two servers with the same seed deal the same words
+def test_seeded_server():
+    temp_dir, original = use_temp_files()
+    with open(os.path.join(temp_dir, 'words_fr.txt'), 'w', encoding='utf-8') as f:
+        f.write("[facile]\nchat\nlune\npain\nnuit\njour\nmain\n")
+    try:
+        runs = []
+        for attempt in range(2):
+            word_manager.close_all_word_bags()
+            state = game_server.create_server_state(seed=99)
+            words = []
+            for i in range(4):
+                status, game = request(state, "POST", "/games", {"mode": "easy"})
+                words.append(state["sessions"]["sessions"][game["session"]]["game"][0])
+            runs.append(words)
+
+        assert_equal(runs[0], runs[1], "test_seeded_server")
+    finally:
+        restore_files(temp_dir, original)
+
+
+# Verify evicted sessions are spilled and resumed through the server, and new games write no bag file
+def test_spilled_sessions():
+    temp_dir, original = use_temp_files()
+    try:
+        state = game_server.create_server_state(max_sessions=1, spill_dir=os.path.join(temp_dir, 'sessions'))
+        status, first = request(state, "POST", "/games", {"mode": "easy"})
+        request(state, "POST", f"/games/{first['session']}/guess", {"letter": "c"})
+        status, second = request(state, "POST", "/games", {"mode": "hard"})
+
+        status, game = request(state, "GET", f"/games/{first['session']}")
+        assert_equal((status, game["masked"], game["played"]), (200, "C _ _ _", ["C"]), "test_spilled_sessions")
+        assert_equal(session_manager.get_manager_stats(state["sessions"])["restored"], 1, "test_spilled_sessions")
+        assert_equal([name for name in os.listdir(temp_dir) if name.startswith("bag_")], [],
+                     "test_spilled_sessions")
+    finally:
+        restore_files(temp_dir, original)
+
+
+# Verify bad requests get 4xx answers
+def test_errors():
+    state = game_server.create_server_state()
+
+    assert_equal(request(state, "POST", "/games", {"mode": "nightmare"})[0], 400, "test_errors")
+    assert_equal(request(state, "POST", "/games/nope/guess", {"letter": "a"})[0], 404, "test_errors")
+    assert_equal(request(state, "POST", "/games/nope/guess", {"letter": "ab"})[0], 400, "test_errors")
+    assert_equal(request(state, "GET", "/games")[0], 405, "test_errors")
+    assert_equal(asyncio.run(game_server.dispatch(state, "POST", "/games", b"{oops"))[0], 400, "test_errors")
+    assert_equal(request(state, "POST", "/games", {"mode": []})[0], 400, "test_errors")
+    assert_equal(request(state, "POST", "/games", {"mode": "easy", "language": {"fr": 1}})[0], 400, "test_errors")
+
+
+# Verify an unexpected handler exception is answered with a 500 and the connection keeps serving
+def test_internal_error():
+    original_handler = game_server.handle_health
+
+    async def scenario():
+        state = game_server.create_server_state()
+        server = await game_server.start_server(state, "127.0.0.1", 0)
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.sockets[0].getsockname()[1])
+
+        statuses = []
+        for i in range(2):
+            writer.write(b"GET /health HTTP/1.1\r\nHost: localhost\r\nContent-Length: 0\r\n\r\n")
+            await writer.drain()
+            head = await reader.readuntil(b"\r\n\r\n")
+            await reader.readexactly(int(head.split(b"Content-Length: ")[1].split(b"\r\n")[0]))
+            statuses.append(head.split(b" ")[1])
+            game_server.handle_health = original_handler
+
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return statuses
+
+    game_server.handle_health = lambda state: 1 / 0
+    try:
+        assert_equal(asyncio.run(scenario()), [b"500", b"200"], "test_internal_error")
+    finally:
+        game_server.handle_health = original_handler
+
+
+# Verify a keep-alive HTTP connection to a localhost server answers several requests
+def test_http_round_trip():
+    temp_dir, original = use_temp_files()
+
+    async def scenario():
+        state = game_server.create_server_state()
+        server = await game_server.start_server(state, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+        responses = []
+        requests = [("POST", "/games", b'{"mode": "easy"}', "keep-alive"), ("GET", "/health", b"", "close")]
+        for method, target, body, connection in requests:
+            writer.write(f"{method} {target} HTTP/1.1\r\nHost: localhost\r\nConnection: {connection}\r\n"
+                         f"Content-Length: {len(body)}\r\n\r\n".encode('latin-1') + body)
+            await writer.drain()
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = int(head.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+            responses.append((head.split(b" ")[1], json.loads(await reader.readexactly(length))))
+
+        # The server closes the connection after the "close" request
+        closed = await reader.read() == b""
+        responses.append(closed)
+        writer.close()
+        await asyncio.sleep(0)
+        server.close()
+        await server.wait_closed()
+        return responses
+
+    try:
+        responses = asyncio.run(scenario())
+        assert_equal(responses[0][0], b"201", "test_http_round_trip")
+        assert_equal(responses[0][1]["masked"], "_ _ _ _", "test_http_round_trip")
+        assert_equal(responses[1][1]["sessions"]["active"], 1, "test_http_round_trip")
+        assert_equal(responses[2], True, "test_http_round_trip")
+    finally:
+        restore_files(temp_dir, original)
+
+
+# Execute all tests and log pass/fail summary
+def run_all_tests():
+    tests = [
+        test_play_and_score,
+        test_timer_expiry,
+        test_hints,
+        test_seeded_server,
+        test_spilled_sessions,
+        test_errors,
+        test_internal_error,
+        test_http_round_trip,
+    ]
+
+    test_logger.log_header("Game Server Tests")
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+            test_logger.log_result(test.__name__, True)
+        except AssertionError as e:
+            failed += 1
+            test_logger.log_result(test.__name__, False, str(e))
+
+    test_logger.log_summary("Game Server Tests", passed, failed)
+    return failed == 0
+
+
+if __name__ == '__main__':
+    test_logger.clear()
+    run_all_tests()
+    test_logger.save()
@@ -0,0 +1,155 @@
+# Tests for hint_engine module: get_constraints, rank_letters, best_real_hint, best_fake_hint
+
+import random
+import time
+
+from models import game_engine
+from utils import word_manager
+from utils import hint_engine
+from tests import test_logger
+
+
+# Raise AssertionError if actual != expected
+def assert_equal(actual, expected, test_name):
+    if actual != expected:
+        raise AssertionError(f"Expected {expected}, got {actual}")
+
+
+WORDS = ["chat", "chien", "champ", "chose", "poule", "lapin", "table"]
+
+
+# Verify pattern and absent letters are derived from the played letters
+def test_get_constraints():
+    state = game_engine.create_game("CHAT")
+    game_engine.play_letter(state, "a")
+    game_engine.play_letter(state, "z")
+
+    assert_equal(hint_engine.get_constraints(state), ("__A_", "Z"), "test_get_constraints")
+
+
+# Verify candidates match the masked pattern and exclude absent letters
+def test_get_candidates():
+    index = word_manager.build_letter_index(WORDS)
+    state = game_engine.create_game("CHIEN")
+    game_engine.play_letter(state, "c")
+    game_engine.play_letter(state, "a")
+
+    words = word_manager.bitset_to_words(index, hint_engine.get_candidates(state, index))
+    assert_equal(words, ["CHIEN", "CHOSE"], "test_get_candidates")
+
+
+# Verify a letter that splits the candidates evenly outranks one shared by all of them
+def test_rank_letters_prefers_split():
+    index = word_manager.build_letter_index(WORDS)
+    state = game_engine.create_game("CHIEN")
+    game_engine.play_letter(state, "c")
+    game_engine.play_letter(state, "a")
+
+    ranking = hint_engine.rank_letters(state, index)
+    gains = dict(ranking)
+    if gains["I"] <= gains["H"]:
+        raise AssertionError(f"I should outrank H, got {ranking[:5]}")
+    assert_equal(gains["H"], 0.0, "test_rank_letters_prefers_split")
+    if "C" in gains or "A" in gains:
+        raise AssertionError("played letters must not be ranked")
+
+
+# Verify real hints are in the secret and fake hints are not
+def test_best_hints_membership():
+    index = word_manager.build_letter_index(WORDS)
+    state = game_engine.create_game("CHIEN")
+
+    real = hint_engine.best_real_hint(state, index)
+    fake = hint_engine.best_fake_hint(state, index)
+    if real not in "CHIEN":
+        raise AssertionError(f"real hint {real} not in secret")
+    if fake in "CHIEN":
+        raise AssertionError(f"fake hint {fake} is in secret")
+
+
+# Verify hints still work when the secret is not in the dictionary or there is no index
+def test_best_hint_fallback():
+    index = word_manager.build_letter_index(WORDS)
+    state = game_engine.create_game("PYTHON")
+
+    if hint_engine.best_real_hint(state, index) not in "PYTHON":
+        raise AssertionError("fallback real hint should be in the secret")
+    if hint_engine.best_real_hint(state, None) not in "PYTHON":
+        raise AssertionError("hint without index should be in the secret")
+
+    for letter in "PYTHON":
+        game_engine.play_letter(state, letter)
+    assert_equal(hint_engine.best_real_hint(state, index), None, "test_best_hint_fallback")
+
+
+# Verify the fallback choice follows the given generator
+def test_best_hint_seeded():
+    state = game_engine.create_game("PYTHON")
+    hints = [hint_engine.best_real_hint(state, None, random.Random(seed)) for seed in range(8)]
+
+    assert_equal(hints, [hint_engine.best_real_hint(state, None, random.Random(seed)) for seed in range(8)],
+                 "test_best_hint_seeded")
+    if len(set(hints)) < 2:
+        raise AssertionError(f"different seeds should pick different letters: {hints}")
+
+
+# Verify ranking a small candidate set of a 100k-word index stays under a millisecond
+def test_partition_latency():
+    rng = random.Random(7)
+    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    words = ["".join(rng.choice(letters) for _ in range(rng.randint(4, 10))) for _ in range(100000)]
+    index = word_manager.build_letter_index(words)
+
+    timings = []
+    for _ in range(200):
+        ids = sorted(rng.sample(range(len(words)), hint_engine.EXACT_PARTITION_LIMIT))
+        candidates = 0
+        for word_id in ids:
+            candidates |= 1 << word_id
+        assert_equal(word_manager.bitset_to_ids(candidates), ids, "test_partition_latency")
+
+        start = time.perf_counter()
+        hint_engine.rank_candidate_letters(index, candidates, list(letters))
+        timings.append(time.perf_counter() - start)
+
+    timings.sort()
+    p50 = timings[len(timings) // 2] * 1000
+    p99 = timings[int(len(timings) * 0.99)] * 1000
+    if p50 > 0.75 or p99 > 3.0:
+        raise AssertionError(f"partition ranking too slow: p50 {p50:.2f} ms, p99 {p99:.2f} ms")
+
+
+# Execute all tests and log pass/fail summary
+def run_all_tests():
+    tests = [
+        test_get_constraints,
+        test_get_candidates,
+        test_rank_letters_prefers_split,
+        test_best_hints_membership,
+        test_best_hint_fallback,
+        test_best_hint_seeded,
+        test_partition_latency,
+    ]
+
+    test_logger.log_header("Hint Engine Tests")
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+            test_logger.log_result(test.__name__, True)
+        except AssertionError as e:
+            failed += 1
+            test_logger.log_result(test.__name__, False, str(e))
+
+    test_logger.log_summary("Hint Engine Tests", passed, failed)
+    return failed == 0
+
+
+if __name__ == '__main__':
+    test_logger.clear()
+    run_all_tests()
+    test_logger.save()
@@ -0,0 +1,62 @@
+# Tests for letter_folding module: fold_letter, fold_word, letter_positions
+
+from utils import letter_folding
+from tests import test_logger
+
+
+# Raise AssertionError if actual != expected
+def assert_equal(actual, expected, test_name):
+    if actual != expected:
+        raise AssertionError(f"Expected {expected}, got {actual}")
+
+
+# Verify accented letters of both cases fold to their uppercase base letter
+def test_fold_letter():
+    assert_equal(letter_folding.fold_letter("é"), "E", "test_fold_letter")
+    assert_equal(letter_folding.fold_letter("Ç"), "C", "test_fold_letter")
+    assert_equal(letter_folding.fold_letter("a"), "A", "test_fold_letter")
+
+
+# Verify whole words fold and keep their length
+def test_fold_word():
+    assert_equal(letter_folding.fold_word("Fenêtre"), "FENETRE", "test_fold_word")
+    assert_equal(letter_folding.fold_word("Über-Straße"), "UBER-STRASSE", "test_fold_word")
+
+
+# Verify positions group every accented variant under the base letter
+def test_letter_positions():
+    positions = letter_folding.letter_positions("ÉLÈVE")
+
+    assert_equal(positions, {"E": [0, 2, 4], "L": [1], "V": [3]}, "test_letter_positions")
+
+
+# Execute all tests and log pass/fail summary
+def run_all_tests():
+    tests = [
+        test_fold_letter,
+        test_fold_word,
+        test_letter_positions,
+    ]
+
+    test_logger.log_header("Letter Folding Tests")
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+            test_logger.log_result(test.__name__, True)
+        except AssertionError as e:
+            failed += 1
+            test_logger.log_result(test.__name__, False, str(e))
+
+    test_logger.log_summary("Letter Folding Tests", passed, failed)
+    return failed == 0
+
+
+if __name__ == '__main__':
+    test_logger.clear()
+    run_all_tests()
+    test_logger.save()
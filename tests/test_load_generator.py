@@ -0,0 +1,106 @@
+# Tests for load_generator module: percentiles, player guesses and a small run against a local server
+
+import os
+import random
+import shutil
+import asyncio
+import tempfile
+
+from server import game_server
+from server import load_generator
+from utils import word_manager
+from utils import score_manager
+from utils import score_history
+from tests import test_logger
+
+
+# Raise AssertionError if actual != expected
+def assert_equal(actual, expected, test_name):
+    if actual != expected:
+        raise AssertionError(f"Expected {expected}, got {actual}")
+
+
+# Verify nearest-rank percentiles
+def test_percentile():
+    values = list(range(1, 101))
+
+    assert_equal(load_generator.percentile(values, 50), 50, "test_percentile")
+    assert_equal(load_generator.percentile(values, 99), 99, "test_percentile")
+    assert_equal(load_generator.percentile([7], 95), 7, "test_percentile")
+    assert_equal(load_generator.percentile([], 50), 0.0, "test_percentile")
+
+
+# Verify solver players only guess letters consistent with the masked word
+def test_choose_guess_solver():
+    index = word_manager.build_letter_index(["chat", "chut", "rhum"])
+    game = {"masked": "C H _ _", "played": ["C", "H", "E"]}
+    letter = load_generator.choose_guess(game, "frequency", index, random.Random(1))
+
+    assert_equal(letter, "T", "test_choose_guess_solver")
+
+
+# Verify a small load run plays every game and reports every endpoint
+def test_run_load():
+    temp_dir = tempfile.mkdtemp()
+    with open(os.path.join(temp_dir, 'words_fr.txt'), 'w', encoding='utf-8') as f:
+        f.write("[facile]\nchat\n\n[moyen]\nguitare\nballon\n\n[difficile]\nlabyrinthe\n")
+    original = (word_manager.DATA_DIR, score_manager.SCORE_FILE)
+    word_manager.DATA_DIR = temp_dir
+    score_manager.SCORE_FILE = os.path.join(temp_dir, 'highscores.txt')
+    word_manager.invalidate_words_cache()
+
+    async def scenario():
+        state = game_server.create_server_state()
+        server = await game_server.start_server(state, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        report = await load_generator.run_load("127.0.0.1", port, players=20, games=2, strategy="gain",
+                                               read_scores=True, seed=3)
+        server.close()
+        await server.wait_closed()
+        return report
+
+    try:
+        report = asyncio.run(scenario())
+        assert_equal(sum(report["games"].values()), 40, "test_run_load")
+        assert_equal(report["games"].get("won"), 40, "test_run_load")
+        assert_equal(report["endpoints"]["POST /games"]["count"], 40, "test_run_load")
+        assert_equal(report["endpoints"]["POST /games/<id>/score"]["errors"], 0, "test_run_load")
+        assert_equal(report["connect_errors"], 0, "test_run_load")
+    finally:
+        word_manager.close_all_word_bags()
+        score_history.close_all_histories()
+        word_manager.DATA_DIR, score_manager.SCORE_FILE = original
+        word_manager.invalidate_words_cache()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+# Execute all tests and log pass/fail summary
+def run_all_tests():
+    tests = [
+        test_percentile,
+        test_choose_guess_solver,
+        test_run_load,
+    ]
+
+    test_logger.log_header("Load Generator Tests")
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+            test_logger.log_result(test.__name__, True)
+        except AssertionError as e:
+            failed += 1
+            test_logger.log_result(test.__name__, False, str(e))
+
+    test_logger.log_summary("Load Generator Tests", passed, failed)
+    return failed == 0
+
+
+if __name__ == '__main__':
+    test_logger.clear()
+    run_all_tests()
+    test_logger.save()
@@ -0,0 +1,134 @@
+# Tests for prefork module: forked workers share games (session affinity) and the leaderboard files
+
+import os
+import sys
+import json
+import time
+import shutil
+import signal
+import socket
+import tempfile
+import subprocess
+import http.client
+
+from tests import test_logger
+
+# Started in a subprocess: serve a temp dictionary and score file with 3 workers
+SERVER_SCRIPT = """
+import os, sys
+sys.path.insert(0, sys.argv[3])
+from utils import word_manager, score_manager
+from server import prefork
+word_manager.DATA_DIR = sys.argv[2]
+score_manager.SCORE_FILE = os.path.join(sys.argv[2], 'highscores.txt')
+prefork.serve_prefork('127.0.0.1', int(sys.argv[1]), 3)
+"""
+
+WORDS = "[facile]\nchat\n\n[moyen]\nguitare\n\n[difficile]\nlabyrinthe\n"
+
+
+# Raise AssertionError if actual != expected
+def assert_equal(actual, expected, test_name):
+    if actual != expected:
+        raise AssertionError(f"Expected {expected}, got {actual}")
+
+
+# Send one request on a new connection (so the kernel may pick any worker), returns (status, payload)
+def request(port, method, path, body=None):
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    try:
+        connection.request(method, path, json.dumps(body) if body is not None else None)
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
+
+# Start the prefork server on a free port, returns (process, port, temp dir)
+def start_server():
+    temp_dir = tempfile.mkdtemp()
+    for language in ['fr', 'en']:
+        with open(os.path.join(temp_dir, f'words_{language}.txt'), 'w', encoding='utf-8') as f:
+            f.write(WORDS)
+
+    probe = socket.socket()
+    probe.bind(("127.0.0.1", 0))
+    port = probe.getsockname()[1]
+    probe.close()
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    process = subprocess.Popen([sys.executable, "-c", SERVER_SCRIPT, str(port), temp_dir, root],
+                               stdout=subprocess.DEVNULL)
+    for _ in range(100):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            break
+        except OSError:
+            time.sleep(0.05)
+    return process, port, temp_dir
+
+
+# Verify games started on any worker can be played and scored from any connection
+def test_workers_share_sessions_and_scores():
+    if not hasattr(os, "fork"):
+        return
+
+    process, port, temp_dir = start_server()
+    try:
+        workers = set()
+        for _ in range(6):
+            status, game = request(port, "POST", "/games", {"mode": "normal"})
+            assert_equal(status, 201, "test_workers_share_sessions_and_scores")
+            workers.add(game["session"].split("-")[0])
+
+            for letter in "guitare":
+                status, game = request(port, "POST", f"/games/{game['session']}/guess", {"letter": letter})
+                assert_equal(status, 200, "test_workers_share_sessions_and_scores")
+            assert_equal(game["status"], "won", "test_workers_share_sessions_and_scores")
+
+            status, result = request(port, "POST", f"/games/{game['session']}/score", {"name": "bob"})
+            assert_equal(result["saved"], True, "test_workers_share_sessions_and_scores")
+
+        if not workers <= {"0", "1", "2"}:
+            raise AssertionError(f"unexpected worker ids {workers}")
+
+        # Every worker sees the scores saved by the others, and each was written once
+        for _ in range(3):
+            status, scores = request(port, "GET", "/scores?category=normal")
+            assert_equal(len(scores["normal"]), 6, "test_workers_share_sessions_and_scores")
+        with open(os.path.join(temp_dir, 'highscores.journal'), 'r', encoding='utf-8') as f:
+            assert_equal(f.read().count("BOB="), 6, "test_workers_share_sessions_and_scores")
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout=10)
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+# Execute all tests and log pass/fail summary
+def run_all_tests():
+    tests = [
+        test_workers_share_sessions_and_scores,
+    ]
+
+    test_logger.log_header("Prefork Server Tests")
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+            test_logger.log_result(test.__name__, True)
+        except AssertionError as e:
+            failed += 1
+            test_logger.log_result(test.__name__, False, str(e))
+
+    test_logger.log_summary("Prefork Server Tests", passed, failed)
+    return failed == 0
+
+
+if __name__ == '__main__':
+    test_logger.clear()
+    run_all_tests()
+    test_logger.save()
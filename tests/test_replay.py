@@ -0,0 +1,178 @@
+# Tests for replay module: recording through the game server and the UI, re-play verification and the process pool
+
+import os
+
+from models import game_engine
+from models import replay
+from utils import word_manager
+from utils import score_manager
+from tests import test_logger
+from tests.test_game_server import use_temp_files, restore_files, request, make_clock, game_server
+
+
+# Raise AssertionError if actual != expected
+def assert_equal(actual, expected, test_name):
+    if actual != expected:
+        raise AssertionError(f"Expected {expected}, got {actual}")
+
+
+# Play and submit a normal game (one hint, then guesses a second apart), returns the replay line
+def play_recorded_game(name="alice", letters="GUITARE"):
+    clock, now = make_clock()
+    state = game_server.create_server_state(clock=clock)
+
+    status, game = request(state, "POST", "/games", {"mode": "normal"})
+    now[0] += 0.5
+    status, game = request(state, "POST", f"/games/{game['session']}/hint")
+    for letter in letters:
+        now[0] += 1
+        status, game = request(state, "POST", f"/games/{game['session']}/guess", {"letter": letter})
+    request(state, "POST", f"/games/{game['session']}/score", {"name": name})
+
+    with open(replay.get_replay_file(), 'r', encoding='utf-8') as f:
+        return f.read().splitlines()[-1]
+
+
+# Verify a submitted game is recorded and its leaderboard entry is backed by the replay
+def test_recorded_game_verifies():
+    temp_dir, original = use_temp_files()
+    try:
+        line = play_recorded_game()
+        record = replay.parse_replay(line)
+        assert_equal((record["name"], record["mode"], record["word_id"], record["word"]),
+                     ("ALICE", "normal", 0, "GUITARE"), "test_recorded_game_verifies")
+        assert_equal(record["events"][0][0].islower(), True, "test_recorded_game_verifies")
+        assert_equal(replay.verify_replay(record), "", "test_recorded_game_verifies")
+
+        report = replay.verify_leaderboard(workers=1)
+        assert_equal((report["genuine"], report["verified"], report["unverified"]), (1, 1, []),
+                     "test_recorded_game_verifies")
+    finally:
+        restore_files(temp_dir, original)
+
+
+# Verify edited replays are rejected with the rule they break
+def test_tampered_replays():
+    temp_dir, original = use_temp_files()
+    try:
+        record = replay.parse_replay(play_recorded_game())
+
+        cases = [
+            ({"score": record["score"] + 10}, "score mismatch"),
+            ({"time_remaining": record["time_remaining"] + 5}, "time remaining too high"),
+            ({"events": [("z", 500)] + record["events"][1:]}, "hint letter does not match"),
+            ({"events": record["events"][:-1]}, "game not won"),
+            ({"events": [(letter, ms + 60000) for letter, ms in record["events"]]},
+             "letter played after the timer ran out"),
+            ({"word": "GUITARES"}, "game not won"),
+            # Lines written before the word was stored look it up by word_id
+            ({"word": "", "word_id": 5}, "unknown word")
+        ]
+        for changes, reason in cases:
+            tampered = dict(record)
+            tampered.update(changes)
+            assert_equal(replay.verify_replay(tampered), reason, "test_tampered_replays")
+
+        # A score written straight into the file has no replay behind it
+        score_manager.save_score("MALLO", 999, "normal")
+        report = replay.verify_leaderboard(workers=1)
+        assert_equal(report["unverified"], [{"category": "normal", "name": "MALLO", "score": 999}],
+                     "test_tampered_replays")
+    finally:
+        restore_files(temp_dir, original)
+
+
+# Verify a replay still verifies once the dictionary it was played from has changed
+def test_dictionary_change():
+    temp_dir, original = use_temp_files()
+    try:
+        play_recorded_game()
+        with open(os.path.join(temp_dir, 'words_fr.txt'), 'w', encoding='utf-8') as f:
+            f.write("[facile]\nchat\n\n[moyen]\nbanane\nguitares\ntortue\n\n[difficile]\nguitare\n")
+        word_manager.invalidate_words_cache()
+
+        report = replay.verify_leaderboard(workers=1)
+        assert_equal((report["genuine"], report["verified"]), (1, 1), "test_dictionary_change")
+    finally:
+        restore_files(temp_dir, original)
+
+
+# Verify a game recorded the way the UI modes do backs its leaderboard entry; running totals are not replayable
+def test_ui_record():
+    temp_dir, original = use_temp_files()
+    try:
+        game_state = game_engine.create_game("chat", 5)
+        record = replay.new_replay("hard", "fr", game_state)
+        for letter in "chat":
+            record["elapsed"] += 1.5
+            game_engine.play_letter(game_state, letter)
+            record["events"] = replay.add_event(record["events"], record["elapsed"], letter)
+        record["time_remaining"] = 44.0
+
+        score = score_manager.calculate_score(game_state, record["time_remaining"])
+        score_manager.save_score("bob", score, "difficile")
+        replay.save_replay(record, "bob", score, "difficile")
+        score_manager.save_score("eve", 300, "infinite")
+
+        report = replay.verify_leaderboard(workers=1)
+        assert_equal((report["genuine"], report["verified"], report["unverified"]), (1, 1, []), "test_ui_record")
+        assert_equal(report["not_replayable"], {"infinite": 1}, "test_ui_record")
+    finally:
+        restore_files(temp_dir, original)
+
+
+# Verify the process pool gives the same verdicts as a single process
+def test_verify_pool():
+    temp_dir, original = use_temp_files()
+    try:
+        line = play_recorded_game()
+        bad = line.replace("|normal|", "|difficile|", 1)
+        record = replay.parse_replay(line)
+        inflated = line.replace(f"|{record['score']}|", f"|{record['score'] + 10}|", 1)
+        with open(replay.get_replay_file(), 'w', encoding='utf-8') as f:
+            for i in range(300):
+                f.write((bad if i % 3 == 0 else line) + "\n")
+            f.write(inflated + "\n")
+            f.write("not a replay\n")
+
+        report = replay.verify_leaderboard(workers=2, chunk_size=40)
+        assert_equal((report["replays"], report["genuine"]), (302, 200), "test_verify_pool")
+        assert_equal(report["rejected"], {"unknown mode": 100, "score mismatch": 1, "malformed line": 1},
+                     "test_verify_pool")
+        assert_equal(report["verified"], 1, "test_verify_pool")
+    finally:
+        restore_files(temp_dir, original)
+
+
+# Execute all tests and log pass/fail summary
+def run_all_tests():
+    tests = [
+        test_recorded_game_verifies,
+        test_tampered_replays,
+        test_dictionary_change,
+        test_ui_record,
+        test_verify_pool,
+    ]
+
+    test_logger.log_header("Replay Tests")
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+            test_logger.log_result(test.__name__, True)
+        except AssertionError as e:
+            failed += 1
+            test_logger.log_result(test.__name__, False, str(e))
+
+    test_logger.log_summary("Replay Tests", passed, failed)
+    return failed == 0
+
+
+if __name__ == '__main__':
+    test_logger.clear()
+    run_all_tests()
+    test_logger.save()
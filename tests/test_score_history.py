@@ -0,0 +1,129 @@
+# Tests for score_history module: rank, percentile and per-player best against brute force
+
+import os
+import time
+import random
+import shutil
+import tempfile
+
+from utils import score_history
+from utils import score_manager
+from tests import test_logger
+
+
+# Raise AssertionError if actual != expected
+def assert_equal(actual, expected, test_name):
+    if actual != expected:
+        raise AssertionError(f"Expected {expected}, got {actual}")
+
+
+# Verify rank, percentile and player best match a brute force over the recorded scores
+def test_queries_match_brute_force():
+    temp_dir = tempfile.mkdtemp()
+    db_path = os.path.join(temp_dir, 'history.db')
+    try:
+        rng = random.Random(5)
+        recorded = []
+        for i in range(300):
+            name = rng.choice(["ANN", "BOB", "CAT"])
+            score = rng.randrange(0, 60)
+            score_history.add_score(db_path, name, score, "normal", float(i))
+            recorded.append((name, score))
+        score_history.add_score(db_path, "ANN", 999, "difficile", 0.0)
+
+        scores = [score for name, score in recorded]
+        for score in [0, 17, 30, 59, 60]:
+            below = len([s for s in scores if s < score])
+            equal = scores.count(score)
+            assert_equal(score_history.get_rank(db_path, score, "normal"),
+                         1 + len([s for s in scores if s > score]), "test_queries_match_brute_force")
+            assert_equal(score_history.get_percentile(db_path, score, "normal"),
+                         100.0 * (below + equal / 2) / len(scores), "test_queries_match_brute_force")
+
+        assert_equal(score_history.get_score_count(db_path, "normal"), 300, "test_queries_match_brute_force")
+        assert_equal(score_history.get_player_best(db_path, "BOB", "normal"),
+                     max(score for name, score in recorded if name == "BOB"), "test_queries_match_brute_force")
+        assert_equal(score_history.get_player_best(db_path, "DAN", "normal"), None, "test_queries_match_brute_force")
+    finally:
+        score_history.close_all_histories()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+# Verify save_score and record_score both feed the history beside the highscores file
+def test_score_manager_history():
+    temp_dir = tempfile.mkdtemp()
+    original = score_manager.SCORE_FILE
+    score_manager.SCORE_FILE = os.path.join(temp_dir, 'highscores.txt')
+    try:
+        assert_equal(score_manager.save_score("ann", 120, "normal"), True, "test_score_manager_history")
+        score_manager.record_score(80, "normal")
+        score_manager.record_score(40, "normal")
+
+        assert_equal(score_manager.get_rank(100, "normal"), 2, "test_score_manager_history")
+        assert_equal(score_manager.get_percentile(80, "normal"), 50.0, "test_score_manager_history")
+        assert_equal(score_manager.get_player_best("Ann", "normal"), 120, "test_score_manager_history")
+        assert_equal(len(score_manager.get_top_scores("normal")), 1, "test_score_manager_history")
+    finally:
+        score_manager.SCORE_FILE = original
+        score_manager.invalidate_scores_cache()
+        score_history.close_all_histories()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+# Verify rank queries stay fast with a large history
+def test_rank_query_speed():
+    temp_dir = tempfile.mkdtemp()
+    db_path = os.path.join(temp_dir, 'history.db')
+    try:
+        connection = score_history.open_history(db_path)
+        rng = random.Random(1)
+        with connection:
+            connection.executemany("INSERT INTO scores (category, name, score, timestamp) VALUES (?, ?, ?, ?)",
+                                   [("normal", "P" + str(i % 1000), rng.randrange(0, 400), float(i))
+                                    for i in range(200000)])
+
+        start = time.perf_counter()
+        for score in range(0, 400, 4):
+            score_history.get_rank(db_path, score, "normal")
+            score_history.get_percentile(db_path, score, "normal")
+            score_history.get_player_best(db_path, "P" + str(score), "normal")
+        elapsed = (time.perf_counter() - start) / 100
+
+        assert_equal(score_history.get_score_count(db_path, "normal"), 200000, "test_rank_query_speed")
+        if elapsed > 0.005:
+            raise AssertionError(f"queries took {elapsed * 1000:.2f} ms per score")
+    finally:
+        score_history.close_all_histories()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+# Execute all tests and log pass/fail summary
+def run_all_tests():
+    tests = [
+        test_queries_match_brute_force,
+        test_score_manager_history,
+        test_rank_query_speed,
+    ]
+
+    test_logger.log_header("Score History Tests")
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+            test_logger.log_result(test.__name__, True)
+        except AssertionError as e:
+            failed += 1
+            test_logger.log_result(test.__name__, False, str(e))
+
+    test_logger.log_summary("Score History Tests", passed, failed)
+    return failed == 0
+
+
+if __name__ == '__main__':
+    test_logger.clear()
+    run_all_tests()
+    test_logger.save()
@@ -1,6 +1,17 @@
-# Tests for score_manager module: calculate_score, check_if_highscore
+# Tests for score_manager module: calculate_score, check_if_highscore, leaderboard cache
 
+import os
+import random
+import shutil
+import tempfile
+import threading
+import multiprocessing
+
+import numpy as np
+
+from models import game_engine
 from utils import score_manager
+from utils import score_history
 from tests import test_logger
 
 
@@ -61,6 +72,17 @@ def test_calculate_score_with_hints():
     assert_equal(score, 20, "test_calculate_score_with_hints")
 
 
+# Verify base letters played against an accented secret count as correct
+def test_calculate_score_accented():
+    state = {
+        "secret_word": "ÉTÉ",
+        "letters_played": ["E", "T"]
+    }
+    score = score_manager.calculate_score(state)
+    # 2 correct (e, t) * 20 = 40
+    assert_equal(score, 40, "test_calculate_score_accented")
+
+
 # Verify negative scores are clamped to zero
 def test_calculate_score_minimum_zero():
     state = {
@@ -109,6 +131,42 @@ def test_calculate_score_combined():
     assert_equal(score, 110, "test_calculate_score_combined")
 
 
+# Verify calculate_scores gives calculate_score's result on random games, with and without np.bitwise_count
+def test_calculate_scores_parity():
+    rng = random.Random(7)
+    alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    states = []
+    times = []
+    hints = []
+    for _ in range(2000):
+        secret = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 12)))
+        states.append({"secret_word": secret, "letters_played": rng.sample(alphabet, rng.randint(0, 26))})
+        times.append(rng.choice([0, rng.uniform(0, 120), rng.randint(0, 60)]))
+        hints.append(rng.randint(0, 3))
+
+    expected = [score_manager.calculate_score(states[i], times[i], hints[i]) for i in range(len(states))]
+    played = [game_engine.letters_to_mask(state["letters_played"]) for state in states]
+    secrets = [game_engine.letters_to_mask(state["secret_word"]) for state in states]
+
+    assert_equal(score_manager.calculate_scores(played, secrets, times, hints).tolist(), expected,
+                 "test_calculate_scores_parity")
+
+    bitwise_count = getattr(np, "bitwise_count", None)
+    if bitwise_count is not None:
+        del np.bitwise_count
+    try:
+        assert_equal(score_manager.calculate_scores(played, secrets, times, hints).tolist(), expected,
+                     "test_calculate_scores_parity")
+    finally:
+        if bitwise_count is not None:
+            np.bitwise_count = bitwise_count
+
+    # One time and hint count shared by every game
+    assert_equal(score_manager.calculate_scores(played[:50], secrets[:50], 7.5, 1).tolist(),
+                 [score_manager.calculate_score(state, 7.5, 1) for state in states[:50]],
+                 "test_calculate_scores_parity")
+
+
 # Verify zero score returns False for highscore
 def test_check_if_highscore_zero_score():
     result = score_manager.check_if_highscore(0, "test_category")
@@ -127,19 +185,241 @@ def test_check_if_highscore_new_category():
     assert_true(result, "test_check_if_highscore_new_category")
 
 
+# Point score_manager at a temp highscores file, returns (temp dir, original path)
+def use_temp_score_file():
+    temp_dir = tempfile.mkdtemp()
+    original = score_manager.SCORE_FILE
+    score_manager.SCORE_FILE = os.path.join(temp_dir, 'highscores.txt')
+    return temp_dir, original
+
+
+# Restore the real highscores path and remove the temp dir
+def restore_score_file(temp_dir, original):
+    score_manager.SCORE_FILE = original
+    score_manager.invalidate_scores_cache()
+    score_history.close_all_histories()
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+# Verify saves are written through to the file and the file is parsed only once
+def test_leaderboard_write_through():
+    temp_dir, original = use_temp_score_file()
+    load_scores = score_manager._load_scores
+    loads = []
+
+    # Count file parses
+    def counting_load():
+        loads.append(1)
+        return load_scores()
+
+    score_manager._load_scores = counting_load
+    try:
+        for score in [30, 50, 40]:
+            if score_manager.check_if_highscore(score, "normal"):
+                score_manager.save_score("bob", score, "normal")
+        top = score_manager.get_top_scores("normal", 2)
+
+        assert_equal(top, [{"name": "BOB", "score": 50}, {"name": "BOB", "score": 40}],
+                     "test_leaderboard_write_through")
+        assert_equal(len(loads), 1, "test_leaderboard_write_through")
+
+        # What was written reads back the same from a cold cache
+        cached = score_manager.get_all_scores()
+        score_manager.invalidate_scores_cache()
+        assert_equal(score_manager.get_all_scores(), cached, "test_leaderboard_write_through")
+    finally:
+        score_manager._load_scores = load_scores
+        restore_score_file(temp_dir, original)
+
+
+# Verify a file rewritten by another process is parsed again
+def test_leaderboard_external_change():
+    temp_dir, original = use_temp_score_file()
+    try:
+        score_manager.save_score("ann", 10, "normal")
+        with open(score_manager.SCORE_FILE, 'w', encoding='utf-8') as f:
+            f.write("[normal]\nZOE=500\nANN=10\n")
+
+        assert_equal(score_manager.get_top_scores("normal")[0], {"name": "ZOE", "score": 500},
+                     "test_leaderboard_external_change")
+    finally:
+        restore_score_file(temp_dir, original)
+
+
+# Verify names holding score file separators are refused instead of being saved unreadable
+def test_save_score_invalid_name():
+    temp_dir, original = use_temp_score_file()
+    try:
+        for name in ["x=y", "a\n[b]", "a@1", ""]:
+            assert_false(score_manager.save_score(name, 100, "normal"), "test_save_score_invalid_name")
+        assert_true(score_manager.save_score("ann", 50, "normal"), "test_save_score_invalid_name")
+
+        score_manager.compact_scores()
+        score_manager.invalidate_scores_cache()
+        assert_equal(score_manager.get_all_scores(), {"normal": [{"name": "ANN", "score": 50}]},
+                     "test_save_score_invalid_name")
+    finally:
+        restore_score_file(temp_dir, original)
+
+
+# Verify equal scores rank by timestamp and a late tie cannot push out a kept score
+def test_leaderboard_ties():
+    temp_dir, original = use_temp_score_file()
+    try:
+        score_manager.save_score("late", 100, "normal", timestamp=20.0)
+        score_manager.save_score("early", 100, "normal", timestamp=10.0)
+        for i in range(8):
+            score_manager.save_score("p" + str(i), 200 + i, "normal", timestamp=30.0 + i)
+
+        names = [entry["name"] for entry in score_manager.get_top_scores("normal")]
+        assert_equal(names[-2:], ["EARLY", "LATE"], "test_leaderboard_ties")
+        assert_false(score_manager.check_if_highscore(100, "normal"), "test_leaderboard_ties")
+        assert_true(score_manager.check_if_highscore(101, "normal"), "test_leaderboard_ties")
+
+        # Order survives a reload from the file
+        score_manager.invalidate_scores_cache()
+        assert_equal([entry["name"] for entry in score_manager.get_top_scores("normal")], names,
+                     "test_leaderboard_ties")
+    finally:
+        restore_score_file(temp_dir, original)
+
+
+# Verify a deep leaderboard keeps the best LEADERBOARD_DEPTH scores in order
+def test_leaderboard_depth():
+    temp_dir, original = use_temp_score_file()
+    original_depth = score_manager.LEADERBOARD_DEPTH
+    score_manager.LEADERBOARD_DEPTH = 50
+    try:
+        scores = [(i * 37) % 101 + 1 for i in range(120)]
+        for i in range(len(scores)):
+            if score_manager.check_if_highscore(scores[i], "normal"):
+                score_manager.save_score("p", scores[i], "normal", timestamp=float(i))
+
+        kept = score_manager.get_top_scores("normal", 100)
+        assert_equal([entry["score"] for entry in kept], sorted(scores, reverse=True)[:50], "test_leaderboard_depth")
+        assert_equal(len(score_manager.get_top_scores("normal")), 10, "test_leaderboard_depth")
+    finally:
+        score_manager.LEADERBOARD_DEPTH = original_depth
+        restore_score_file(temp_dir, original)
+
+
+# Verify NAME=score lines written before timestamps keep their order
+def test_leaderboard_legacy_file():
+    temp_dir, original = use_temp_score_file()
+    try:
+        with open(score_manager.SCORE_FILE, 'w', encoding='utf-8') as f:
+            f.write("[normal]\nANN=50\nBOB=50\nCAT=20\n")
+        score_manager.save_score("dan", 50, "normal")
+
+        assert_equal([entry["name"] for entry in score_manager.get_top_scores("normal")],
+                     ["ANN", "BOB", "DAN", "CAT"], "test_leaderboard_legacy_file")
+    finally:
+        restore_score_file(temp_dir, original)
+
+
+# Verify a full journal is merged into the TXT file and nothing is lost or doubled
+def test_leaderboard_journal_compaction():
+    temp_dir, original = use_temp_score_file()
+    original_size = score_manager.SCORE_JOURNAL_COMPACT_SIZE
+    score_manager.SCORE_JOURNAL_COMPACT_SIZE = 100
+    try:
+        for i in range(7):
+            score_manager.save_score("p" + str(i), 10 + i, "normal", timestamp=float(i))
+        journal_path = score_manager.get_score_journal_file()
+        assert_true(os.path.getsize(journal_path) < 100, "test_leaderboard_journal_compaction")
+
+        # A crash between the TXT rewrite and the journal removal replays lines already merged
+        with open(journal_path, 'a', encoding='utf-8') as f:
+            f.write("normal=P0=10@0.0\n")
+        score_manager.invalidate_scores_cache()
+        scores = [entry["score"] for entry in score_manager.get_top_scores("normal")]
+        assert_equal(scores, [16, 15, 14, 13, 12, 11, 10], "test_leaderboard_journal_compaction")
+
+        assert_true(score_manager.compact_scores(), "test_leaderboard_journal_compaction")
+        assert_false(os.path.exists(journal_path), "test_leaderboard_journal_compaction")
+        assert_equal(len(score_manager.get_top_scores("normal")), 7, "test_leaderboard_journal_compaction")
+    finally:
+        score_manager.SCORE_JOURNAL_COMPACT_SIZE = original_size
+        restore_score_file(temp_dir, original)
+
+
+# Save 25 scores from a forked process (test_leaderboard_process_saves)
+def _save_from_process(offset):
+    for i in range(25):
+        score_manager.save_score("W" + str(offset), offset * 1000 + i, "normal")
+
+
+# Verify processes saving at once, with compactions in between, lose no score
+def test_leaderboard_process_saves():
+    temp_dir, original = use_temp_score_file()
+    original_size = score_manager.SCORE_JOURNAL_COMPACT_SIZE
+    original_depth = score_manager.LEADERBOARD_DEPTH
+    score_manager.SCORE_JOURNAL_COMPACT_SIZE = 500
+    score_manager.LEADERBOARD_DEPTH = 200
+    try:
+        context = multiprocessing.get_context("fork")
+        processes = [context.Process(target=_save_from_process, args=(n,)) for n in range(1, 5)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        scores = [entry["score"] for entry in score_manager.get_top_scores("normal", 200)]
+        assert_equal(scores, sorted([n * 1000 + i for n in range(1, 5) for i in range(25)], reverse=True),
+                     "test_leaderboard_process_saves")
+    finally:
+        score_manager.SCORE_JOURNAL_COMPACT_SIZE = original_size
+        score_manager.LEADERBOARD_DEPTH = original_depth
+        restore_score_file(temp_dir, original)
+
+
+# Verify concurrent saves from threads lose no score
+def test_leaderboard_concurrent_saves():
+    temp_dir, original = use_temp_score_file()
+    try:
+        # Save 20 distinct scores from one thread
+        def submit(offset):
+            for i in range(20):
+                score_manager.save_score("T", offset * 100 + i, "normal")
+
+        threads = [threading.Thread(target=submit, args=(n,)) for n in range(1, 9)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        expected = sorted([n * 100 + i for n in range(1, 9) for i in range(20)], reverse=True)[:10]
+        score_manager.invalidate_scores_cache()
+        assert_equal([entry["score"] for entry in score_manager.get_top_scores("normal")], expected,
+                     "test_leaderboard_concurrent_saves")
+    finally:
+        restore_score_file(temp_dir, original)
+
+
 # Execute all tests and log pass/fail summary
 def run_all_tests():
     tests = [
         test_calculate_score_basic,
         test_calculate_score_with_time_bonus,
         test_calculate_score_with_hints,
+        test_calculate_score_accented,
         test_calculate_score_minimum_zero,
         test_calculate_score_empty_game,
         test_calculate_score_with_set,
         test_calculate_score_combined,
+        test_calculate_scores_parity,
         test_check_if_highscore_zero_score,
         test_check_if_highscore_negative_score,
         test_check_if_highscore_new_category,
+        test_leaderboard_write_through,
+        test_leaderboard_external_change,
+        test_save_score_invalid_name,
+        test_leaderboard_ties,
+        test_leaderboard_depth,
+        test_leaderboard_legacy_file,
+        test_leaderboard_journal_compaction,
+        test_leaderboard_process_saves,
+        test_leaderboard_concurrent_saves,
     ]
 
     test_logger.log_header("Score Manager Tests")
@@ -0,0 +1,178 @@
+# Tests for session_manager module: start/get sessions, LRU and idle eviction, disk spill and restore
+
+import os
+import shutil
+import tempfile
+
+from models import game_engine
+from models import session_manager
+from tests import test_logger
+
+
+# Raise AssertionError if actual != expected
+def assert_equal(actual, expected, test_name):
+    if actual != expected:
+        raise AssertionError(f"Expected {expected}, got {actual}")
+
+
+# Return a fake clock function and the list holding its current time (set now[0] to move time)
+def make_clock():
+    now = [1000.0]
+    return (lambda: now[0]), now
+
+
+# Verify a session keeps its game between calls
+def test_start_and_play():
+    manager = session_manager.create_manager()
+    session_id = session_manager.start_session(manager, "chat", 7, "fr", "facile", 3)
+
+    session_manager.play_letter(manager, session_id, "c")
+    session = session_manager.get_session(manager, session_id)
+
+    assert_equal(game_engine.get_masked_word(session["game"]), "C _ _ _", "test_start_and_play")
+    assert_equal(session["hints_left"], 3, "test_start_and_play")
+    assert_equal(session_manager.get_session(manager, "unknown"), None, "test_start_and_play")
+
+
+# Verify the least recently used session is evicted first
+def test_lru_eviction():
+    manager = session_manager.create_manager(max_sessions=2)
+    first = session_manager.start_session(manager, "chat")
+    second = session_manager.start_session(manager, "chien")
+
+    session_manager.get_session(manager, first)
+    session_manager.start_session(manager, "poule")
+
+    assert_equal(session_manager.get_session(manager, second), None, "test_lru_eviction")
+    assert_equal(session_manager.get_session(manager, first) is not None, True, "test_lru_eviction")
+    assert_equal(session_manager.get_manager_stats(manager)["evicted"], 1, "test_lru_eviction")
+
+
+# Verify sessions idle past the timeout are evicted on the next access
+def test_idle_timeout():
+    clock, now = make_clock()
+    manager = session_manager.create_manager(idle_timeout=60, clock=clock)
+    old = session_manager.start_session(manager, "chat")
+
+    now[0] += 30
+    recent = session_manager.start_session(manager, "chien")
+    now[0] += 45
+
+    assert_equal(session_manager.expire_idle_sessions(manager), 1, "test_idle_timeout")
+    assert_equal(session_manager.get_session(manager, old), None, "test_idle_timeout")
+    assert_equal(session_manager.get_session(manager, recent) is not None, True, "test_idle_timeout")
+
+
+# Verify evicted sessions are spilled to disk and resume where they stopped
+def test_spill_and_restore():
+    spill_dir = tempfile.mkdtemp()
+    try:
+        manager = session_manager.create_manager(max_sessions=1, spill_dir=spill_dir)
+        first = session_manager.start_session(manager, "élève", 3, "fr", "moyen", 2)
+        session_manager.play_letter(manager, first, "e")
+        session_manager.play_letter(manager, first, "z")
+
+        session_manager.start_session(manager, "chien")
+        assert_equal(session_manager.get_manager_stats(manager)["spilled"], 1, "test_spill_and_restore")
+
+        session = session_manager.get_session(manager, first)
+        assert_equal(game_engine.get_masked_word(session["game"]), "É _ È _ E", "test_spill_and_restore")
+        assert_equal(game_engine.get_errors(session["game"]), 1, "test_spill_and_restore")
+        assert_equal(session["hints_left"], 2, "test_spill_and_restore")
+        assert_equal(session_manager.get_manager_stats(manager)["restored"], 1, "test_spill_and_restore")
+    finally:
+        shutil.rmtree(spill_dir)
+
+
+# Verify a session's seed survives a spill so its random choices replay identically
+def test_session_rng_after_spill():
+    spill_dir = tempfile.mkdtemp()
+    try:
+        manager = session_manager.create_manager(max_sessions=1, spill_dir=spill_dir)
+        session_id = session_manager.start_session(manager, "chat", seed=1234)
+        before = session_manager.session_rng(session_manager.get_session(manager, session_id), 0).random()
+
+        session_manager.start_session(manager, "chien")
+        session = session_manager.get_session(manager, session_id)
+        assert_equal(session["seed"], 1234, "test_session_rng_after_spill")
+        assert_equal(session_manager.session_rng(session, 0).random(), before, "test_session_rng_after_spill")
+    finally:
+        shutil.rmtree(spill_dir)
+
+
+# Verify spill files are deleted on restore, and idle or finished sessions are swept from disk
+def test_spill_cleanup():
+    spill_dir = tempfile.mkdtemp()
+    try:
+        clock, now = make_clock()
+        manager = session_manager.create_manager(max_sessions=1, idle_timeout=60, spill_dir=spill_dir, clock=clock)
+        resumed = session_manager.start_session(manager, "chat")
+        session_manager.start_session(manager, "chien")
+        session_manager.get_session(manager, resumed)
+        assert_equal(os.path.exists(session_manager.get_spill_file(manager, resumed)), False, "test_spill_cleanup")
+
+        # A lost game is not spilled; an idle session's file is swept after the timeout
+        lost = session_manager.start_session(manager, "ab", max_errors=1)
+        session_manager.play_letter(manager, lost, "z")
+        idle = session_manager.start_session(manager, "poule")
+        assert_equal(os.path.exists(session_manager.get_spill_file(manager, lost)), False, "test_spill_cleanup")
+        session_manager.spill_all_sessions(manager)
+        assert_equal(os.path.exists(session_manager.get_spill_file(manager, idle)), True, "test_spill_cleanup")
+
+        now[0] += 61
+        session_manager.expire_idle_sessions(manager)
+        assert_equal(os.listdir(spill_dir), [], "test_spill_cleanup")
+        assert_equal(session_manager.get_session(manager, idle), None, "test_spill_cleanup")
+    finally:
+        shutil.rmtree(spill_dir)
+
+
+# Verify ended sessions are gone from memory and disk, and bad ids are rejected
+def test_end_session():
+    spill_dir = tempfile.mkdtemp()
+    try:
+        manager = session_manager.create_manager(spill_dir=spill_dir)
+        session_id = session_manager.start_session(manager, "chat")
+        session_manager.spill_all_sessions(manager)
+
+        assert_equal(session_manager.end_session(manager, session_id), True, "test_end_session")
+        assert_equal(session_manager.get_session(manager, session_id), None, "test_end_session")
+        assert_equal(session_manager.start_session(manager, "chat", session_id="../x"), None, "test_end_session")
+    finally:
+        shutil.rmtree(spill_dir)
+
+
+# Execute all tests and log pass/fail summary
+def run_all_tests():
+    tests = [
+        test_start_and_play,
+        test_lru_eviction,
+        test_idle_timeout,
+        test_spill_and_restore,
+        test_session_rng_after_spill,
+        test_spill_cleanup,
+        test_end_session,
+    ]
+
+    test_logger.log_header("Session Manager Tests")
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+            test_logger.log_result(test.__name__, True)
+        except AssertionError as e:
+            failed += 1
+            test_logger.log_result(test.__name__, False, str(e))
+
+    test_logger.log_summary("Session Manager Tests", passed, failed)
+    return failed == 0
+
+
+if __name__ == '__main__':
+    test_logger.clear()
+    run_all_tests()
+    test_logger.save()
@@ -0,0 +1,131 @@
+# Tests for solver module: choose_letter, narrow_candidates, solve_word, evaluate_dictionary
+
+import os
+import shutil
+import tempfile
+
+from models import solver
+from utils import word_manager
+from tests import test_logger
+
+
+# Raise AssertionError if actual != expected
+def assert_equal(actual, expected, test_name):
+    if actual != expected:
+        raise AssertionError(f"Expected {expected}, got {actual}")
+
+
+WORDS = ["chat", "chien", "champ", "chose", "poule", "lapin", "table"]
+
+
+# Verify the frequency strategy plays the letter shared by most candidates
+def test_choose_letter_frequency():
+    index = word_manager.build_letter_index(["chat", "char", "chut"])
+    letter = solver.choose_letter(index, index["all"], set())
+
+    assert_equal(letter, "C", "test_choose_letter_frequency")
+
+
+# Verify a hit keeps words with the letter at exactly the revealed positions
+def test_narrow_candidates_hit():
+    index = word_manager.build_letter_index(["chat", "tact", "tata"])
+    candidates = solver.narrow_candidates(index, index["all"], "TACT", "T")
+
+    assert_equal(word_manager.bitset_to_words(index, candidates), ["TACT"], "test_narrow_candidates_hit")
+
+
+# Verify a miss removes every word containing the letter
+def test_narrow_candidates_miss():
+    index = word_manager.build_letter_index(WORDS)
+    candidates = solver.narrow_candidates(index, index["all"], "CHAT", "E")
+
+    assert_equal(word_manager.bitset_to_words(index, candidates), ["CHAT", "CHAMP", "LAPIN"],
+                 "test_narrow_candidates_miss")
+
+
+# Verify accented secrets narrow like their folded dictionary words instead of clearing the candidates
+def test_narrow_candidates_accented():
+    index = word_manager.build_letter_index(["forêt", "foret", "forum", "fêtes"])
+    candidates = solver.narrow_candidates(index, index["all"], "FORÊT", "E")
+
+    assert_equal(word_manager.bitset_to_words(index, candidates), ["FORET", "FORET"],
+                 "test_narrow_candidates_accented")
+    assert_equal(solver.solve_word("forêt", index, 7)["errors"], 0, "test_narrow_candidates_accented")
+
+
+# Verify every dictionary word is solved with both strategies
+def test_solve_word_dictionary():
+    index = word_manager.build_letter_index(WORDS)
+    for strategy in solver.STRATEGIES:
+        for word in WORDS:
+            result = solver.solve_word(word, index, 7, strategy)
+            if not result["won"]:
+                raise AssertionError(f"{strategy} lost on {word}: {result}")
+
+
+# Verify words outside the dictionary still end in a win or loss
+def test_solve_word_unknown():
+    index = word_manager.build_letter_index(WORDS)
+    result = solver.solve_word("zygote", index, 3)
+
+    if result["won"] and result["errors"] >= 3:
+        raise AssertionError(f"inconsistent result: {result}")
+    assert_equal(result["word"], "ZYGOTE", "test_solve_word_unknown")
+
+
+# Verify evaluation covers every word of the requested sections
+def test_evaluate_dictionary_inline():
+    temp_dir = tempfile.mkdtemp()
+    with open(os.path.join(temp_dir, 'words_fr.txt'), 'w', encoding='utf-8') as f:
+        f.write("[facile]\nchat\nchien\nchamp\n\n[moyen]\nguitare\nfenetre\n")
+    original_dir = word_manager.DATA_DIR
+    word_manager.DATA_DIR = temp_dir
+    word_manager.invalidate_words_cache()
+    try:
+        results = solver.evaluate_dictionary("fr", workers=1, shard_size=2)
+        summary = solver.summarize_results(results["facile"])
+
+        assert_equal(len(results["facile"]), 3, "test_evaluate_dictionary_inline")
+        assert_equal(len(results["moyen"]), 2, "test_evaluate_dictionary_inline")
+        assert_equal(summary["games"], 3, "test_evaluate_dictionary_inline")
+        assert_equal(summary["win_rate"], 1.0, "test_evaluate_dictionary_inline")
+    finally:
+        word_manager.DATA_DIR = original_dir
+        word_manager.invalidate_words_cache()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+# Execute all tests and log pass/fail summary
+def run_all_tests():
+    tests = [
+        test_choose_letter_frequency,
+        test_narrow_candidates_hit,
+        test_narrow_candidates_miss,
+        test_narrow_candidates_accented,
+        test_solve_word_dictionary,
+        test_solve_word_unknown,
+        test_evaluate_dictionary_inline,
+    ]
+
+    test_logger.log_header("Solver Tests")
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+            test_logger.log_result(test.__name__, True)
+        except AssertionError as e:
+            failed += 1
+            test_logger.log_result(test.__name__, False, str(e))
+
+    test_logger.log_summary("Solver Tests", passed, failed)
+    return failed == 0
+
+
+if __name__ == '__main__':
+    test_logger.clear()
+    run_all_tests()
+    test_logger.save()
@@ -0,0 +1,119 @@
+# Tests for word_importer module: normalize_word, classify_word, import_words
+
+import os
+import shutil
+import tempfile
+
+from utils import word_manager
+from utils import word_importer
+from tests import test_logger
+
+
+# Raise AssertionError if actual != expected
+def assert_equal(actual, expected, test_name):
+    if actual != expected:
+        raise AssertionError(f"Expected {expected}, got {actual}")
+
+
+# Create temp dir with a word file and an import list, returns (dir, txt path, source path)
+def make_import_files(source_lines):
+    temp_dir = tempfile.mkdtemp()
+    txt_path = os.path.join(temp_dir, 'words_fr.txt')
+    source_path = os.path.join(temp_dir, 'import.txt')
+
+    with open(txt_path, 'w', encoding='utf-8') as f:
+        f.write("[facile]\nchat\n\n[moyen]\nguitare\n")
+    with open(source_path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(source_lines) + "\n")
+
+    return temp_dir, txt_path, source_path
+
+
+# Verify accents and ligatures are folded and case is lowered
+def test_normalize_word_accents():
+    assert_equal(word_importer.normalize_word(" Fenêtre\n"), "fenetre", "test_normalize_word_accents")
+    assert_equal(word_importer.normalize_word("Cœur"), "coeur", "test_normalize_word_accents")
+
+
+# Verify non-alphabetic entries are rejected
+def test_normalize_word_invalid():
+    assert_equal(word_importer.normalize_word("rendez-vous"), "", "test_normalize_word_invalid")
+    assert_equal(word_importer.normalize_word("abc1"), "", "test_normalize_word_invalid")
+
+
+# Verify length thresholds of the default classifier
+def test_classify_word():
+    assert_equal(word_importer.classify_word("chat"), "facile", "test_classify_word")
+    assert_equal(word_importer.classify_word("guitare"), "moyen", "test_classify_word")
+    assert_equal(word_importer.classify_word("xylophone"), "difficile", "test_classify_word")
+
+
+# Verify import dedupes against the dictionary and within the input, then writes once
+def test_import_words_file_inline():
+    temp_dir, txt_path, source_path = make_import_files(
+        ["Chat", "pomme", "POMME", "élément", "x-ray", "", "xylophone"])
+    try:
+        stats = word_importer.import_words_file(txt_path, source_path, workers=1, chunk_size=2)
+
+        assert_equal(stats["read"], 6, "test_import_words_file_inline")
+        assert_equal(stats["invalid"], 1, "test_import_words_file_inline")
+        assert_equal(stats["duplicates"], 2, "test_import_words_file_inline")
+        assert_equal(stats["added"], {"facile": 1, "moyen": 1, "difficile": 1}, "test_import_words_file_inline")
+
+        words = word_manager.load_words_from_txt(txt_path)
+        assert_equal(words["facile"], ["chat", "pomme"], "test_import_words_file_inline")
+        assert_equal(words["moyen"], ["guitare", "element"], "test_import_words_file_inline")
+        assert_equal(words["difficile"], ["xylophone"], "test_import_words_file_inline")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+# Verify the process pool path gives the same result as the inline path
+def test_import_words_file_pool():
+    lines = []
+    for i in range(300):
+        lines.append("mot" + chr(ord('a') + i % 26) + chr(ord('a') + i // 26))
+    temp_dir, txt_path, source_path = make_import_files(lines)
+    try:
+        stats = word_importer.import_words_file(txt_path, source_path, difficulty="moyen",
+                                                workers=2, chunk_size=50)
+        words = word_manager.load_words_from_txt(txt_path)
+
+        assert_equal(stats["added"], {"moyen": 300}, "test_import_words_file_pool")
+        assert_equal(words["moyen"][1:], lines, "test_import_words_file_pool")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+# Execute all tests and log pass/fail summary
+def run_all_tests():
+    tests = [
+        test_normalize_word_accents,
+        test_normalize_word_invalid,
+        test_classify_word,
+        test_import_words_file_inline,
+        test_import_words_file_pool,
+    ]
+
+    test_logger.log_header("Word Importer Tests")
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+            test_logger.log_result(test.__name__, True)
+        except AssertionError as e:
+            failed += 1
+            test_logger.log_result(test.__name__, False, str(e))
+
+    test_logger.log_summary("Word Importer Tests", passed, failed)
+    return failed == 0
+
+
+if __name__ == '__main__':
+    test_logger.clear()
+    run_all_tests()
+    test_logger.save()
@@ -1,9 +1,33 @@
 # Tests for word_manager module: load_words, get_word, add_word
 
+import os
+import random
+import shutil
+import tempfile
+
 from utils import word_manager
 from tests import test_logger
 
 
+# Point word_manager at a temp data dir holding a small French word file
+def use_temp_data_dir(content="[facile]\nchat\n\n[moyen]\nguitare\n\n[difficile]\nlabyrinthe\n"):
+    temp_dir = tempfile.mkdtemp()
+    with open(os.path.join(temp_dir, 'words_fr.txt'), 'w', encoding='utf-8') as f:
+        f.write(content)
+    original_dir = word_manager.DATA_DIR
+    word_manager.DATA_DIR = temp_dir
+    word_manager.invalidate_words_cache()
+    return temp_dir, original_dir
+
+
+# Restore the real data dir and remove the temp one
+def restore_data_dir(temp_dir, original_dir):
+    word_manager.close_all_word_bags()
+    word_manager.DATA_DIR = original_dir
+    word_manager.invalidate_words_cache()
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
 # Verify French words load as non-empty dict
 def test_load_words_french():
     words = word_manager.load_words("fr")
@@ -117,6 +141,345 @@ def test_add_word_validation():
         raise AssertionError("should reject invalid inputs")
 
 
+# Verify second load of an unchanged file is served from the cache
+def test_load_words_cache_hit():
+    temp_dir, original_dir = use_temp_data_dir()
+    try:
+        word_manager.reset_cache_stats()
+        first = word_manager.load_words("fr")
+        second = word_manager.load_words("fr")
+        stats = word_manager.get_cache_stats()
+
+        if first is not second:
+            raise AssertionError("second load should return the cached dict")
+        if stats["misses"] != 1 or stats["hits"] != 1:
+            raise AssertionError(f"expected 1 miss and 1 hit, got {stats}")
+    finally:
+        restore_data_dir(temp_dir, original_dir)
+
+
+# Verify cache is refreshed when the word file changes on disk
+def test_load_words_cache_file_changed():
+    temp_dir, original_dir = use_temp_data_dir()
+    try:
+        word_manager.load_words("fr")
+        with open(os.path.join(temp_dir, 'words_fr.txt'), 'a', encoding='utf-8') as f:
+            f.write("souris\n")
+        words = word_manager.load_words("fr")
+
+        if "souris" not in words["difficile"]:
+            raise AssertionError("cache should be invalidated by file change")
+    finally:
+        restore_data_dir(temp_dir, original_dir)
+
+
+# Verify add_word invalidates the cache so the new word is visible
+def test_add_word_invalidates_cache():
+    temp_dir, original_dir = use_temp_data_dir()
+    try:
+        word_manager.load_words("fr")
+        word_manager.add_word("fr", "pomme", "facile")
+        words = word_manager.load_words("fr")
+
+        if "pomme" not in words["facile"]:
+            raise AssertionError("added word missing after reload")
+    finally:
+        restore_data_dir(temp_dir, original_dir)
+
+
+# Verify compiled dictionary keeps sections, counts and word order
+def test_compile_words_roundtrip():
+    temp_dir, original_dir = use_temp_data_dir("[facile]\nchat\nété\n\n[moyen]\nguitare\n")
+    try:
+        txt_path = word_manager.get_words_file("fr")
+        bin_path = word_manager.get_compiled_file("fr")
+        if not word_manager.compile_words_file(txt_path, bin_path):
+            raise AssertionError("compile should succeed")
+
+        compiled = word_manager.open_compiled_words(bin_path)
+        try:
+            if word_manager.get_compiled_word_count(compiled, "facile") != 2:
+                raise AssertionError("expected 2 facile words")
+            if word_manager.get_compiled_word_at(compiled, "facile", 1) != "été":
+                raise AssertionError("UTF-8 word not decoded correctly")
+            if word_manager.get_compiled_word_count(compiled, "difficile") != 0:
+                raise AssertionError("missing section should count 0")
+            if word_manager.get_compiled_random_word(compiled, "moyen") != "GUITARE":
+                raise AssertionError("random word should be uppercase GUITARE")
+        finally:
+            word_manager.close_compiled_words(compiled)
+    finally:
+        restore_data_dir(temp_dir, original_dir)
+
+
+# Verify a stale compiled dictionary is rebuilt after the TXT changes
+def test_compiled_words_rebuilt_when_stale():
+    temp_dir, original_dir = use_temp_data_dir("[facile]\nchat\n")
+    try:
+        compiled = word_manager.load_compiled_words("fr")
+        if word_manager.get_compiled_word_count(compiled, "facile") != 1:
+            raise AssertionError("expected 1 facile word")
+
+        with open(os.path.join(temp_dir, 'words_fr.txt'), 'a', encoding='utf-8') as f:
+            f.write("chien\n")
+        compiled = word_manager.load_compiled_words("fr")
+
+        if word_manager.get_compiled_word_count(compiled, "facile") != 2:
+            raise AssertionError("compiled dictionary should be rebuilt")
+    finally:
+        restore_data_dir(temp_dir, original_dir)
+
+
+# Verify a failed compile is not retried on every draw, and is retried once the TXT changes
+def test_failed_compile_not_retried():
+    temp_dir, original_dir = use_temp_data_dir("[facile]\nchat\n")
+    compile_words_file = word_manager.compile_words_file
+    calls = []
+
+    def counting_compile(txt_path, bin_path):
+        calls.append(txt_path)
+        return compile_words_file(txt_path, bin_path)
+
+    word_manager.compile_words_file = counting_compile
+    try:
+        # A directory in place of the temp file makes the write fail, as an unwritable data/ would
+        temp_path = word_manager.get_compiled_file("fr") + '.tmp'
+        os.mkdir(temp_path)
+        for _ in range(5):
+            if word_manager.get_word("fr", "facile") != "CHAT":
+                raise AssertionError("draws should fall back to the parsed word list")
+        if len(calls) != 1:
+            raise AssertionError(f"failed compile should run once, ran {len(calls)} times")
+
+        os.rmdir(temp_path)
+        with open(os.path.join(temp_dir, 'words_fr.txt'), 'a', encoding='utf-8') as f:
+            f.write("chien\n")
+        word_manager.get_word("fr", "facile")
+        if len(calls) != 2 or word_manager.load_compiled_words("fr") is None:
+            raise AssertionError("compile should be retried after the TXT changes")
+    finally:
+        word_manager.compile_words_file = compile_words_file
+        restore_data_dir(temp_dir, original_dir)
+
+
+# Verify add_word appends to the journal and leaves the TXT untouched
+def test_add_word_appends_to_journal():
+    temp_dir, original_dir = use_temp_data_dir()
+    try:
+        txt_path = word_manager.get_words_file("fr")
+        with open(txt_path, 'r', encoding='utf-8') as f:
+            before = f.read()
+
+        word_manager.add_word("fr", "Pomme", "facile")
+
+        with open(txt_path, 'r', encoding='utf-8') as f:
+            after = f.read()
+        with open(word_manager.get_journal_file(txt_path), 'r', encoding='utf-8') as f:
+            journal = f.read()
+
+        if before != after:
+            raise AssertionError("TXT file should not be rewritten")
+        if journal != "facile=pomme\n":
+            raise AssertionError(f"unexpected journal content: {journal!r}")
+    finally:
+        restore_data_dir(temp_dir, original_dir)
+
+
+# Verify duplicates are rejected case-insensitively across TXT and journal
+def test_add_word_duplicate_rejected():
+    temp_dir, original_dir = use_temp_data_dir()
+    try:
+        result1 = word_manager.add_word("fr", "CHAT", "facile")
+        result2 = word_manager.add_word("fr", "pomme", "facile")
+        result3 = word_manager.add_word("fr", "Pomme", "facile")
+
+        if result1 or not result2 or result3:
+            raise AssertionError(f"expected False, True, False, got {result1}, {result2}, {result3}")
+    finally:
+        restore_data_dir(temp_dir, original_dir)
+
+
+# Verify compaction merges the journal into the TXT and removes it
+def test_compact_words_file():
+    temp_dir, original_dir = use_temp_data_dir()
+    try:
+        txt_path = word_manager.get_words_file("fr")
+        word_manager.add_word("fr", "pomme", "facile")
+        word_manager.add_word("fr", "souris", "moyen")
+
+        if not word_manager.compact_words_file(txt_path):
+            raise AssertionError("compaction should succeed")
+        if os.path.exists(word_manager.get_journal_file(txt_path)):
+            raise AssertionError("journal should be removed")
+
+        words = word_manager.load_words_from_txt(txt_path)
+        if words["facile"] != ["chat", "pomme"] or words["moyen"] != ["guitare", "souris"]:
+            raise AssertionError(f"unexpected merged words: {words}")
+        if word_manager.add_word("fr", "pomme", "facile"):
+            raise AssertionError("duplicate index should survive compaction")
+    finally:
+        restore_data_dir(temp_dir, original_dir)
+
+
+# Verify a bag draws every word once before repeating
+def test_word_bag_no_repeat():
+    temp_dir, original_dir = use_temp_data_dir("[facile]\nchat\nchien\npain\nlune\n")
+    try:
+        bag = word_manager.create_word_bag("fr", "facile")
+        first_cycle = [word_manager.draw_from_bag(bag) for i in range(4)]
+        second_cycle = [word_manager.draw_from_bag(bag) for i in range(4)]
+
+        if sorted(first_cycle) != ["CHAT", "CHIEN", "LUNE", "PAIN"]:
+            raise AssertionError(f"first cycle repeated words: {first_cycle}")
+        if sorted(second_cycle) != ["CHAT", "CHIEN", "LUNE", "PAIN"]:
+            raise AssertionError(f"second cycle repeated words: {second_cycle}")
+    finally:
+        restore_data_dir(temp_dir, original_dir)
+
+
+# Verify a persisted bag resumes where the previous session stopped
+def test_word_bag_persisted_cursor():
+    temp_dir, original_dir = use_temp_data_dir("[facile]\nchat\nchien\npain\nlune\n")
+    try:
+        bag = word_manager.create_word_bag("fr", "facile", persist=True)
+        drawn = [word_manager.draw_from_bag(bag), word_manager.draw_from_bag(bag)]
+        word_manager.close_word_bag(bag)
+
+        bag = word_manager.create_word_bag("fr", "facile", persist=True)
+        drawn.append(word_manager.draw_from_bag(bag))
+        drawn.append(word_manager.draw_from_bag(bag))
+        word_manager.close_word_bag(bag)
+
+        if sorted(drawn) != ["CHAT", "CHIEN", "LUNE", "PAIN"]:
+            raise AssertionError(f"resumed bag replayed words: {drawn}")
+    finally:
+        restore_data_dir(temp_dir, original_dir)
+
+
+# Verify seeded generators make random words, bags and alias draws reproducible
+def test_seeded_rng_reproducible():
+    temp_dir, original_dir = use_temp_data_dir("[facile]\nchat\nchien\npain\nlune\nnuit\njour\n")
+    try:
+        words_data = word_manager.load_words("fr")
+        table = word_manager.build_alias_table([1, 2, 3, 4])
+        runs = []
+        for attempt in range(2):
+            rng = random.Random(7)
+            bag = word_manager.create_word_bag("fr", "facile", rng=rng)
+            runs.append([word_manager.get_random_word(words_data, "facile", rng),
+                         [word_manager.draw_from_bag(bag) for i in range(6)],
+                         [word_manager.alias_draw(table, rng) for i in range(20)]])
+
+        if runs[0] != runs[1]:
+            raise AssertionError(f"same seed gave different draws: {runs}")
+    finally:
+        restore_data_dir(temp_dir, original_dir)
+
+
+# Verify get_unique_word returns "" for an empty section and invalid language
+def test_get_unique_word_empty():
+    temp_dir, original_dir = use_temp_data_dir("[facile]\nchat\n")
+    try:
+        if word_manager.get_unique_word("fr", "difficile") != "":
+            raise AssertionError("empty section should return empty string")
+        if word_manager.get_unique_word("xyz", "facile") != "":
+            raise AssertionError("invalid language should return empty string")
+    finally:
+        restore_data_dir(temp_dir, original_dir)
+
+
+# Verify alias table encodes exactly the requested probabilities
+def test_build_alias_table_probabilities():
+    weights = [1, 0, 3, 6, 2.5]
+    table = word_manager.build_alias_table(weights)
+    n = table["count"]
+
+    # Probability of i = own slot share + shares of slots aliasing to it
+    implied = [table["prob"][i] / n for i in range(n)]
+    for j in range(n):
+        if table["alias"][j] != j:
+            implied[table["alias"][j]] += (1.0 - table["prob"][j]) / n
+
+    for i in range(n):
+        if abs(implied[i] - weights[i] / sum(weights)) > 1e-9:
+            raise AssertionError(f"slot {i}: expected {weights[i] / sum(weights)}, got {implied[i]}")
+
+
+# Verify invalid weights produce no table
+def test_build_alias_table_invalid():
+    if word_manager.build_alias_table([]) is not None:
+        raise AssertionError("empty weights should return None")
+    if word_manager.build_alias_table([0, 0]) is not None:
+        raise AssertionError("zero weights should return None")
+    if word_manager.build_alias_table([2, -1]) is not None:
+        raise AssertionError("negative weights should return None")
+
+
+# Verify zero-weight words from the weights file are never drawn
+def test_get_weighted_word_uses_weights():
+    temp_dir, original_dir = use_temp_data_dir("[facile]\nchat\nchien\npain\n")
+    try:
+        word_manager.save_word_weights("fr", {"chat": 0, "pain": 0, "chien": 5})
+        for i in range(20):
+            word = word_manager.get_weighted_word("fr", "facile")
+            if word != "CHIEN":
+                raise AssertionError(f"zero-weight word drawn: {word}")
+    finally:
+        restore_data_dir(temp_dir, original_dir)
+
+
+# Verify the tuned draw follows the weights file once it exists and deals a no-repeat bag before
+def test_get_tuned_word():
+    temp_dir, original_dir = use_temp_data_dir("[facile]\nchat\nchien\npain\n")
+    try:
+        words = sorted(word_manager.get_tuned_word("fr", "facile") for i in range(3))
+        if words != ["CHAT", "CHIEN", "PAIN"]:
+            raise AssertionError(f"bag repeated a word: {words}")
+
+        word_manager.save_word_weights("fr", {"chat": 0, "chien": 0, "pain": 2})
+        for i in range(10):
+            word = word_manager.get_tuned_word("fr", "facile")
+            if word != "PAIN":
+                raise AssertionError(f"zero-weight word drawn: {word}")
+    finally:
+        restore_data_dir(temp_dir, original_dir)
+
+
+# Verify pattern + absent letters query returns exactly the matching words
+def test_query_letter_index_pattern():
+    index = word_manager.build_letter_index(["garages", "parties", "barrels", "balance", "cat"])
+    bits = word_manager.query_letter_index(index, pattern="_A_A___", absent="RS")
+    words = word_manager.bitset_to_words(index, bits)
+
+    if words != ["BALANCE"]:
+        raise AssertionError(f"expected ['BALANCE'], got {words}")
+
+
+# Verify hangman mode excludes revealed letters from blank positions
+def test_query_letter_index_hangman():
+    index = word_manager.build_letter_index(["banana", "bandit"])
+    # A revealed at 1 only: BANANA has more A's, so it is ruled out in hangman mode
+    hangman_words = word_manager.bitset_to_words(index, word_manager.query_letter_index(index, pattern="_A____"))
+    plain_words = word_manager.bitset_to_words(
+        index, word_manager.query_letter_index(index, pattern="_A____", hangman=False))
+
+    if hangman_words != ["BANDIT"]:
+        raise AssertionError(f"expected ['BANDIT'], got {hangman_words}")
+    if plain_words != ["BANANA", "BANDIT"]:
+        raise AssertionError(f"expected both words, got {plain_words}")
+
+
+# Verify length, present letters and bit helpers
+def test_query_letter_index_length_present():
+    index = word_manager.build_letter_index(["chat", "chien", "lune", "pain"])
+    bits = word_manager.query_letter_index(index, length=4, present="n")
+
+    if word_manager.bitset_to_ids(bits) != [2, 3]:
+        raise AssertionError(f"expected ids [2, 3], got {word_manager.bitset_to_ids(bits)}")
+    if word_manager.count_bits(bits) != 2:
+        raise AssertionError("expected 2 bits set")
+
+
 # Execute all tests and log pass/fail summary
 def run_all_tests():
     tests = [
@@ -133,6 +496,26 @@ def run_all_tests():
         test_load_words_from_txt,
         test_load_words_french_txt,
         test_add_word_validation,
+        test_load_words_cache_hit,
+        test_load_words_cache_file_changed,
+        test_add_word_invalidates_cache,
+        test_compile_words_roundtrip,
+        test_compiled_words_rebuilt_when_stale,
+        test_failed_compile_not_retried,
+        test_add_word_appends_to_journal,
+        test_add_word_duplicate_rejected,
+        test_compact_words_file,
+        test_word_bag_no_repeat,
+        test_word_bag_persisted_cursor,
+        test_seeded_rng_reproducible,
+        test_get_unique_word_empty,
+        test_build_alias_table_probabilities,
+        test_build_alias_table_invalid,
+        test_get_weighted_word_uses_weights,
+        test_get_tuned_word,
+        test_query_letter_index_pattern,
+        test_query_letter_index_hangman,
+        test_query_letter_index_length_present,
     ]
 
     test_logger.log_header("Word Manager Tests")
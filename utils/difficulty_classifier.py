@@ -0,0 +1,182 @@
+# Difficulty classifier: score whole dictionaries with NumPy and re-bucket them into facile/moyen/difficile
+
+import re
+import sys
+import argparse
+import unicodedata
+
+import numpy as np
+
+from utils import word_manager
+
+DIFFICULTIES = ['facile', 'moyen', 'difficile']
+
+# Rows processed per vectorized step, bounds temporary float arrays on million-word dictionaries
+BATCH_SIZE = 200000
+
+# Letter codes in encoded matrices: 0 = padding, 1-26 = a-z, 27 = any other character
+OTHER_CODE = 27
+CODE_COUNT = 28
+
+# Combining diacritics left by NFKD decomposition
+COMBINING_MARKS = re.compile('[\u0300-\u036f]')
+
+# Score = weighted sum of the features below (higher = harder)
+WEIGHT_LENGTH = 0.5
+WEIGHT_DISTINCT = 0.5
+WEIGHT_RARITY = 2.0
+WEIGHT_WRONG = 1.0
+
+
+# Encode words as a padded uint8 code matrix (N x max length) plus int32 lengths, no per-word loop
+def encode_words(words):
+    n = len(words)
+    if n == 0:
+        return np.zeros((0, 0), dtype=np.uint8), np.zeros(0, dtype=np.int32)
+
+    # One NFKD pass over the joined text folds accents (é -> e); other non-ASCII become '?' then OTHER_CODE
+    text = unicodedata.normalize('NFKD', "\n".join(words).lower() + "\n")
+    text = COMBINING_MARKS.sub("", text)
+    blob = np.frombuffer(text.encode('ascii', 'replace'), dtype=np.uint8)
+    ends = np.flatnonzero(blob == 10)
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    lengths = (ends - starts).astype(np.int32)
+
+    chars = np.delete(blob, ends).astype(np.int16) - 96
+    chars[(chars < 1) | (chars > 26)] = OTHER_CODE
+
+    # Column of each character = its index in chars minus the start of its word in chars
+    rows = np.repeat(np.arange(n), lengths)
+    cols = np.arange(len(chars)) - np.repeat(starts - np.arange(n), lengths)
+
+    matrix = np.zeros((n, max(int(lengths.max()), 1)), dtype=np.uint8)
+    matrix[rows, cols] = chars
+    return matrix, lengths
+
+
+# Return N x CODE_COUNT bool matrix: presence[i, c] is True if word i contains letter code c
+def letter_presence(matrix):
+    n = matrix.shape[0]
+    presence = np.zeros((n, CODE_COUNT), dtype=bool)
+    for start in range(0, n, BATCH_SIZE):
+        batch = matrix[start:start + BATCH_SIZE]
+        presence[start + np.arange(batch.shape[0])[:, None], batch] = True
+    presence[:, 0] = False
+    return presence
+
+
+# Compute per-word feature arrays and the language letter frequencies for a word list
+def compute_features(words):
+    matrix, lengths = encode_words(words)
+    presence = letter_presence(matrix)
+    n = len(words)
+
+    # Share of words containing each letter a-z: the language's letter frequency
+    letter_freq = presence[:, 1:27].mean(axis=0) if n else np.zeros(26)
+    rarity_weights = (1.0 - letter_freq).astype(np.float32)
+
+    # Player guessing letters by decreasing frequency: rank of each code, unknown characters last
+    ranks = np.full(CODE_COUNT, -1, dtype=np.int8)
+    ranks[1 + np.argsort(-letter_freq, kind='stable')] = np.arange(26, dtype=np.int8)
+    ranks[OTHER_CODE] = 26
+
+    distinct = presence.sum(axis=1).astype(np.int32)
+    rarity = np.empty(n, dtype=np.float32)
+    last_rank = np.empty(n, dtype=np.int32)
+
+    for start in range(0, n, BATCH_SIZE):
+        batch = presence[start:start + BATCH_SIZE]
+        rarity[start:start + BATCH_SIZE] = batch[:, 1:27] @ rarity_weights
+        last_rank[start:start + BATCH_SIZE] = np.where(batch, ranks, -1).max(axis=1)
+
+    # Guesses needed to reveal every letter, minus the ones that hit
+    expected_wrong = np.maximum(last_rank + 1 - distinct, 0)
+
+    score = (WEIGHT_LENGTH * lengths + WEIGHT_DISTINCT * distinct
+             + WEIGHT_RARITY * rarity + WEIGHT_WRONG * expected_wrong)
+
+    return {
+        "length": lengths,
+        "distinct": distinct,
+        "rarity": rarity,
+        "expected_wrong": expected_wrong,
+        "score": score.astype(np.float32),
+        "letter_freq": letter_freq
+    }
+
+
+# Return int8 bucket per word (0 facile, 1 moyen, 2 difficile) split at score quantiles
+def classify_words(words, proportions=(1 / 3, 1 / 3)):
+    if not words:
+        return np.zeros(0, dtype=np.int8)
+
+    score = compute_features(words)["score"]
+    cuts = np.quantile(score, [proportions[0], proportions[0] + proportions[1]])
+    return np.digitize(score, cuts, right=True).astype(np.int8)
+
+
+# Return new words_data with every word (deduplicated) placed in its classified section
+def rebucket_words(words_data, proportions=(1 / 3, 1 / 3)):
+    all_words = []
+    for section in words_data:
+        all_words.extend(words_data[section])
+    all_words = list(dict.fromkeys(all_words))
+
+    buckets = classify_words(all_words, proportions)
+    word_array = np.array(all_words, dtype=object)
+
+    result = {}
+    for i in range(len(DIFFICULTIES)):
+        result[DIFFICULTIES[i]] = word_array[buckets == i].tolist()
+    return result
+
+
+# Re-bucket a TXT word file (journal included) and rewrite it, returns {difficulty: count} or None
+def rebucket_words_file(txt_path, proportions=(1 / 3, 1 / 3), dry_run=False):
+    words_data = word_manager.load_words_with_journal(txt_path)
+    if not words_data:
+        return None
+
+    new_data = rebucket_words(words_data, proportions)
+    if not dry_run and not word_manager.save_words_file(txt_path, new_data):
+        return None
+
+    counts = {}
+    for section in new_data:
+        counts[section] = len(new_data[section])
+    return counts
+
+
+# Re-bucket a language dictionary; the compiled binary is rebuilt on next load since the TXT changed
+def rebucket_language(language, proportions=(1 / 3, 1 / 3), dry_run=False):
+    txt_path = word_manager.get_words_file(language)
+    if txt_path is None:
+        print(f"Error: Unsupported language '{language}'")
+        return None
+
+    counts = rebucket_words_file(txt_path, proportions, dry_run)
+    if counts is not None and not dry_run:
+        word_manager.invalidate_words_cache(language)
+    return counts
+
+
+# Command line entry point: python -m utils.difficulty_classifier <language>
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-bucket a dictionary into difficulty sections")
+    parser.add_argument("language", choices=['fr', 'en'])
+    parser.add_argument("--easy", type=float, default=1 / 3, help="share of words in facile")
+    parser.add_argument("--medium", type=float, default=1 / 3, help="share of words in moyen")
+    parser.add_argument("--dry-run", action="store_true", help="print counts without rewriting the file")
+    args = parser.parse_args(argv)
+
+    counts = rebucket_language(args.language, (args.easy, args.medium), args.dry_run)
+    if counts is None:
+        return 1
+
+    for section in counts:
+        print(f"{section}: {counts[section]}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
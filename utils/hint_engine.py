@@ -0,0 +1,123 @@
+# Hint engine: rank unplayed letters by expected information gain over the dictionary candidates
+
+import math
+import random
+import string
+
+from utils import word_manager
+from utils import letter_folding
+
+# Below this many candidates, split on exact letter positions instead of present/absent only
+EXACT_PARTITION_LIMIT = 128
+
+ALPHABET = string.ascii_uppercase
+
+
+# Return the masked pattern ("_A__E") and the letters known to be absent for a game state
+def get_constraints(game_state):
+    secret = letter_folding.fold_word(game_state["secret_word"])
+    played = set(letter.upper() for letter in game_state["letters_played"])
+
+    pattern = "".join(c if c in played else "_" for c in secret)
+    absent = "".join(sorted(letter for letter in played if letter not in secret))
+    return pattern, absent
+
+
+# Return bitset of dictionary words still consistent with what the player has seen
+def get_candidates(game_state, index):
+    pattern, absent = get_constraints(game_state)
+    return word_manager.query_letter_index(index, pattern=pattern, absent=absent)
+
+
+# Shannon entropy (bits) of a partition given its group sizes
+def _entropy(group_sizes, total):
+    result = 0.0
+    for size in group_sizes:
+        if size:
+            p = size / total
+            result -= p * math.log2(p)
+    return result
+
+
+# Expected gain per letter from the present/absent split, using one AND + popcount per letter
+def _presence_gains(index, candidates, total, letters):
+    gains = {}
+    for letter in letters:
+        hits = word_manager.count_bits(candidates & index["letter"].get(letter, 0))
+        gains[letter] = _entropy((hits, total - hits), total)
+    return gains
+
+
+# Expected gain per letter from the exact split on revealed positions (small candidate sets)
+#   the candidate words are listed once for all letters; positions are keyed as an int bitmask, not a tuple
+def _partition_gains(index, candidates, total, letters):
+    groups = {}
+    for letter in letters:
+        groups[letter] = {}
+
+    for word in word_manager.bitset_to_words(index, candidates):
+        positions = {}
+        bit = 1
+        for c in word:
+            positions[c] = positions.get(c, 0) | bit
+            bit <<= 1
+        for letter, key in positions.items():
+            group = groups.get(letter)
+            if group is not None:
+                group[key] = group.get(key, 0) + 1
+
+    gains = {}
+    for letter in letters:
+        sizes = list(groups[letter].values())
+        sizes.append(total - sum(sizes))
+        gains[letter] = _entropy(sizes, total)
+    return gains
+
+
+# Return [(letter, gain in bits)] for unplayed letters, best first (ties alphabetical)
+def rank_letters(game_state, index):
+    played = set(letter.upper() for letter in game_state["letters_played"])
+    letters = [c for c in ALPHABET if c not in played]
+    if index is None or not letters:
+        return [(letter, 0.0) for letter in letters]
+
+    return rank_candidate_letters(index, get_candidates(game_state, index), letters)
+
+
+# Return [(letter, gain in bits)] for the given letters over a candidate bitset, best first
+def rank_candidate_letters(index, candidates, letters):
+    total = word_manager.count_bits(candidates)
+    if total == 0:
+        return [(letter, 0.0) for letter in letters]
+
+    if total <= EXACT_PARTITION_LIMIT:
+        gains = _partition_gains(index, candidates, total, letters)
+    else:
+        gains = _presence_gains(index, candidates, total, letters)
+
+    return sorted(((letter, gains[letter]) for letter in letters), key=lambda item: (-item[1], item[0]))
+
+
+# Pick the unplayed letter of the secret with the highest gain, None if all are revealed
+#   rng (random.Random, None = global random) breaks the tie when no letter has any gain
+def best_real_hint(game_state, index, rng=None):
+    return _best_hint(game_state, index, True, rng)
+
+
+# Pick the unplayed letter NOT in the secret with the highest gain, None if none left
+def best_fake_hint(game_state, index, rng=None):
+    return _best_hint(game_state, index, False, rng)
+
+
+# Best ranked letter whose membership in the secret equals in_secret (random when nothing to rank)
+def _best_hint(game_state, index, in_secret, rng=None):
+    secret = letter_folding.fold_word(game_state["secret_word"])
+    ranking = rank_letters(game_state, index)
+    allowed = [letter for letter, gain in ranking if (letter in secret) == in_secret]
+    if not allowed:
+        return None
+
+    for letter, gain in ranking:
+        if letter in allowed and gain > 0:
+            return letter
+    return (rng or random).choice(allowed)
@@ -0,0 +1,56 @@
+# Letter folding: map accented letters to their base A-Z letter with tables built once at import
+
+import unicodedata
+
+# Latin-1 Supplement + Latin Extended-A: French, Spanish, German, Portuguese... accented letters
+# Ligatures (Œ, Æ) fold to two letters and are left as-is, they cannot map to one position
+_FOLD_RANGE = range(0x00C0, 0x0180)
+
+# Uppercase accented letter -> uppercase base letter ("É" -> "E"), filled by _build_tables
+FOLD_TABLE = {}
+
+# str.translate table folding both cases to uppercase base letters, filled by _build_tables
+_TRANSLATION = {}
+
+
+# Fill FOLD_TABLE and _TRANSLATION from unicodedata once, so games never call unicodedata per key
+def _build_tables():
+    for code in _FOLD_RANGE:
+        char = chr(code)
+        base = unicodedata.normalize('NFKD', char)[:1].upper()
+        if len(base) == 1 and 'A' <= base <= 'Z' and base != char.upper():
+            FOLD_TABLE[char.upper()] = base
+            _TRANSLATION[code] = base
+
+    for letter in "abcdefghijklmnopqrstuvwxyz":
+        _TRANSLATION[ord(letter)] = letter.upper()
+
+
+_build_tables()
+
+
+# Return the uppercase base letter of one character ("é" -> "E"), other characters uppercased
+def fold_letter(letter):
+    letter = letter.upper()
+    return FOLD_TABLE.get(letter, letter)
+
+
+# Return the word uppercased with every accented letter folded ("Fenêtre" -> "FENETRE")
+def fold_word(word):
+    return word.translate(_TRANSLATION).upper()
+
+
+# True if a folded character is one of the 26 playable letters (not a hyphen, apostrophe or ligature)
+def is_base_letter(letter):
+    return len(letter) == 1 and 'A' <= letter <= 'Z'
+
+
+# Return {base letter: [positions]} of a word, so one key press reveals every accented variant
+#   characters that cannot be played ("-", "'", "Œ") have no entry
+def letter_positions(word):
+    positions = {}
+    folded = fold_word(word)
+    for i in range(len(folded)):
+        if is_base_letter(folded[i]):
+            positions.setdefault(folded[i], []).append(i)
+    return positions
@@ -0,0 +1,126 @@
+# Score history: every recorded score in SQLite, with rank, percentile and per-player best queries
+
+import os
+import sqlite3
+import threading
+
+# scores is append-only; score_counts holds one row per (category, score) kept by a trigger, so rank and
+# percentile sum over distinct scores (a few hundred) instead of counting millions of rows
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    category TEXT NOT NULL,
+    name TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    timestamp REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scores_by_player ON scores (category, name, score);
+CREATE TABLE IF NOT EXISTS score_counts (
+    category TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (category, score)
+) WITHOUT ROWID;
+CREATE TRIGGER IF NOT EXISTS count_score AFTER INSERT ON scores BEGIN
+    INSERT INTO score_counts (category, score, count) VALUES (NEW.category, NEW.score, 1)
+    ON CONFLICT (category, score) DO UPDATE SET count = count + 1;
+END;
+"""
+
+# Open connections keyed by database path: {"pid", "connection"}
+_connections = {}
+
+# One connection is shared by the threads of a process (the game server writes from executor threads)
+_history_lock = threading.Lock()
+
+
+# Return the connection of a history database, created with its schema on first use, None on error
+#   a forked child never reuses its parent's connection
+def open_history(db_path):
+    entry = _connections.get(db_path)
+    if entry and entry["pid"] == os.getpid():
+        return entry["connection"]
+
+    try:
+        connection = sqlite3.connect(db_path, check_same_thread=False)
+        # WAL lets readers in other processes query while a writer appends
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(_SCHEMA)
+    except sqlite3.Error as e:
+        print(f"Error opening score history {db_path}: {e}")
+        return None
+
+    _connections[db_path] = {"pid": os.getpid(), "connection": connection}
+    return connection
+
+
+# Close every connection opened by this process
+def close_all_histories():
+    for db_path in list(_connections):
+        entry = _connections.pop(db_path)
+        if entry["pid"] == os.getpid():
+            entry["connection"].close()
+
+
+# Append one score to the history, returns success bool
+def add_score(db_path, name, score, category, timestamp):
+    connection = open_history(db_path)
+    if connection is None:
+        return False
+
+    try:
+        with _history_lock, connection:
+            connection.execute("INSERT INTO scores (category, name, score, timestamp) VALUES (?, ?, ?, ?)",
+                               (category, name, score, timestamp))
+        return True
+    except sqlite3.Error as e:
+        print(f"Error recording score: {e}")
+        return False
+
+
+# Run a query returning one value, default if the history is missing or the value is NULL
+def _query_value(db_path, sql, params, default=0):
+    connection = open_history(db_path)
+    if connection is None:
+        return default
+
+    try:
+        with _history_lock:
+            row = connection.execute(sql, params).fetchone()
+    except sqlite3.Error as e:
+        print(f"Error querying score history: {e}")
+        return default
+    if row is None or row[0] is None:
+        return default
+    return row[0]
+
+
+# Return how many scores a category has recorded
+def get_score_count(db_path, category):
+    return _query_value(db_path, "SELECT SUM(count) FROM score_counts WHERE category = ?", (category,))
+
+
+# Return the rank a score has (or would have) in its category: 1 + number of strictly better scores
+def get_rank(db_path, score, category):
+    return 1 + _query_value(db_path, "SELECT SUM(count) FROM score_counts WHERE category = ? AND score > ?",
+                            (category, score))
+
+
+# Return the percentile rank (0-100) of a score: share of scores below it, ties counting half
+def get_percentile(db_path, score, category):
+    total = get_score_count(db_path, category)
+    if total == 0:
+        return 100.0
+
+    below = _query_value(db_path, "SELECT SUM(count) FROM score_counts WHERE category = ? AND score < ?",
+                         (category, score))
+    equal = _query_value(db_path, "SELECT count FROM score_counts WHERE category = ? AND score = ?",
+                         (category, score))
+    return 100.0 * (below + equal / 2) / total
+
+
+# Return a player's best score in a category, None if they have none
+def get_player_best(db_path, name, category):
+    return _query_value(db_path, "SELECT MAX(score) FROM scores WHERE category = ? AND name = ?",
+                        (category, name), None)
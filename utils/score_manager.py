@@ -1,15 +1,53 @@
 # Highscore management with TXT file persistence
 
 import os
+import time
+import bisect
+import threading
+import contextlib
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:
+    # No fcntl on Windows: only the in-process thread lock applies there
+    fcntl = None
+
+from utils import letter_folding
+from utils import score_history
 
 # Path to highscores file (from utils/ go up one level then into data/)
 SCORE_FILE = os.path.join(os.path.dirname(__file__), '..', 'data', 'highscores.txt')
 
+# Scores shown per category
+TOP_SCORES = 10
+
+# Scores kept per category; can be raised far beyond TOP_SCORES, inserts stay O(log n) searches
+LEADERBOARD_DEPTH = TOP_SCORES
+
+# Characters of a player name kept on the leaderboard (the UI name prompt stops at 5 letters)
+MAX_NAME_LENGTH = 5
+
+# Set bits of every byte value, for popcounts on NumPy versions without np.bitwise_count
+_BYTE_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.int64)
+
+# Journal of saved scores, merged into the TXT file when it grows past this size (bytes)
+SCORE_JOURNAL_COMPACT_SIZE = 64 * 1024
+
+# Process-wide leaderboard: {"path", "signature", "scores", "journal_offset"}, parsed once and kept current
+#   scores = {category: [(-score, timestamp, name)]} in ascending order, i.e. best score first and,
+#   on equal scores, the earlier one first; journal_offset = journal bytes already applied
+_scores_cache = {"path": None, "signature": None, "scores": {}, "journal_offset": 0}
+
+# Serializes save_score and cache refreshes between threads (the game server uses executor threads)
+_scores_lock = threading.Lock()
+
 
 # Compute score: +20 per correct, -10 per wrong, -20 per hint, +2 per second remaining
 def calculate_score(state, time_remaining=0, hints_used=0):
     played = state.get("letters_played", [])
-    secret = state.get("secret_word", "").lower()
+    secret = letter_folding.fold_word(state.get("secret_word", "")).lower()
 
     correct_count = 0
     wrong_count = 0
@@ -29,54 +67,305 @@ def calculate_score(state, time_remaining=0, hints_used=0):
     return score
 
 
-# Return True if score qualifies for top 10 in specified category
+# Return the number of set bits of each uint32 mask as an int64 array
+def _popcount(masks):
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(masks).astype(np.int64)
+    counts = _BYTE_POPCOUNT[masks.reshape(-1).view(np.uint8)].reshape(-1, 4).sum(axis=1)
+    return counts.reshape(masks.shape)
+
+
+# Vectorized calculate_score over N games, returns an int64 array with the same score per game
+#   masks hold one bit per letter A-Z (game_engine.letters_to_mask / get_letter_masks, batch_engine arrays);
+#   time_remaining and hints_used are arrays of N values or one value for every game
+def calculate_scores(played_masks, secret_masks, time_remaining=0, hints_used=0):
+    played = np.ascontiguousarray(played_masks, dtype=np.uint32)
+    secret = np.ascontiguousarray(secret_masks, dtype=np.uint32)
+
+    correct_count = _popcount(played & secret)
+    wrong_count = _popcount(played & ~secret)
+
+    base_score = (20 * correct_count) - (10 * wrong_count)
+    hint_penalty = 20 * np.asarray(hints_used, dtype=np.int64)
+    # int() in calculate_score truncates toward zero
+    time_bonus = np.trunc(np.asarray(time_remaining, dtype=np.float64) * 2).astype(np.int64)
+
+    return np.maximum(base_score - hint_penalty + time_bonus, 0)
+
+
+# True if name follows the UI name prompt's rule: 1 to MAX_NAME_LENGTH letters
+def is_valid_name(name):
+    return isinstance(name, str) and 0 < len(name) <= MAX_NAME_LENGTH and name.isalpha()
+
+
+# True if the stored part of a name can be read back from the score files: letters and digits only, so it
+# never holds the "=", "@", "[" or newline that separate entries
+def _is_storable_name(name):
+    return isinstance(name, str) and name[:MAX_NAME_LENGTH].isalnum()
+
+
+# Return True if score qualifies for the leaderboard of the specified category
 def check_if_highscore(score, category="normal"):
     if score <= 0:
         return False
 
-    all_scores = _load_scores()
-
-    if category not in all_scores:
+    entries = _get_leaderboard().get(category)
+    if entries is None or len(entries) < LEADERBOARD_DEPTH:
         return True
 
-    category_scores = all_scores.get(category, [])
+    # A new score is the latest one, so it loses a tie with the lowest kept score
+    return -score < entries[LEADERBOARD_DEPTH - 1][0]
+
+
+# Record score in the history and insert it into its category in O(log n) + shift if it ranks within
+# LEADERBOARD_DEPTH, appending it to the journal; returns True if it entered the leaderboard
+#   timestamp (seconds, default now) breaks ties: the earlier score ranks first
+def save_score(name, score, category="normal", timestamp=None):
+    if not _is_storable_name(name):
+        print(f"Error: Invalid player name {name!r}")
+        return False
+
+    if timestamp is None:
+        timestamp = time.time()
+    record_score(score, category, name, timestamp)
+
+    with _scores_lock:
+        return _save_score_locked(name, score, category, timestamp)
+
+
+# save_score body: under the file lock, catch up with other writers, insert and append one journal line
+def _save_score_locked(name, score, category, timestamp):
+    key = (-score, timestamp, name[:MAX_NAME_LENGTH].upper())
+
+    with _lock_score_files(exclusive=True):
+        all_scores = _refresh_leaderboard()
+        if not _insert_score(all_scores, category, key):
+            return False
+
+        journal_path = get_score_journal_file()
+        try:
+            with open(journal_path, 'a', encoding='utf-8') as f:
+                f.write(category + '=' + _format_score_entry(key) + '\n')
+        except OSError as e:
+            print(f"Error saving score: {e}")
+            # The files keep their old content: reload them rather than serve an unsaved score
+            invalidate_scores_cache()
+            return False
 
-    if len(category_scores) < 10:
+        _mark_scores_current()
+        if _scores_cache["signature"][1] >= SCORE_JOURNAL_COMPACT_SIZE:
+            _compact_locked(all_scores)
         return True
 
-    lowest_score = category_scores[-1]["score"]
-    return score > lowest_score
+
+# Merge the journal into highscores.txt (atomic rewrite) and empty it, returns success bool
+def compact_scores():
+    with _scores_lock, _lock_score_files(exclusive=True):
+        return _compact_locked(_refresh_leaderboard())
+
+
+# compact_scores body, called with the exclusive file lock held
+def _compact_locked(all_scores):
+    if not _save_scores(all_scores):
+        return False
+
+    # A crash before this line leaves journal lines already in the TXT: _insert_score skips them
+    try:
+        os.remove(get_score_journal_file())
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"Error removing score journal: {e}")
+    _mark_scores_current()
+    return True
+
+
+# Return the score history database path, beside the highscores file
+def get_history_file():
+    return os.path.join(os.path.dirname(SCORE_FILE), 'score_history.db')
+
+
+# Add a score to the history only (games whose score does not make the leaderboard), returns success bool
+def record_score(score, category="normal", name="", timestamp=None):
+    if timestamp is None:
+        timestamp = time.time()
+    return score_history.add_score(get_history_file(), name[:5].upper(), score, category, timestamp)
 
 
-# Insert score into category, sort descending, keep top 10, persist to TXT
-def save_score(name, score, category="normal"):
-    all_scores = _load_scores()
+# Return the rank of a score among every recorded score of its category (1 = best)
+def get_rank(score, category="normal"):
+    return score_history.get_rank(get_history_file(), score, category)
 
-    if category not in all_scores:
-        all_scores[category] = []
 
-    clean_name = name[:5].upper()
-    all_scores[category].append({"name": clean_name, "score": score})
+# Return the percentile rank (0-100) of a score among every recorded score of its category
+def get_percentile(score, category="normal"):
+    return score_history.get_percentile(get_history_file(), score, category)
 
-    # Sort by score descending and keep top 10
-    sorted_scores = []
-    for entry in all_scores[category]:
-        sorted_scores.append(entry)
 
-    # Simple bubble sort (beginner-friendly)
-    for i in range(len(sorted_scores)):
-        for j in range(len(sorted_scores) - 1):
-            if sorted_scores[j]["score"] < sorted_scores[j + 1]["score"]:
-                temp = sorted_scores[j]
-                sorted_scores[j] = sorted_scores[j + 1]
-                sorted_scores[j + 1] = temp
+# Return a player's best recorded score in a category, None if they have none
+def get_player_best(name, category="normal"):
+    return score_history.get_player_best(get_history_file(), name[:5].upper(), category)
 
-    all_scores[category] = sorted_scores[:10]
 
-    _save_scores(all_scores)
+# Return every category's top scores as {category: [{"name", "score"}]}, best first
+def get_all_scores(n=TOP_SCORES):
+    all_scores = _get_leaderboard()
+    return {category: get_top_scores(category, n) for category in list(all_scores)}
 
 
-# Parse highscores.txt into dict with category keys and score entry lists
+# Return the best n scores of a category as [{"name", "score"}]
+def get_top_scores(category="normal", n=TOP_SCORES):
+    top = []
+    for neg_score, timestamp, name in _get_leaderboard().get(category, [])[:n]:
+        top.append({"name": name, "score": -neg_score})
+    return top
+
+
+# Return the journal path of saved scores (category=NAME=score@timestamp lines, in save order)
+def get_score_journal_file():
+    return os.path.splitext(SCORE_FILE)[0] + '.journal'
+
+
+# Return the lock file path guarding highscores.txt and its journal across processes
+def get_score_lock_file():
+    return os.path.splitext(SCORE_FILE)[0] + '.lock'
+
+
+# Hold an fcntl lock on the scores lock file: shared to read the files, exclusive to change them
+@contextlib.contextmanager
+def _lock_score_files(exclusive):
+    if fcntl is None:
+        yield
+        return
+
+    try:
+        lock_file = open(get_score_lock_file(), 'a')
+    except OSError as e:
+        print(f"Error locking scores: {e}")
+        yield
+        return
+
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        yield
+    finally:
+        lock_file.close()
+
+
+# Return ((TXT mtime_ns, TXT size) or None, journal size) identifying the current score files
+def _get_scores_signature():
+    try:
+        file_stat = os.stat(SCORE_FILE)
+        file_signature = (file_stat.st_mtime_ns, file_stat.st_size)
+    except OSError:
+        file_signature = None
+
+    try:
+        journal_size = os.stat(get_score_journal_file()).st_size
+    except OSError:
+        journal_size = 0
+
+    return (file_signature, journal_size)
+
+
+# Return the cached leaderboard, catching up only if SCORE_FILE moved or another process changed the files
+def _get_leaderboard():
+    if _scores_cache["path"] == SCORE_FILE and _scores_cache["signature"] == _get_scores_signature():
+        return _scores_cache["scores"]
+
+    with _scores_lock, _lock_score_files(exclusive=False):
+        return _refresh_leaderboard()
+
+
+# Bring the cache up to date with the files, called with the file lock held
+#   when only the journal grew, just its new lines are applied
+def _refresh_leaderboard():
+    signature = _get_scores_signature()
+    cache = _scores_cache
+    if cache["path"] == SCORE_FILE and cache["signature"] == signature:
+        return cache["scores"]
+
+    if cache["path"] != SCORE_FILE or cache["signature"] is None or cache["signature"][0] != signature[0] \
+            or signature[1] < cache["journal_offset"]:
+        cache["scores"] = _load_scores()
+        cache["journal_offset"] = 0
+
+    cache["journal_offset"] = _apply_score_journal(cache["scores"], cache["journal_offset"])
+    cache["path"] = SCORE_FILE
+    cache["signature"] = _get_scores_signature()
+    return cache["scores"]
+
+
+# Record the files as matching the cache after this process changed them (file lock held)
+def _mark_scores_current():
+    _scores_cache["signature"] = _get_scores_signature()
+    _scores_cache["journal_offset"] = _scores_cache["signature"][1]
+
+
+# Apply journal lines from byte offset into all_scores, returns the offset reached
+def _apply_score_journal(all_scores, offset):
+    try:
+        with open(get_score_journal_file(), 'rb') as f:
+            f.seek(offset)
+            data = f.read()
+    except FileNotFoundError:
+        return 0
+    except OSError as e:
+        print(f"Error loading score journal: {e}")
+        return offset
+
+    for line in data.decode('utf-8', errors='replace').splitlines():
+        category, _, entry = line.strip().partition('=')
+        key = _parse_score_entry(entry, 0.0)
+        if category and key is not None:
+            _insert_score(all_scores, category, key)
+    return offset + len(data)
+
+
+# Insert a (-score, timestamp, name) key into its category if it ranks within LEADERBOARD_DEPTH,
+# returns True if inserted (an exact duplicate, replayed from the journal, is skipped)
+def _insert_score(all_scores, category, key):
+    entries = all_scores.setdefault(category, [])
+    position = bisect.bisect_right(entries, key)
+    if position >= LEADERBOARD_DEPTH or (position > 0 and entries[position - 1] == key):
+        return False
+
+    entries.insert(position, key)
+    del entries[LEADERBOARD_DEPTH:]
+    return True
+
+
+# Parse a NAME=score@timestamp entry into a (-score, timestamp, name) key, None if malformed
+#   entries written before timestamps (NAME=score) get fallback_timestamp
+def _parse_score_entry(entry, fallback_timestamp):
+    pos = entry.find('=')
+    if pos < 0:
+        return None
+
+    score_str, _, timestamp_str = entry[pos + 1:].partition('@')
+    try:
+        timestamp = float(timestamp_str) if timestamp_str else fallback_timestamp
+        return (-int(score_str), timestamp, entry[:pos])
+    except ValueError:
+        return None
+
+
+# Return the NAME=score@timestamp text of a key
+def _format_score_entry(key):
+    neg_score, timestamp, name = key
+    return name + '=' + str(-neg_score) + '@' + repr(timestamp)
+
+
+# Drop the cached leaderboard so the next call parses the files again
+def invalidate_scores_cache():
+    _scores_cache["path"] = None
+    _scores_cache["signature"] = None
+    _scores_cache["scores"] = {}
+    _scores_cache["journal_offset"] = 0
+
+
+# Parse highscores.txt into {category: [(-score, timestamp, name)]} sorted best first
+#   lines are NAME=score@timestamp; older NAME=score lines use their line number as timestamp
 def _load_scores():
     if not os.path.exists(SCORE_FILE):
         return {}
@@ -101,41 +390,43 @@ def _load_scores():
                 all_scores[current_category] = []
                 continue
 
-            # Parse name=score pairs
-            if current_category and '=' in line:
-                pos = line.find('=')
-                name = line[:pos]
-                score_str = line[pos + 1:]
-                try:
-                    score_val = int(score_str)
-                    all_scores[current_category].append({"name": name, "score": score_val})
-                except:
-                    pass
+            # Parse name=score@timestamp entries
+            if current_category:
+                key = _parse_score_entry(line, float(len(all_scores[current_category])))
+                if key is not None:
+                    all_scores[current_category].append(key)
 
     except Exception as e:
         print(f"Error loading scores: {e}")
         return {}
 
+    for category in all_scores:
+        all_scores[category].sort()
     return all_scores
 
 
-# Write all scores dict to highscores.txt with [category] sections
+# Write all scores dict to highscores.txt with [category] sections, returns success bool
+#   written to a temp file then renamed, so readers never see a half-written file
 def _save_scores(all_scores):
+    temp_path = SCORE_FILE + '.tmp'
     try:
-        file = open(SCORE_FILE, 'w', encoding='utf-8')
+        file = open(temp_path, 'w', encoding='utf-8')
 
         categories = list(all_scores.keys())
         for i in range(len(categories)):
             category = categories[i]
             file.write('[' + category + ']\n')
 
-            for entry in all_scores[category]:
-                file.write(entry["name"] + '=' + str(entry["score"]) + '\n')
+            for key in all_scores[category]:
+                file.write(_format_score_entry(key) + '\n')
 
             # Add blank line between categories (except last)
             if i < len(categories) - 1:
                 file.write('\n')
 
         file.close()
+        os.replace(temp_path, SCORE_FILE)
+        return True
     except Exception as e:
-        print(f"Error saving scores: {e}")
\ No newline at end of file
+        print(f"Error saving scores: {e}")
+        return False
\ No newline at end of file
@@ -0,0 +1,180 @@
+# Bulk word import: stream a word list, normalize/classify in worker processes, write once
+
+import os
+import sys
+import argparse
+import unicodedata
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from utils import word_manager
+
+# Lines sent to a worker per task
+DEFAULT_CHUNK_SIZE = 10000
+
+# Ligatures that NFKD does not decompose
+LIGATURES = {'œ': 'oe', 'æ': 'ae', 'ß': 'ss'}
+
+
+# Lowercase word, fold accents and ligatures, return "" if not purely alphabetic ASCII
+def normalize_word(word):
+    word = word.strip().lower()
+    for ligature in LIGATURES:
+        if ligature in word:
+            word = word.replace(ligature, LIGATURES[ligature])
+
+    decomposed = unicodedata.normalize('NFKD', word)
+    folded = "".join(c for c in decomposed if not unicodedata.combining(c))
+
+    if not folded or not folded.isascii() or not folded.isalpha():
+        return ""
+    return folded
+
+
+# Pick difficulty from word length: <=5 facile, 6-8 moyen, 9+ difficile
+def classify_word(word):
+    if len(word) <= 5:
+        return 'facile'
+    if len(word) <= 8:
+        return 'moyen'
+    return 'difficile'
+
+
+# Worker task: normalize and classify a chunk of raw lines, returns (pairs, invalid count)
+def process_chunk(lines, difficulty=None):
+    pairs = []
+    invalid = 0
+
+    for line in lines:
+        if not line.strip():
+            continue
+
+        word = normalize_word(line)
+        if not word:
+            invalid += 1
+            continue
+
+        pairs.append((word, difficulty or classify_word(word)))
+
+    return pairs, invalid
+
+
+# Yield lists of up to chunk_size lines from the source file without reading it whole
+def read_chunks(source_path, chunk_size):
+    chunk = []
+    with open(source_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            chunk.append(line)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+# Yield processed chunks in order, keeping at most 2 tasks per worker in flight
+def _process_chunks(source_path, difficulty, workers, chunk_size):
+    if workers == 1:
+        for chunk in read_chunks(source_path, chunk_size):
+            yield process_chunk(chunk, difficulty)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in read_chunks(source_path, chunk_size):
+            pending.append(executor.submit(process_chunk, chunk, difficulty))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+
+# Import every new valid word from source_path into a TXT word file, returns stats dict or None
+def import_words_file(txt_path, source_path, difficulty=None, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    if difficulty is not None and difficulty.lower() not in ['facile', 'moyen', 'difficile']:
+        print(f"Error: Invalid difficulty '{difficulty}'. Must be 'facile', 'moyen', or 'difficile'")
+        return None
+    if difficulty is not None:
+        difficulty = difficulty.lower()
+
+    if not os.path.exists(source_path):
+        print(f"Error: Import file not found at {source_path}")
+        return None
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    words_data = word_manager.load_words_with_journal(txt_path)
+
+    # One set across all sections: an imported word must not exist in any difficulty
+    seen = set()
+    known_words = word_manager.get_known_words(txt_path)
+    for section in known_words:
+        seen.update(known_words[section])
+
+    stats = {"read": 0, "invalid": 0, "duplicates": 0, "added": {}}
+
+    try:
+        for pairs, invalid in _process_chunks(source_path, difficulty, workers, chunk_size):
+            stats["invalid"] += invalid
+            stats["read"] += len(pairs) + invalid
+
+            for word, word_difficulty in pairs:
+                if word in seen:
+                    stats["duplicates"] += 1
+                    continue
+
+                seen.add(word)
+                if word_difficulty not in words_data:
+                    words_data[word_difficulty] = []
+                words_data[word_difficulty].append(word)
+                stats["added"][word_difficulty] = stats["added"].get(word_difficulty, 0) + 1
+    except Exception as e:
+        print(f"Error importing words from {source_path}: {e}")
+        return None
+
+    if stats["added"] and not word_manager.save_words_file(txt_path, words_data):
+        return None
+
+    return stats
+
+
+# Import a word list into the language dictionary and refresh cached data, returns stats dict or None
+def import_words(language, source_path, difficulty=None, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    txt_path = word_manager.get_words_file(language)
+    if txt_path is None:
+        print(f"Error: Unsupported language '{language}'")
+        return None
+
+    stats = import_words_file(txt_path, source_path, difficulty, workers, chunk_size)
+    if stats is not None:
+        word_manager.invalidate_words_cache(language)
+    return stats
+
+
+# Command line entry point: python -m utils.word_importer <language> <file>
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import a word list (one word per line) into a dictionary")
+    parser.add_argument("language", choices=['fr', 'en'])
+    parser.add_argument("source", help="word list file, UTF-8, one word per line")
+    parser.add_argument("--difficulty", choices=['facile', 'moyen', 'difficile'],
+                        help="force all words into this section instead of classifying them")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    stats = import_words(args.language, args.source, args.difficulty, args.workers, args.chunk_size)
+    if stats is None:
+        return 1
+
+    added_total = sum(stats["added"].values())
+    print(f"Read {stats['read']} words: {added_total} added, "
+          f"{stats['duplicates']} duplicates, {stats['invalid']} invalid")
+    for section in stats["added"]:
+        print(f"  {section}: {stats['added'][section]}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,10 +2,62 @@
 
 import random
 import os
+import re
+import mmap
+import struct
+import sys
+from array import array
+
+from utils import letter_folding
 
 # Path to data/ folder (from utils/ go up one level with '..' then into 'data')
 DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
 
+# Process-wide cache: language -> {"signature", "words"}, plus hit/miss counters
+_words_cache = {}
+_cache_stats = {"hits": 0, "misses": 0}
+
+# Journal of appended words per TXT file, merged into the TXT when it grows past this size (bytes)
+JOURNAL_COMPACT_SIZE = 64 * 1024
+
+# Normalized duplicate index: absolute TXT path -> {"signature", "words": {difficulty: set}}
+_duplicate_index = {}
+
+# Compiled dictionary format (little-endian):
+#   header  = magic, version, section count, source TXT mtime_ns, source TXT size, journal size
+#   section = difficulty name (16 bytes, NUL padded), word count, offset table position
+#   offset table per section = word count + 1 absolute uint32 positions into the UTF-8 blob
+COMPILED_MAGIC = b'PNDU'
+COMPILED_VERSION = 2
+_HEADER_FORMAT = '<4sIIqqq'
+_SECTION_FORMAT = '<16sIQ'
+_HEADER_SIZE = struct.calcsize(_HEADER_FORMAT)
+_SECTION_SIZE = struct.calcsize(_SECTION_FORMAT)
+
+# Open memory-mapped compiled dictionaries keyed by language
+_compiled_cache = {}
+
+# Source signature whose compile failed, keyed by language (data/ not writable...): not retried until the TXT changes
+_compile_failures = {}
+
+# Word bag file format (little-endian): magic, version, word count, cursor, then word count uint32 indexes
+BAG_MAGIC = b'PBAG'
+BAG_VERSION = 1
+_BAG_HEADER_FORMAT = '<4sIII'
+_BAG_HEADER_SIZE = struct.calcsize(_BAG_HEADER_FORMAT)
+
+# Process-wide word bags keyed by (language, difficulty), used by get_unique_word
+_word_bags = {}
+
+# Non-zero bytes of a bitset, found by the regex engine in C instead of a Python loop over every byte
+_NONZERO_BYTE = re.compile(b'[^\x00]')
+
+# Alias tables for weighted selection: (language, difficulty) -> {"signature", "table"}
+_alias_cache = {}
+
+# Letter-position indexes: (language, difficulty or None) -> {"signature", "index"}
+_letter_index_cache = {}
+
 
 # Parse TXT file into dict with difficulty keys and word lists
 def load_words_from_txt(file_path):
@@ -35,73 +87,870 @@ def load_words_from_txt(file_path):
         return {}
 
 
-# Load word dictionary for specified language (fr or en)
-def load_words(language):
+# Return TXT file path for language (fr or en), or None if unsupported
+def get_words_file(language):
     if language == 'en':
-        file_path = os.path.join(DATA_DIR, 'words_en.txt')
+        return os.path.join(DATA_DIR, 'words_en.txt')
     elif language == 'fr':
-        file_path = os.path.join(DATA_DIR, 'words_fr.txt')
-    else:
+        return os.path.join(DATA_DIR, 'words_fr.txt')
+    return None
+
+
+# Return journal path holding words appended to a TXT word file
+def get_journal_file(txt_path):
+    return os.path.splitext(txt_path)[0] + '.journal'
+
+
+# Return (TXT mtime_ns, TXT size, journal size) identifying current word data, or None if TXT missing
+def get_source_signature(txt_path):
+    try:
+        txt_stat = os.stat(txt_path)
+    except OSError:
+        return None
+
+    try:
+        journal_size = os.stat(get_journal_file(txt_path)).st_size
+    except OSError:
+        journal_size = 0
+
+    return (txt_stat.st_mtime_ns, txt_stat.st_size, journal_size)
+
+
+# Merge "difficulty=word" journal lines into words_data, in append order
+def apply_journal(words_data, journal_path):
+    try:
+        with open(journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+
+                if not line or '=' not in line:
+                    continue
+
+                pos = line.find('=')
+                difficulty = line[:pos]
+                if difficulty not in words_data:
+                    words_data[difficulty] = []
+                words_data[difficulty].append(line[pos + 1:])
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"Error loading journal {journal_path}: {e}")
+
+    return words_data
+
+
+# Parse TXT word file and merge the words appended to its journal
+def load_words_with_journal(txt_path):
+    words_data = load_words_from_txt(txt_path)
+    return apply_journal(words_data, get_journal_file(txt_path))
+
+
+# Load word dictionary for specified language (fr or en), served from cache when the files are unchanged
+def load_words(language):
+    file_path = get_words_file(language)
+    if file_path is None:
         print(f"Error: Unsupported language '{language}'")
         return {}
 
-    return load_words_from_txt(file_path)
+    signature = get_source_signature(file_path)
+    if signature is None:
+        print(f"Error: Word file not found at {file_path}")
+        return {}
+
+    entry = _words_cache.get(language)
+    if entry and entry["signature"] == signature:
+        _cache_stats["hits"] += 1
+        return entry["words"]
+
+    _cache_stats["misses"] += 1
+    words_data = load_words_with_journal(file_path)
+    if words_data:
+        _words_cache[language] = {
+            "signature": signature,
+            "words": words_data
+        }
+    return words_data
+
+
+# Drop cached words and compiled maps for one language, or for all languages if None
+def invalidate_words_cache(language=None):
+    if language is None:
+        languages = list(_words_cache.keys()) + list(_compiled_cache.keys())
+    else:
+        languages = [language]
+
+    for lang in languages:
+        if lang in _words_cache:
+            del _words_cache[lang]
+        if lang in _compiled_cache:
+            close_compiled_words(_compiled_cache.pop(lang))
+        _compile_failures.pop(lang, None)
+
+
+# Return a copy of the cache hit/miss counters
+def get_cache_stats():
+    return {"hits": _cache_stats["hits"], "misses": _cache_stats["misses"]}
+
+
+# Reset cache hit/miss counters to zero
+def reset_cache_stats():
+    _cache_stats["hits"] = 0
+    _cache_stats["misses"] = 0
 
 
 # Select random uppercase word from specified difficulty level
-def get_random_word(words_data, difficulty):
+#   rng: a random.Random for reproducible draws (None = the global random module), same for every draw below
+def get_random_word(words_data, difficulty, rng=None):
     difficulty_key = difficulty.lower()
     if difficulty_key not in words_data or not words_data[difficulty_key]:
         return ""
 
-    word = random.choice(words_data[difficulty_key])
+    word = (rng or random).choice(words_data[difficulty_key])
     return word.upper()
 
 
-# Fetch random word for specified language and difficulty
-def get_word(language, difficulty):
+# Fetch random word for specified language and difficulty (compiled dictionary, TXT fallback)
+def get_word(language, difficulty, rng=None):
+    if get_words_file(language) is None:
+        print(f"Error: Unsupported language '{language}'")
+        return ""
+
+    compiled = load_compiled_words(language)
+    if compiled is not None:
+        return get_compiled_random_word(compiled, difficulty, rng)
+
     words_data = load_words(language)
     if not words_data:
         return ""
-    return get_random_word(words_data, difficulty)
+    return get_random_word(words_data, difficulty, rng)
+
+
+# Return compiled binary path for language (derived from the TXT file), or None if unsupported
+def get_compiled_file(language):
+    txt_path = get_words_file(language)
+    if txt_path is None:
+        return None
+    return os.path.splitext(txt_path)[0] + '.bin'
+
+
+# Compile TXT word file into the binary offset-table format, returns success bool
+def compile_words_file(txt_path, bin_path):
+    signature = get_source_signature(txt_path)
+    if signature is None:
+        print(f"Error: Word file not found at {txt_path}")
+        return False
+
+    words_data = load_words_with_journal(txt_path)
+    if not words_data:
+        return False
+
+    sections = list(words_data.keys())
+    table_position = _HEADER_SIZE + _SECTION_SIZE * len(sections)
+    blob_position = table_position
+    for section in sections:
+        blob_position += 4 * (len(words_data[section]) + 1)
+
+    section_entries = bytearray()
+    tables = bytearray()
+    blob = bytearray()
+
+    for section in sections:
+        words = words_data[section]
+        section_entries += struct.pack(_SECTION_FORMAT, section.encode('utf-8')[:16], len(words), table_position)
+        table_position += 4 * (len(words) + 1)
+
+        offsets = []
+        for w in words:
+            offsets.append(blob_position + len(blob))
+            blob += w.encode('utf-8')
+        offsets.append(blob_position + len(blob))
+        tables += struct.pack(f'<{len(offsets)}I', *offsets)
+
+    header = struct.pack(_HEADER_FORMAT, COMPILED_MAGIC, COMPILED_VERSION, len(sections), *signature)
+
+    # Write to a temp file then rename so readers never see a half-written dictionary
+    temp_path = bin_path + '.tmp'
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(header)
+            f.write(section_entries)
+            f.write(tables)
+            f.write(blob)
+        os.replace(temp_path, bin_path)
+        return True
+    except OSError as e:
+        print(f"Error writing compiled dictionary {bin_path}: {e}")
+        return False
+
+
+# Memory-map compiled dictionary and read its section table, returns dict or None
+def open_compiled_words(bin_path):
+    try:
+        f = open(bin_path, 'rb')
+    except OSError:
+        return None
+
+    try:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError) as e:
+        print(f"Error mapping compiled dictionary {bin_path}: {e}")
+        f.close()
+        return None
+
+    if len(mm) < _HEADER_SIZE:
+        mm.close()
+        f.close()
+        return None
+
+    magic, version, section_count, source_mtime, source_size, journal_size = struct.unpack_from(_HEADER_FORMAT, mm, 0)
+    if magic != COMPILED_MAGIC or version != COMPILED_VERSION:
+        mm.close()
+        f.close()
+        return None
+
+    sections = {}
+    for i in range(section_count):
+        name, count, table_pos = struct.unpack_from(_SECTION_FORMAT, mm, _HEADER_SIZE + i * _SECTION_SIZE)
+        sections[name.rstrip(b'\0').decode('utf-8')] = (count, table_pos)
+
+    return {
+        "file": f,
+        "mmap": mm,
+        "sections": sections,
+        "source_signature": (source_mtime, source_size, journal_size)
+    }
+
+
+# Release the memory map and file handle of a compiled dictionary
+def close_compiled_words(compiled):
+    compiled["mmap"].close()
+    compiled["file"].close()
+
+
+# Return compiled dictionary for language, rebuilding the binary when the TXT or journal changed
+def load_compiled_words(language):
+    txt_path = get_words_file(language)
+    if txt_path is None:
+        print(f"Error: Unsupported language '{language}'")
+        return None
+
+    signature = get_source_signature(txt_path)
+    if signature is None:
+        print(f"Error: Word file not found at {txt_path}")
+        return None
+
+    compiled = _compiled_cache.get(language)
+    if compiled and compiled["source_signature"] == signature:
+        return compiled
+
+    if compiled:
+        close_compiled_words(compiled)
+        del _compiled_cache[language]
+
+    # Compile already failed for this TXT: callers use the parsed word list without retrying every draw
+    if _compile_failures.get(language) == signature:
+        return None
+
+    bin_path = get_compiled_file(language)
+    compiled = open_compiled_words(bin_path)
+    if compiled is None or compiled["source_signature"] != signature:
+        if compiled:
+            close_compiled_words(compiled)
+        if not compile_words_file(txt_path, bin_path):
+            _compile_failures[language] = signature
+            return None
+        compiled = open_compiled_words(bin_path)
+        if compiled is None:
+            _compile_failures[language] = signature
+            return None
+
+    _compile_failures.pop(language, None)
+    _compiled_cache[language] = compiled
+    return compiled
+
+
+# Return number of words in a compiled difficulty section (0 if missing)
+def get_compiled_word_count(compiled, difficulty):
+    section = compiled["sections"].get(difficulty.lower())
+    if section is None:
+        return 0
+    return section[0]
+
+
+# Decode the word at index in a compiled difficulty section, lowercase as stored
+def get_compiled_word_at(compiled, difficulty, index):
+    count, table_pos = compiled["sections"][difficulty.lower()]
+    if index < 0 or index >= count:
+        raise IndexError(f"word index {index} out of range for '{difficulty}'")
+
+    start, end = struct.unpack_from('<2I', compiled["mmap"], table_pos + 4 * index)
+    return compiled["mmap"][start:end].decode('utf-8')
+
+
+# Select random uppercase word from a compiled dictionary in O(1), "" if section empty
+def get_compiled_random_word(compiled, difficulty, rng=None):
+    count = get_compiled_word_count(compiled, difficulty)
+    if count == 0:
+        return ""
 
+    return get_compiled_word_at(compiled, difficulty, (rng or random).randrange(count)).upper()
 
-# Append word to TXT file under specified difficulty section, returns success bool
+
+# Rebuild compiled binaries for every supported language
+def compile_all_words():
+    for language in ['fr', 'en']:
+        if compile_words_file(get_words_file(language), get_compiled_file(language)):
+            print(f"Compiled {language} words to {get_compiled_file(language)}")
+
+
+# Return word bag file path for language and difficulty
+def get_bag_file(language, difficulty):
+    return os.path.join(DATA_DIR, f"bag_{language}_{difficulty.lower()}.bin")
+
+
+# Create a no-repeat word bag for language/difficulty, restoring its saved cursor if persist is True
+#   rng shuffles this bag only, so a simulation owning its bag draws a reproducible sequence
+def create_word_bag(language, difficulty, persist=False, rng=None):
+    bag = {
+        "language": language,
+        "difficulty": difficulty.lower(),
+        "count": 0,
+        "order": array('I'),
+        "cursor": 0,
+        "file": None,
+        "rng": rng
+    }
+
+    if persist:
+        _open_bag_file(bag)
+    return bag
+
+
+# Open (or create) the bag file and load order/cursor from it when valid
+def _open_bag_file(bag):
+    path = get_bag_file(bag["language"], bag["difficulty"])
+    try:
+        if os.path.exists(path):
+            f = open(path, 'r+b')
+            header = f.read(_BAG_HEADER_SIZE)
+            if len(header) == _BAG_HEADER_SIZE:
+                magic, version, count, cursor = struct.unpack(_BAG_HEADER_FORMAT, header)
+                order = array('I')
+                order.frombytes(f.read(4 * count))
+                if magic == BAG_MAGIC and version == BAG_VERSION and len(order) == count:
+                    if sys.byteorder == 'big':
+                        order.byteswap()
+                    bag["count"] = count
+                    bag["order"] = order
+                    bag["cursor"] = cursor
+        else:
+            f = open(path, 'w+b')
+        bag["file"] = f
+    except OSError as e:
+        print(f"Error opening word bag {path}: {e}")
+
+
+# Rewrite the whole bag file from the in-memory order and cursor
+def _save_bag_file(bag):
+    order = bag["order"]
+    if sys.byteorder == 'big':
+        order = array('I', order)
+        order.byteswap()
+
+    f = bag["file"]
+    f.seek(0)
+    f.write(struct.pack(_BAG_HEADER_FORMAT, BAG_MAGIC, BAG_VERSION, bag["count"], bag["cursor"]))
+    f.write(order.tobytes())
+    f.truncate()
+    f.flush()
+
+
+# Persist one draw in place: the two swapped indexes and the new cursor (12 bytes)
+def _save_bag_draw(bag, position, swapped):
+    f = bag["file"]
+    f.seek(_BAG_HEADER_SIZE - 4)
+    f.write(struct.pack('<I', bag["cursor"]))
+    f.seek(_BAG_HEADER_SIZE + 4 * position)
+    f.write(struct.pack('<I', bag["order"][position]))
+    f.seek(_BAG_HEADER_SIZE + 4 * swapped)
+    f.write(struct.pack('<I', bag["order"][swapped]))
+    f.flush()
+
+
+# Return (word source, word count): compiled dictionary, or cached TXT list as fallback
+def _get_word_source(language, difficulty):
+    compiled = load_compiled_words(language)
+    if compiled is not None:
+        return compiled, get_compiled_word_count(compiled, difficulty)
+
+    words = load_words(language).get(difficulty, [])
+    return words, len(words)
+
+
+# Return lowercase word at index from a source returned by _get_word_source
+def _get_source_word_at(source, difficulty, index):
+    if isinstance(source, list):
+        return source[index]
+    return get_compiled_word_at(source, difficulty, index)
+
+
+# Return the uppercase word with id word_id (its index in the section), "" if out of range
+def get_word_at(language, difficulty, word_id):
+    source, count = _get_word_source(language, difficulty.lower())
+    if not 0 <= word_id < count:
+        return ""
+    return _get_source_word_at(source, difficulty.lower(), word_id).upper()
+
+
+# Draw next word index from the bag without replacement in O(1), returns (word source, index or -1)
+#   rng overrides the bag's own generator for this draw
+def _draw_bag_index(bag, rng=None):
+    source, count = _get_word_source(bag["language"], bag["difficulty"])
+    if count == 0:
+        return source, -1
+
+    # Dictionary changed size: start a new permutation of word indexes
+    if count != bag["count"]:
+        bag["count"] = count
+        bag["order"] = array('I', range(count))
+        bag["cursor"] = 0
+        if bag["file"]:
+            _save_bag_file(bag)
+
+    # Exhausted: the drawn prefix is reshuffled lazily, one swap per draw
+    if bag["cursor"] >= count:
+        bag["cursor"] = 0
+
+    # One step of Fisher-Yates: pick among the not-yet-drawn indexes
+    order = bag["order"]
+    position = bag["cursor"]
+    swapped = (rng or bag.get("rng") or random).randrange(position, count)
+    order[position], order[swapped] = order[swapped], order[position]
+    bag["cursor"] = position + 1
+
+    if bag["file"]:
+        _save_bag_draw(bag, position, swapped)
+
+    return source, order[position]
+
+
+# Draw next word from the bag without replacement in O(1), uppercase ("" if no words)
+def draw_from_bag(bag, rng=None):
+    source, word_id = _draw_bag_index(bag, rng)
+    if word_id < 0:
+        return ""
+    return _get_source_word_at(source, bag["difficulty"], word_id).upper()
+
+
+# Close the bag file handle, if any
+def close_word_bag(bag):
+    if bag["file"]:
+        bag["file"].close()
+        bag["file"] = None
+
+
+# Close and forget every process-wide word bag
+def close_all_word_bags():
+    for key in list(_word_bags.keys()):
+        close_word_bag(_word_bags.pop(key))
+
+
+# Fetch a word that does not repeat until the whole section has been played (persisted across sessions)
+#   persist=False keeps the bag in memory only (forked server workers must not share one bag file)
+def get_unique_word(language, difficulty, persist=True, rng=None):
+    word, word_id = get_unique_word_entry(language, difficulty, persist, rng)
+    return word
+
+
+# Same draw as get_unique_word, returns (word, word id for get_word_at), ("", -1) if none
+def get_unique_word_entry(language, difficulty, persist=True, rng=None):
+    if get_words_file(language) is None:
+        print(f"Error: Unsupported language '{language}'")
+        return "", -1
+
+    key = (language, difficulty.lower())
+    if key not in _word_bags:
+        _word_bags[key] = create_word_bag(language, difficulty, persist=persist)
+    bag = _word_bags[key]
+    source, word_id = _draw_bag_index(bag, rng)
+    if word_id < 0:
+        return "", -1
+    return _get_source_word_at(source, bag["difficulty"], word_id).upper(), word_id
+
+
+# Build a Walker alias table (Vose's method) from non-negative weights in O(n), None if unusable
+def build_alias_table(weights):
+    n = len(weights)
+    total = float(sum(weights))
+    if n == 0 or total <= 0:
+        return None
+    if min(weights) < 0:
+        print("Error: Alias table weights must be non-negative")
+        return None
+
+    prob = array('d', [1.0]) * n
+    alias = array('I', range(n))
+    scaled = [w * n / total for w in weights]
+
+    small = []
+    large = []
+    for i in range(n):
+        if scaled[i] < 1.0:
+            small.append(i)
+        else:
+            large.append(i)
+
+    # Pair each under-full slot with an over-full one; leftovers keep prob 1.0 and alias to themselves
+    while small and large:
+        s = small.pop()
+        l = large.pop()
+        prob[s] = scaled[s]
+        alias[s] = l
+        scaled[l] = scaled[l] + scaled[s] - 1.0
+        if scaled[l] < 1.0:
+            small.append(l)
+        else:
+            large.append(l)
+
+    return {"prob": prob, "alias": alias, "count": n}
+
+
+# Draw an index from an alias table in O(1)
+def alias_draw(table, rng=None):
+    rng = rng or random
+    i = rng.randrange(table["count"])
+    if rng.random() < table["prob"][i]:
+        return i
+    return table["alias"][i]
+
+
+# Return weights file path for language (word=weight lines)
+def get_weights_file(language):
+    return os.path.join(DATA_DIR, f"weights_{language}.txt")
+
+
+# Parse word=weight lines into dict of lowercase word -> float weight ({} if no file)
+def load_word_weights(language):
+    weights = {}
+    path = get_weights_file(language)
+    if not os.path.exists(path):
+        return weights
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line or '=' not in line:
+                    continue
+
+                pos = line.find('=')
+                try:
+                    weights[line[:pos].lower()] = float(line[pos + 1:])
+                except ValueError:
+                    pass
+    except Exception as e:
+        print(f"Error loading word weights {path}: {e}")
+        return {}
+
+    return weights
+
+
+# Write dict of word -> weight as word=weight lines, returns success bool
+def save_word_weights(language, weights):
+    path = get_weights_file(language)
+    try:
+        with open(path, 'w', encoding='utf-8') as f:
+            for word in sorted(weights):
+                f.write(f"{word.lower()}={weights[word]}\n")
+        return True
+    except OSError as e:
+        print(f"Error saving word weights {path}: {e}")
+        return False
+
+
+# Return cached alias table for a section, rebuilt when the dictionary or weights file changed
+def _get_word_alias_table(language, difficulty, source, count):
+    try:
+        weights_stat = os.stat(get_weights_file(language))
+        weights_signature = (weights_stat.st_mtime_ns, weights_stat.st_size)
+    except OSError:
+        weights_signature = None
+    signature = (get_source_signature(get_words_file(language)), weights_signature)
+
+    key = (language, difficulty)
+    entry = _alias_cache.get(key)
+    if entry and entry["signature"] == signature:
+        return entry["table"]
+
+    # Words missing from the weights file keep weight 1.0
+    word_weights = load_word_weights(language)
+    weights = []
+    for i in range(count):
+        weights.append(word_weights.get(_get_source_word_at(source, difficulty, i), 1.0))
+
+    table = build_alias_table(weights)
+    _alias_cache[key] = {"signature": signature, "table": table}
+    return table
+
+
+# Fetch a word drawn with the operator weights of data/weights_<language>.txt in O(1)
+def get_weighted_word(language, difficulty, rng=None):
+    if get_words_file(language) is None:
+        print(f"Error: Unsupported language '{language}'")
+        return ""
+
+    difficulty_key = difficulty.lower()
+    source, count = _get_word_source(language, difficulty_key)
+    if count == 0:
+        return ""
+
+    table = _get_word_alias_table(language, difficulty_key, source, count)
+    if table is None:
+        return ""
+    return _get_source_word_at(source, difficulty_key, alias_draw(table, rng)).upper()
+
+
+# Fetch a word with the tunable distribution: get_weighted_word when data/weights_<language>.txt exists,
+# otherwise get_unique_word's no-repeat bag
+def get_tuned_word(language, difficulty, rng=None):
+    if os.path.exists(get_weights_file(language)):
+        return get_weighted_word(language, difficulty, rng)
+    return get_unique_word(language, difficulty, rng=rng)
+
+
+# Build bitset index over uppercase accent-folded words: bit i of each int is set when word id i matches the key
+def build_letter_index(words):
+    words = [letter_folding.fold_word(w) for w in words]
+    n = len(words)
+    size = (n + 7) // 8
+
+    length_maps = {}
+    letter_maps = {}
+    position_maps = {}
+
+    for i in range(n):
+        word = words[i]
+        byte = i >> 3
+        bit = 1 << (i & 7)
+
+        if len(word) not in length_maps:
+            length_maps[len(word)] = bytearray(size)
+        length_maps[len(word)][byte] |= bit
+
+        for letter in set(word):
+            if letter not in letter_maps:
+                letter_maps[letter] = bytearray(size)
+            letter_maps[letter][byte] |= bit
+
+        for position in range(len(word)):
+            key = (position, word[position])
+            if key not in position_maps:
+                position_maps[key] = bytearray(size)
+            position_maps[key][byte] |= bit
+
+    return {
+        "words": words,
+        "count": n,
+        "all": (1 << n) - 1,
+        "length": _bitmaps_to_ints(length_maps),
+        "letter": _bitmaps_to_ints(letter_maps),
+        "position": _bitmaps_to_ints(position_maps)
+    }
+
+
+# Convert dict of little-endian bytearrays into dict of int bitsets
+def _bitmaps_to_ints(maps):
+    result = {}
+    for key in maps:
+        result[key] = int.from_bytes(maps[key], 'little')
+    return result
+
+
+# Return word ids matching all constraints as a bitset
+#   pattern: "_A__E___" (length implied, "_" = unknown), absent: letters not in the word,
+#   hangman: blanks cannot hold a letter already revealed elsewhere in the pattern
+def query_letter_index(index, length=None, pattern=None, absent="", present="", hangman=True):
+    bits = index["all"]
+
+    if pattern is not None:
+        pattern = pattern.replace(" ", "").upper()
+        length = len(pattern)
+    if length is not None:
+        bits &= index["length"].get(length, 0)
+
+    for letter in present.upper():
+        bits &= index["letter"].get(letter, 0)
+    for letter in absent.upper():
+        bits &= ~index["letter"].get(letter, 0)
+
+    if pattern is not None:
+        revealed = set(pattern) - {"_"}
+        for position in range(len(pattern)):
+            letter = pattern[position]
+            if letter != "_":
+                bits &= index["position"].get((position, letter), 0)
+            elif hangman:
+                for known in revealed:
+                    bits &= ~index["position"].get((position, known), 0)
+
+    return bits
+
+
+# Number of set bits in a bitset
+def count_bits(bits):
+    if hasattr(bits, "bit_count"):
+        return bits.bit_count()
+    return bin(bits).count("1")
+
+
+# Return sorted list of word ids set in a bitset
+#   one C scan for the non-zero bytes, then only their set bits are walked (b & -b), O(n/8 in C + matches)
+def bitset_to_ids(bits):
+    ids = []
+    data = bits.to_bytes((bits.bit_length() + 7) // 8, 'little')
+    for match in _NONZERO_BYTE.finditer(data):
+        base = match.start() * 8
+        byte = data[match.start()]
+        while byte:
+            low = byte & -byte
+            ids.append(base + low.bit_length() - 1)
+            byte ^= low
+    return ids
+
+
+# Return words (uppercase) whose ids are set in a bitset
+def bitset_to_words(index, bits):
+    words = index["words"]
+    return [words[i] for i in bitset_to_ids(bits)]
+
+
+# Return cached letter index for a language section (all sections if difficulty is None)
+def get_letter_index(language, difficulty=None):
+    words_data = load_words(language)
+    if not words_data:
+        return None
+
+    key = (language, difficulty.lower() if difficulty else None)
+    signature = get_source_signature(get_words_file(language))
+    entry = _letter_index_cache.get(key)
+    if entry and entry["signature"] == signature:
+        return entry["index"]
+
+    if difficulty:
+        words = words_data.get(difficulty.lower(), [])
+    else:
+        words = []
+        for section in words_data:
+            words.extend(words_data[section])
+        words = list(dict.fromkeys(words))
+
+    index = build_letter_index(words)
+    _letter_index_cache[key] = {"signature": signature, "index": index}
+    return index
+
+
+# Return duplicate index for a TXT word file, rebuilt only if the files changed outside add_word_to_txt
+def _get_duplicate_index(file_path):
+    key = os.path.abspath(file_path)
+    signature = get_source_signature(file_path)
+
+    index = _duplicate_index.get(key)
+    if index and index["signature"] == signature:
+        return index
+
+    words = {}
+    words_data = load_words_with_journal(file_path)
+    for difficulty in words_data:
+        words[difficulty] = set(w.lower() for w in words_data[difficulty])
+
+    index = {"signature": signature, "words": words}
+    _duplicate_index[key] = index
+    return index
+
+
+# Append word to the TXT file's journal under specified difficulty, returns success bool
 def add_word_to_txt(file_path, word, difficulty):
     try:
-        words_data = load_words_from_txt(file_path)
+        index = _get_duplicate_index(file_path)
 
         difficulty_key = difficulty.lower()
-        if difficulty_key not in words_data:
-            words_data[difficulty_key] = []
+        if difficulty_key not in index["words"]:
+            index["words"][difficulty_key] = set()
 
         word_lower = word.lower()
 
-        # Check if word already exists
-        word_exists = False
-        for w in words_data[difficulty_key]:
-            if w.lower() == word_lower:
-                word_exists = True
-                break
-
-        if word_exists:
+        if word_lower in index["words"][difficulty_key]:
             print(f"Word '{word}' already exists in {difficulty} difficulty")
             return False
 
-        words_data[difficulty_key].append(word_lower)
+        with open(get_journal_file(file_path), 'a', encoding='utf-8') as f:
+            f.write(f"{difficulty_key}={word_lower}\n")
+
+        index["words"][difficulty_key].add(word_lower)
+        index["signature"] = get_source_signature(file_path)
+
+        if index["signature"] is None or index["signature"][2] >= JOURNAL_COMPACT_SIZE:
+            return compact_words_file(file_path)
+
+        return True
+    except Exception as e:
+        print(f"Error adding word to TXT file: {e}")
+        return False
+
+
+# Return {difficulty: set of lowercased words} for a TXT word file and its journal
+def get_known_words(file_path):
+    return _get_duplicate_index(file_path)["words"]
+
+
+# Atomically rewrite TXT word file from words_data and drop its journal, returns success bool
+def save_words_file(file_path, words_data):
+    journal_path = get_journal_file(file_path)
+
+    sections = ['facile', 'moyen', 'difficile']
+    for diff_level in words_data:
+        if diff_level not in sections:
+            sections.append(diff_level)
 
-        with open(file_path, 'w', encoding='utf-8') as f:
-            for diff_level in ['facile', 'moyen', 'difficile']:
+    temp_path = file_path + '.tmp'
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            for diff_level in sections:
                 if diff_level in words_data and words_data[diff_level]:
                     f.write(f"[{diff_level}]\n")
                     for w in words_data[diff_level]:
                         f.write(f"{w}\n")
                     f.write("\n")
+        os.replace(temp_path, file_path)
+        if os.path.exists(journal_path):
+            os.remove(journal_path)
+    except OSError as e:
+        print(f"Error saving word file {file_path}: {e}")
+        return False
+
+    words = {}
+    for difficulty in words_data:
+        words[difficulty] = set(w.lower() for w in words_data[difficulty])
+    _duplicate_index[os.path.abspath(file_path)] = {
+        "signature": get_source_signature(file_path),
+        "words": words
+    }
+    return True
 
+
+# Merge the journal into the TXT file (atomic rewrite) and empty the journal, returns success bool
+def compact_words_file(file_path):
+    if not os.path.exists(get_journal_file(file_path)):
         return True
-    except Exception as e:
-        print(f"Error adding word to TXT file: {e}")
-        return False
+
+    return save_words_file(file_path, load_words_with_journal(file_path))
+
+
+# Compact the journals of every supported language
+def compact_all_words():
+    for language in ['fr', 'en']:
+        if compact_words_file(get_words_file(language)):
+            invalidate_words_cache(language)
 
 
 # Add validated word to language-specific TXT file, returns success bool
@@ -116,17 +965,22 @@ def add_word(language, word, difficulty):
 
     word = word.strip()
 
-    if language == 'en':
-        file_path = os.path.join(DATA_DIR, 'words_en.txt')
-    elif language == 'fr':
-        file_path = os.path.join(DATA_DIR, 'words_fr.txt')
-    else:
+    file_path = get_words_file(language)
+    if file_path is None:
         print(f"Error: Unsupported language '{language}'")
         return False
 
     success = add_word_to_txt(file_path, word, difficulty)
 
     if success:
+        invalidate_words_cache(language)
         print(f"Word '{word}' added successfully to {language} words ({difficulty})")
 
     return success
+
+
+if __name__ == '__main__':
+    # "compact" merges journals into the TXT files before compiling
+    if len(sys.argv) > 1 and sys.argv[1] == 'compact':
+        compact_all_words()
+    compile_all_words()